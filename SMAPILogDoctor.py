@@ -1,11 +1,35 @@
 import os
 import re
+import sys
+import bz2
+import gzip
+import lzma
+import zlib
+import zipfile
+import glob
 import json
+import time
+import argparse
+import base64
 import html
+import hashlib
+import functools
+import heapq
+import bisect
+import itertools
+import queue
+import shutil
+import tempfile
+import threading
+import concurrent.futures
+import typing
 import tkinter as tk
+import tkinter.font as tkfont
+from array import array
 from tkinter import ttk, filedialog, messagebox
-from dataclasses import dataclass, field
-from typing import List, Optional
+from dataclasses import asdict, dataclass, field, fields
+from collections import Counter, deque
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
 
 # =========================
@@ -88,6 +112,67 @@ TEXT = {
         "sg.rivatuner": "RivaTuner Statistics Server may conflict with SMAPI. Add an exception for Stardew Valley or close it while playing.",
         "sg.updates": "You can update {count} mods. Keeping frameworks and core mods updated often fixes crashes and invisible issues.",
         "sg.slow_start": "Game startup took about {seconds:.1f}s. Large content packs and many patching mods can increase load time; consider trimming heavy mods if this bothers you.",
+
+        # live tail
+        "btn_watch": "Watch Live Log",
+        "btn_watch_stop": "Stop Watching",
+        "status_watching": "Watching {path} — {lines} lines, {errors} errors, {warnings} warnings",
+        "status_watch_missing": "Could not find SMAPI-latest.txt. Open a log from your ErrorLogs folder once so its location is remembered.",
+        "status_watch_stopped": "Stopped watching the live log.",
+        "raw_tail_header": "Most recent {count} lines",
+
+        # background analysis
+        "btn_cancel": "Cancel",
+        "status_analyzing": "Analyzing {path} … {done:.1f} / {total:.1f} MB",
+        "status_cancelled": "Analysis cancelled.",
+
+        # virtual views
+        "jump_label": "Go to line or time:",
+        "btn_jump": "Go",
+
+        # error grouping
+        "overview_error_groups": "Distinct errors: {count}",
+        "overview_warning_groups": "Distinct warnings: {count}",
+        "group_occurrences": "{count}× (lines {first}–{last})",
+
+        "mod_health_exceptions_header": "Mods throwing exceptions:",
+        "mod_health_exception_item": "{mod}: {count}× {types}",
+
+        "startup_header": "Who made startup slow ({seconds:.0f}s profiled):",
+        "startup_item": "{name}: {seconds:.0f}s",
+        "startup_phases_header": "Startup phases:",
+        "startup_phase_item": "{name}: from {start:.0f}s, {seconds:.0f}s",
+        "startup_edits_header": "Asset edits by mod / content pack:",
+        "startup_edit_item": "{name}: {seconds:.0f}s, {count} edits",
+        "startup_timeline_header": "Timeline (phases, then log sources)",
+        "sg.slow_start_mods": "Most startup time went to: {mods}.",
+
+        "warn_conflict": "External program detected: {name}. If the game misbehaves, try closing it.",
+
+        "report_more_items": "Show items {first}–{last}",
+        "report_lines": "Lines {first}–{last}",
+        "report_lazy_unsupported": "This browser cannot expand this section; open the report in a current browser.",
+
+        "btn_export_json": "Export JSON",
+
+        "btn_compare": "Compare…",
+        "diff_title": "Log comparison",
+        "diff_header": "Changes from {old} to {new}",
+        "diff_none": "No differences found.",
+        "diff_mods_added": "Mods added ({count}):",
+        "diff_mods_removed": "Mods removed ({count}):",
+        "diff_versions": "Version changes ({count}):",
+        "diff_version_item": "{name}: {before} → {after}",
+        "diff_failing": "Newly failing or skipped mods ({count}):",
+        "diff_recovered": "Mods no longer failing ({count}):",
+        "diff_new_errors": "New errors ({count}):",
+        "diff_resolved_errors": "Errors gone ({count}):",
+        "diff_new_warnings": "New warnings ({count}):",
+        "diff_startup": "Startup: {before:.0f}s → {after:.0f}s ({delta:+.0f}s)",
+        "diff_timing_item": "{name}: {before:.0f}s → {after:.0f}s ({delta:+.0f}s)",
+
+        "chk_profile": "Profile parser",
+        "status_profile": "Profile: {summary}",
     },
     "zh": {
         # window
@@ -164,6 +249,67 @@ TEXT = {
         "sg.rivatuner": "RivaTuner Statistics Server 可能与 SMAPI 冲突。建议为星露谷添加例外或在游玩时暂时关闭该软件。",
         "sg.updates": "有 {count} 个模组可以更新。优先更新框架/核心模组，通常可以修复崩溃和一些看不见的兼容问题。",
         "sg.slow_start": "本次游戏启动大约耗时 {seconds:.1f} 秒。大量内容包和修改底层代码的模组会拉长加载时间，如有需要可以考虑精简大型模组。",
+
+        # live tail
+        "btn_watch": "实时监视日志",
+        "btn_watch_stop": "停止监视",
+        "status_watching": "正在监视 {path} —— {lines} 行，{errors} 个错误，{warnings} 个警告",
+        "status_watch_missing": "找不到 SMAPI-latest.txt。请先从 ErrorLogs 文件夹打开一次日志，以便记住其位置。",
+        "status_watch_stopped": "已停止实时监视。",
+        "raw_tail_header": "最近 {count} 行",
+
+        # background analysis
+        "btn_cancel": "取消",
+        "status_analyzing": "正在分析 {path} … {done:.1f} / {total:.1f} MB",
+        "status_cancelled": "已取消分析。",
+
+        # virtual views
+        "jump_label": "跳转到行或时间：",
+        "btn_jump": "跳转",
+
+        # error grouping
+        "overview_error_groups": "不同错误：{count}",
+        "overview_warning_groups": "不同警告：{count}",
+        "group_occurrences": "{count} 次（第 {first}–{last} 行）",
+
+        "mod_health_exceptions_header": "抛出异常的模组：",
+        "mod_health_exception_item": "{mod}：{count} 次 {types}",
+
+        "startup_header": "启动耗时排行（共统计 {seconds:.0f} 秒）：",
+        "startup_item": "{name}：{seconds:.0f} 秒",
+        "startup_phases_header": "启动阶段：",
+        "startup_phase_item": "{name}：从第 {start:.0f} 秒开始，持续 {seconds:.0f} 秒",
+        "startup_edits_header": "资源编辑耗时（按模组/内容包）：",
+        "startup_edit_item": "{name}：{seconds:.0f} 秒，{count} 次编辑",
+        "startup_timeline_header": "时间线（阶段，然后是日志来源）",
+        "sg.slow_start_mods": "启动时间主要花在：{mods}。",
+
+        "warn_conflict": "检测到外部程序：{name}。如果游戏运行异常，请尝试关闭它。",
+
+        "report_more_items": "显示第 {first}–{last} 项",
+        "report_lines": "第 {first}–{last} 行",
+        "report_lazy_unsupported": "当前浏览器无法展开此部分，请使用较新的浏览器打开报告。",
+
+        "btn_export_json": "导出 JSON",
+
+        "btn_compare": "对比日志…",
+        "diff_title": "日志对比",
+        "diff_header": "从 {old} 到 {new} 的变化",
+        "diff_none": "未发现差异。",
+        "diff_mods_added": "新增的模组（{count}）：",
+        "diff_mods_removed": "移除的模组（{count}）：",
+        "diff_versions": "版本变化（{count}）：",
+        "diff_version_item": "{name}：{before} → {after}",
+        "diff_failing": "新出现加载失败或被跳过的模组（{count}）：",
+        "diff_recovered": "不再失败的模组（{count}）：",
+        "diff_new_errors": "新错误（{count}）：",
+        "diff_resolved_errors": "已消失的错误（{count}）：",
+        "diff_new_warnings": "新警告（{count}）：",
+        "diff_startup": "启动：{before:.0f} 秒 → {after:.0f} 秒（{delta:+.0f} 秒）",
+        "diff_timing_item": "{name}：{before:.0f} 秒 → {after:.0f} 秒（{delta:+.0f} 秒）",
+
+        "chk_profile": "解析性能分析",
+        "status_profile": "性能分析：{summary}",
     },
     "es": {
         "app_title": "Doctor de Registros SMAPI",
@@ -890,6 +1036,12 @@ TEXT = {
 }
 
 
+def _tr(lang: str, key: str, **kwargs) -> str:
+    # Newer strings are not translated into every language yet; fall back to English
+    template = TEXT.get(lang, TEXT["en"]).get(key) or TEXT["en"][key]
+    return template.format(**kwargs)
+
+
 # =========================
 # Data classes
 # =========================
@@ -914,12 +1066,177 @@ class UpdateInfo:
     url: str
 
 
+@dataclass
+class MessageGroup:
+    # messages that only differ by numbers/ids/coordinates share a fingerprint
+    fingerprint: str
+    sample: str
+    count: int = 0
+    first_line: int = 0
+    last_line: int = 0
+
+
+@dataclass
+class ModInfo:
+    # one entry of SMAPI's "Loaded N mods:" / "Loaded N content packs:" lists
+    name: str
+    version: Optional[str] = None
+    author: Optional[str] = None
+    # content packs: the mod they are for
+    for_mod: Optional[str] = None
+
+
+@dataclass
+class LogEvent:
+    # where an error/warning line came from; level/source/time are None
+    # for lines without a "[HH:MM:SS LEVEL Source]" prefix
+    line: int
+    level: Optional[str] = None
+    source: Optional[str] = None
+    time: Optional[str] = None
+
+
+class StringColumn(Sequence[Optional[str]]):
+    """
+    Append-only list of strings that keeps each distinct value once plus a
+    4-byte code per entry, so a message logged every tick costs 4 bytes per
+    repeat instead of a copy. Compares equal to a list of the same items.
+    """
+
+    __slots__ = ("values", "codes", "_code_of")
+
+    def __init__(self, items: Iterable[Optional[str]] = ()) -> None:
+        self.values: List[Optional[str]] = []
+        self.codes = array("I")
+        self._code_of: Dict[Optional[str], int] = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, value: Optional[str]) -> Optional[str]:
+        """Add value; returns the stored copy (shared by all its repeats)."""
+        code = self._code_of.get(value)
+        if code is None:
+            code = self._code_of[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.values[code] for code in self.codes[index]]
+        return self.values[self.codes[index]]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (StringColumn, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"StringColumn({list(self)!r})"
+
+
+class EventColumn(Sequence[LogEvent]):
+    """
+    LogEvents stored column-wise: line numbers in an array and the fields
+    as StringColumns. Items are rebuilt as LogEvent objects on access.
+    """
+
+    __slots__ = ("lines", "levels", "sources", "times")
+
+    def __init__(self, events: Iterable[LogEvent] = ()) -> None:
+        self.lines = array("q")
+        self.levels = StringColumn()
+        self.sources = StringColumn()
+        self.times = StringColumn()
+        for event in events:
+            self.append(event)
+
+    def add(self, line: int, level: Optional[str] = None, source: Optional[str] = None, time: Optional[str] = None) -> None:
+        self.lines.append(line)
+        self.levels.append(level)
+        self.sources.append(source)
+        self.times.append(time)
+
+    def append(self, event: LogEvent) -> None:
+        self.add(event.line, event.level, event.source, event.time)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        return LogEvent(self.lines[index], self.levels[index], self.sources[index], self.times[index])
+
+    def __iter__(self) -> Iterator[LogEvent]:
+        return map(LogEvent, self.lines, self.levels, self.sources, self.times)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (EventColumn, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EventColumn({list(self)!r})"
+
+
+@dataclass
+class ExceptionRecord:
+    # an ERROR line plus the continuation lines (stack trace) logged under it
+    line: int
+    source: str
+    message: str
+    exception_type: Optional[str] = None
+    exception_message: str = ""
+    frames: List[str] = field(default_factory=list)
+    # mod blamed for the exception: the log source, or the first mod frame
+    mod: Optional[str] = None
+
+
+@dataclass
+class TimingSpan:
+    # seconds since the first timestamp in the log
+    name: str
+    start: float
+    end: float
+
+
+@dataclass
+class TimingEntry:
+    # time charged to a log source / mod / content pack during startup;
+    # count is the number of asset edits (edit timings only)
+    name: str
+    seconds: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class RuleHit:
+    # lines matched by one rule-pack rule (see RuleSet)
+    rule_id: str
+    count: int = 0
+    first_line: int = 0
+    sample: str = ""
+
+
 @dataclass
 class SmapiAnalysis:
     game_version: Optional[str] = None
     smapi_version: Optional[str] = None
     mod_count: int = 0
     content_pack_count: int = 0
+    loaded_mods: List[ModInfo] = field(default_factory=list)
+    loaded_content_packs: List[ModInfo] = field(default_factory=list)
     skipped_mods: List[SkippedMod] = field(default_factory=list)
     failed_mods: List[SkippedMod] = field(default_factory=list)
     save_serializer_mods: List[str] = field(default_factory=list)
@@ -928,16 +1245,459 @@ class SmapiAnalysis:
     missing_dependencies: List[MissingDependency] = field(default_factory=list)
     external_conflicts: List[str] = field(default_factory=list)
     update_infos: List[UpdateInfo] = field(default_factory=list)
-    errors: List[str] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
+    # Per-line records are columns: repeated messages share one string, and
+    # events are arrays instead of one object per line. Both read like lists.
+    errors: StringColumn = field(default_factory=StringColumn)
+    warnings: StringColumn = field(default_factory=StringColumn)
+    # error_events[i] is where errors[i] was logged (same for warnings)
+    error_events: EventColumn = field(default_factory=EventColumn)
+    warning_events: EventColumn = field(default_factory=EventColumn)
+    error_groups: List[MessageGroup] = field(default_factory=list)
+    warning_groups: List[MessageGroup] = field(default_factory=list)
+    exceptions: List[ExceptionRecord] = field(default_factory=list)
+    # mod name -> exceptions attributed to it, in log order
+    mod_exceptions: Dict[str, List[ExceptionRecord]] = field(default_factory=dict)
     slow_start_seconds: Optional[float] = None
+    # Startup profile, from the log's own timestamps (1s resolution). It covers
+    # everything up to "Context: loaded save", or the whole log without one.
+    startup_seconds: float = 0.0
+    startup_phases: List[TimingSpan] = field(default_factory=list)
+    startup_timeline: List[TimingSpan] = field(default_factory=list)
+    mod_timings: List[TimingEntry] = field(default_factory=list)
+    asset_edit_timings: List[TimingEntry] = field(default_factory=list)
+    rule_hits: List[RuleHit] = field(default_factory=list)
+    # Text-based analyses keep the log in raw_log; file-based (streamed)
+    # analyses leave it empty and point at the file on disk instead.
     raw_log: str = ""
+    log_path: Optional[str] = None
+    log_size: int = 0
+    # line-offset index into log_path, for reading any lines back from disk
+    line_index: Optional["LogLineIndex"] = field(default=None, compare=False, repr=False)
+
+
+# =========================
+# Log input (plain, compressed, zipped)
+# =========================
+
+_LOG_EXTENSIONS = (".txt", ".log")
+# single-file compression: decompressed while streaming, never to disk
+_COMPRESSED_OPENERS: Dict[str, Callable[[BinaryIO], BinaryIO]] = {
+    ".gz": lambda raw: gzip.GzipFile(fileobj=raw),
+    ".bz2": bz2.BZ2File,
+    ".xz": lzma.LZMAFile,
+}
+# "logs.zip::ErrorLogs/SMAPI-latest.txt" names one member of a zip
+_ARCHIVE_SEP = "::"
+# everything that can go wrong reading a (possibly corrupt) archive
+_INPUT_ERRORS = (OSError, EOFError, ValueError, zipfile.BadZipFile, lzma.LZMAError, zlib.error)
+
+
+def split_archive_member(path: str) -> Tuple[str, Optional[str]]:
+    archive, sep, member = path.partition(_ARCHIVE_SEP)
+    if sep and archive.lower().endswith(".zip"):
+        return archive, member
+    return path, None
+
+
+def is_log_file_name(name: str) -> bool:
+    """*.txt / *.log, optionally .gz/.bz2/.xz compressed, or a .zip."""
+    stem, ext = os.path.splitext(name.lower())
+    if ext == ".zip":
+        return True
+    if ext in _COMPRESSED_OPENERS:
+        ext = os.path.splitext(stem)[1]
+    return ext in _LOG_EXTENSIONS
+
+
+def zip_log_members(zf: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    return [i for i in zf.infolist() if not i.is_dir() and i.filename.lower().endswith(_LOG_EXTENSIONS)]
+
+
+def _pick_zip_member(zf: zipfile.ZipFile) -> zipfile.ZipInfo:
+    # a zip of the ErrorLogs folder: prefer SMAPI-latest.txt, else the biggest log
+    members = zip_log_members(zf)
+    if not members:
+        raise FileNotFoundError(f"No .txt/.log file in {zf.filename}")
+    for info in members:
+        if os.path.basename(info.filename) == SMAPI_LATEST_LOG:
+            return info
+    return max(members, key=lambda i: i.file_size)
+
+
+def log_display_name(path: str) -> str:
+    """File name of a log without compression or log extensions."""
+    archive, member = split_archive_member(path)
+    name = os.path.basename(member or archive)
+    stem, ext = os.path.splitext(name)
+    if ext.lower() in _COMPRESSED_OPENERS:
+        stem, ext = os.path.splitext(stem)
+    return stem if ext.lower() in _LOG_EXTENSIONS or ext.lower() == ".zip" else name
+
+
+class LogInput:
+    """
+    A log opened as a binary stream: a plain file, a .gz/.bz2/.xz file, or a
+    member of a .zip (the SMAPI log inside it when no member is named). Data
+    is decompressed as it is read; nothing is extracted or held whole.
+
+    total and position() measure progress in the same unit: compressed bytes
+    for .gz/.bz2/.xz, uncompressed bytes for plain files and zip members.
+    compressed is True unless the log is a plain file: seeking then means
+    decompressing from the start.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._closers: List[Any] = []
+        try:
+            self._open(path)
+        except KeyError as e:
+            self.close()
+            raise FileNotFoundError(e.args[0]) from None
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, path: str) -> None:
+        archive, member = split_archive_member(path)
+        ext = os.path.splitext(archive)[1].lower()
+        if member is not None or ext == ".zip":
+            zf = zipfile.ZipFile(archive)
+            self._closers.append(zf)
+            info = zf.getinfo(member) if member is not None else _pick_zip_member(zf)
+            self.path = f"{archive}{_ARCHIVE_SEP}{info.filename}"
+            self.stream: BinaryIO = zf.open(info)
+            self.total = info.file_size
+            self.position: Callable[[], int] = self.stream.tell
+            self.compressed = True
+        elif ext in _COMPRESSED_OPENERS:
+            raw = open(archive, "rb")
+            self._closers.append(raw)
+            self.stream = _COMPRESSED_OPENERS[ext](raw)
+            self.total = os.fstat(raw.fileno()).st_size
+            self.position = raw.tell
+            self.compressed = True
+        else:
+            self.stream = open(path, "rb")
+            self.total = os.fstat(self.stream.fileno()).st_size
+            self.position = self.stream.tell
+            self.compressed = False
+        self._closers.insert(0, self.stream)
+
+    def close(self) -> None:
+        for closer in self._closers:
+            closer.close()
+        self._closers = []
+
+    def __enter__(self) -> "LogInput":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# =========================
+# Rule packs
+# =========================
+
+_ANALYSIS_FIELDS = frozenset(f.name for f in fields(SmapiAnalysis))
+
+# Known-issue signatures and suggestion thresholds, as data. User packs are
+# JSON files of the same shape (see load_rule_set):
+#   "rules":  line signatures, "match" (literal) or "regex", optionally
+#             limited to "levels"; a hit can record a "conflict" and/or a
+#             "suggestion" (a TEXT key, {"en": ..., "zh": ...} or plain text)
+#   "checks": thresholds on analysis fields, "at_least" (count or value) or
+#             "above" (value), each with a "suggestion"; "slowest_mods" adds
+#             a second one naming the mods that took most startup time
+BUILTIN_RULE_PACK: Dict[str, Any] = {
+    "name": "builtin",
+    "rules": [
+        {
+            "id": "rivatuner",
+            "match": "RivaTuner Statistics Server",
+            "conflict": "RivaTuner Statistics Server",
+            "suggestion": "sg.rivatuner",
+        },
+    ],
+    "checks": [
+        {"id": "patched_mods_many", "field": "patched_mods", "at_least": 15, "suggestion": "sg.patched_mods_many"},
+        {
+            "id": "slow_start",
+            "field": "slow_start_seconds",
+            "above": 20,
+            "suggestion": "sg.slow_start",
+            "slowest_mods": "sg.slow_start_mods",
+        },
+    ],
+}
+
+# Up to this many literal signatures are checked with plain substring
+# searches; past it, the word-anchor index takes over.
+_DIRECT_SCAN_LIMIT = 16
+# punctuation becomes a word break when picking/looking up anchor words
+_WORD_BREAKS = str.maketrans({c: " " for c in ".,:;()[]{}<>'\"=!?/\\|*+&^%$#@~`"})
+_FEED_BATCH_LINES = 8192
+
+
+@dataclass
+class Rule:
+    id: str
+    match: Optional[str] = None
+    regex: Optional[str] = None
+    levels: Tuple[str, ...] = ()
+    conflict: Optional[str] = None
+    suggestion: Any = None
+    # line -> bool, built from match/regex
+    test: Callable[[str], Any] = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class Check:
+    id: str
+    field: str
+    at_least: Optional[float] = None
+    above: Optional[float] = None
+    suggestion: Any = None
+    # text for the mods that took most startup time ({mods})
+    slowest_mods: Any = None
+
+
+class RuleSet:
+    """
+    Rule packs compiled into one matcher for the parser's line pass.
+
+    The matcher works per batch of lines (one read chunk). Literal
+    signatures are indexed by one of their inner words: the batch is split
+    into words once, one set intersection finds the anchors present, and only
+    those signatures are confirmed with a substring search. The cost is the
+    same for 5 signatures as for 500, and batches with no hit (nearly all of
+    them) add nothing per line. Signatures of one or two words, which may
+    match inside a longer word, are always searched directly. Lines are only
+    tested against the rules that hit their batch.
+    """
+
+    def __init__(self, packs: Sequence[Dict[str, Any]]) -> None:
+        self.rules: List[Rule] = []
+        self.checks: List[Check] = []
+        self._by_id: Dict[str, Rule] = {}
+        for pack in packs:
+            self._add_pack(pack)
+        canonical = json.dumps(list(packs), sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+
+        literals = [r for r in self.rules if r.match]
+        self._regex_rules = [r for r in self.rules if r.regex]
+        self._direct: List[Rule] = []
+        self._anchors: Dict[str, List[Rule]] = {}
+        if len(literals) <= _DIRECT_SCAN_LIMIT:
+            self._direct = literals
+        else:
+            # the edge words may be cut off mid-word in the line ("NullReference"
+            # in "System.NullReferenceException"); only inner words always
+            # appear whole, so signatures without one are searched directly
+            candidates = []
+            for rule in literals:
+                words = rule.match.translate(_WORD_BREAKS).split()
+                candidates.append((rule, words[1:-1]))
+            # anchor on the word fewest signatures share, then the longest,
+            # so a common word doesn't pull in many confirmations
+            shared = Counter(w for _, inner in candidates for w in set(inner))
+            for rule, inner in candidates:
+                if inner:
+                    anchor = min(inner, key=lambda w: (shared[w], -len(w)))
+                    self._anchors.setdefault(anchor, []).append(rule)
+                else:
+                    self._direct.append(rule)
+
+    def _add_pack(self, pack: Dict[str, Any]) -> None:
+        name = pack.get("name", "?")
+        for raw in _pack_entries(pack, "rules"):
+            rule_id = raw.get("id")
+            pattern = raw.get("match") or raw.get("regex")
+            if (
+                not rule_id or not isinstance(rule_id, str)
+                or bool(raw.get("match")) == bool(raw.get("regex")) or not isinstance(pattern, str)
+            ):
+                raise ValueError(f"rule pack {name!r}: each rule needs an id and exactly one of match/regex")
+            levels = raw.get("levels", [])
+            if not isinstance(levels, list) or not all(isinstance(level, str) for level in levels):
+                raise ValueError(f"rule pack {name!r}, rule {rule_id!r}: levels is a list of strings")
+            rule = Rule(
+                id=rule_id,
+                match=raw.get("match"),
+                regex=raw.get("regex"),
+                levels=tuple(levels),
+                conflict=raw.get("conflict"),
+                suggestion=raw.get("suggestion"),
+            )
+            if rule.regex:
+                try:
+                    # re.M: the batch scan sees many lines at once, so ^ and $
+                    # must match at every line
+                    rule.test = re.compile(rule.regex, re.M).search
+                except re.error as e:
+                    raise ValueError(f"rule pack {name!r}, rule {rule_id!r}: {e}") from None
+            else:
+                rule.test = functools.partial(_contains, rule.match)
+            # later packs override earlier rules with the same id
+            if rule_id in self._by_id:
+                self.rules.remove(self._by_id[rule_id])
+            self._by_id[rule_id] = rule
+            self.rules.append(rule)
+        for raw in _pack_entries(pack, "checks"):
+            check_id = raw.get("id")
+            if not check_id or not isinstance(check_id, str):
+                raise ValueError(f"rule pack {name!r}: each check needs an id")
+            if raw.get("field") not in _ANALYSIS_FIELDS:
+                raise ValueError(f"rule pack {name!r}: unknown check field {raw.get('field')!r}")
+            for limit in ("at_least", "above"):
+                value = raw.get(limit)
+                if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                    raise ValueError(f"rule pack {name!r}, check {check_id!r}: {limit} is a number")
+            check = Check(
+                check_id,
+                raw["field"],
+                raw.get("at_least"),
+                raw.get("above"),
+                raw.get("suggestion"),
+                raw.get("slowest_mods"),
+            )
+            self.checks = [c for c in self.checks if c.id != check.id] + [check]
+
+    def rule(self, rule_id: str) -> Optional[Rule]:
+        return self._by_id.get(rule_id)
+
+    def scan(self, text: str) -> List[Rule]:
+        """Rules that match somewhere in a batch of text."""
+        found = [r for r in self._direct if r.match in text]
+        if self._anchors:
+            for word in self._anchors.keys() & text.translate(_WORD_BREAKS).split():
+                found.extend(r for r in self._anchors[word] if r.match in text)
+        found.extend(r for r in self._regex_rules if r.test(text))
+        return found
+
+
+def _pack_entries(pack: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    entries = pack.get(key, [])
+    if not isinstance(entries, list) or not all(isinstance(raw, dict) for raw in entries):
+        raise ValueError(f"rule pack {pack.get('name', '?')!r}: {key!r} is a list of objects")
+    return entries
+
+
+def _contains(needle: str, line: str) -> bool:
+    return needle in line
+
+
+def load_rule_pack(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8-sig") as f:
+        pack = json.load(f)
+    if not isinstance(pack, dict):
+        raise ValueError(f"{path}: a rule pack is a JSON object")
+    pack.setdefault("name", os.path.basename(path))
+    return pack
+
+
+@functools.lru_cache(maxsize=16)
+def load_rule_set(paths: Tuple[str, ...] = (), include_user_packs: bool = False) -> RuleSet:
+    """
+    Built-in rules plus the given pack files (a directory means every *.json
+    in it). include_user_packs adds the packs in RULES_DIR.
+    """
+    files: List[str] = []
+    for path in (*((RULES_DIR,) if include_user_packs else ()), *paths):
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, n) for n in os.listdir(path) if n.lower().endswith(".json")))
+        elif path != RULES_DIR:
+            files.append(path)
+    packs = [BUILTIN_RULE_PACK]
+    for path in files:
+        try:
+            pack = load_rule_pack(path)
+            # checked on its own, so an invalid rule or check is reported with its file
+            RuleSet([pack])
+        except (OSError, ValueError) as e:
+            raise ValueError(f"{path}: {e}") from None
+        packs.append(pack)
+    return RuleSet(packs)
+
+
+def builtin_rule_set() -> RuleSet:
+    return load_rule_set()
+
+
+def _rule_text(suggestion: Any, lang: str, **kwargs) -> Optional[str]:
+    if isinstance(suggestion, dict):
+        text = suggestion.get(lang) or suggestion.get("en")
+    elif isinstance(suggestion, str) and suggestion in TEXT["en"]:
+        return _tr(lang, suggestion, **kwargs)
+    else:
+        text = suggestion
+    if not text:
+        return None
+    try:
+        return str(text).format(**kwargs)
+    except (KeyError, IndexError, ValueError):
+        return str(text)
 
 
 # =========================
 # Parsing logic
 # =========================
 
+# Precompiled patterns used by the parser. Each one is only run on lines that
+# already passed a cheap substring check, so most lines never touch the regex
+# engine at all.
+_RE_VERSIONS = re.compile(r"SMAPI\s+([0-9.]+)\s+with Stardew Valley\s+([0-9.]+)")
+_RE_MOD_COUNT = re.compile(r"Loaded\s+(\d+)\s+mods")
+_RE_CONTENT_PACK_COUNT = re.compile(r"Loaded\s+(\d+)\s+content packs")
+_RE_ELAPSED = re.compile(r"elapsed\s*=\s*'([^']+)'")
+# an entry of the mod list: indented further than a normal message
+_RE_MOD_ENTRY = re.compile(r"\]\s{3,}(\S.*)$")
+_RE_LOADING_MOD = re.compile(r"]\s+(.+?)\s+\(from\s+Mods")
+_RE_PARENTHESIZED = re.compile(r"\(([^)]+)\)")
+_RE_SKIPPED_ITEM = re.compile(r"]\s+-\s+(.+?)\s+because\s+(.+)$")
+_RE_LIST_ITEM = re.compile(r"-\s+(.+)$")
+_RE_UPDATE_ALERT = re.compile(r"]\s+(.+?)\s+([0-9.]+):\s+(\S+)\s+\(you have\s+([0-9.]+)\)")
+
+# "[HH:MM:SS LEVEL Source]" prefix, parsed once per line that needs it
+_RE_LINE_PREFIX = re.compile(r"\[(\d{2}:\d{2}:\d{2}) ([^\]]*)\]\s*")
+# bare "HH:MM:SS " prefix (some game/mod lines are logged without brackets)
+_RE_TIME_PREFIX = re.compile(r"\d{2}:\d{2}:\d{2}\s+")
+
+_MISSING_DEP_MARKER = "requires mods which aren't installed"
+
+# "Content Patcher edited Data/Objects (for the '[CP] Foo' content pack)."
+_EDIT_VERBS = (" edited ", " loaded asset ")
+_EDIT_PACK = "(for the '"
+# SMAPI/game lines that start a startup phase; None ends the profile
+_STARTUP_PHASES = (
+    ("Loading mods...", "Loading mods"),
+    ("Launching mods...", "Launching mods"),
+    ("Mods loaded and ready", "Loading game content"),
+    ("Instance_LoadContent() finished", "Title screen"),
+    ("Context: loaded save", None),
+)
+_TIMELINE_MAX_SPANS = 5000
+
+# Read size for streamed log files
+_CHUNK_SIZE = 1 << 20
+_RE_NEWLINE = re.compile(b"\n")
+# LogLineIndex keeps the offset of every _LINE_INDEX_STRIDE-th line
+_LINE_INDEX_STRIDE = 64
+_RE_STRIDE_LINES = re.compile(b"(?:[^\n]*\n){%d}" % _LINE_INDEX_STRIDE)
+
+# Section state machine: (header marker, intro marker, SmapiAnalysis list).
+# Index 0 is the "Skipped mods" block, whose items carry a reason as well.
+_SECTION_SKIPPED = 0
+_SECTIONS = (
+    ("Skipped mods", "These mods could not be added", "skipped_mods"),
+    ("Changed save serializer", "These mods change the save serializer", "save_serializer_mods"),
+    ("Patched game code", "These mods directly change the game code", "patched_mods"),
+    ("Direct console access", "These mods access the SMAPI console window", "direct_console_mods"),
+)
+
+
 def _parse_time_to_seconds(time_str: str) -> Optional[float]:
     # format like 00:00:14.3893574
     try:
@@ -952,171 +1712,1060 @@ def _parse_time_to_seconds(time_str: str) -> Optional[float]:
         return None
 
 
-def analyze_smapi_log(text: str) -> SmapiAnalysis:
-    analysis = SmapiAnalysis(raw_log=text)
-    lines = text.splitlines()
-
-    current_loading_mod: Optional[str] = None
-    in_skipped_section = False
-    in_save_serializer_section = False
-    in_patched_section = False
-    in_console_section = False
+def split_log_lines(text: str) -> List[str]:
+    """
+    Lines of log text split on "\n" only, without a trailing "\r", the way
+    LogLineIndex counts them. str.splitlines() also breaks on form feeds,
+    \x85, \u2028 and friends, which mods do print, and every later line
+    number would drift.
+    """
+    lines = text.replace("\r\n", "\n").split("\n")
+    if not lines[-1]:
+        lines.pop()
+    elif lines[-1].endswith("\r"):
+        lines[-1] = lines[-1][:-1]
+    return lines
+
+
+class LogLineIndex:
+    """
+    Sparse index of a log file, built while it is parsed: the byte offset of
+    every 64th line, and the "[HH:MM:SS" time of the first timestamped line
+    of each such stride. Any range of lines is read back from disk with one
+    seek (plus under one stride of lines to skip), and a time of day
+    resolves to its first line by reading at most a stride or two, so
+    viewers never need the whole text. Supports len() and slicing like a
+    list of lines.
+
+    A compressed log can only seek by decompressing from the start, so the
+    first read copies it, decompressed, to a temporary spill file, and every
+    later read seeks there: a redraw costs the same at the end of a .gz
+    as of a plain file.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.line_count = 0
+        # bytes indexed so far (the end of the last line)
+        self.size = 0
+        # checkpoints[k]: offset of line k * _LINE_INDEX_STRIDE
+        self.checkpoints = array("q")
+        # time_seconds[i] (seconds since midnight of the first day, rising)
+        # is logged on 0-based line time_lines[i]
+        self.time_seconds = array("q")
+        self.time_lines = array("q")
+        self._day = 0
+        # decompressed copy of a compressed log, made on first read
+        self._spill: Optional[BinaryIO] = None
+        self._spill_lock = threading.Lock()
+
+    def add_block(self, data: bytes, base: int) -> None:
+        """Index a block of log bytes that starts at file offset base, on a line start."""
+        n = self.line_count
+        lines = data.count(b"\n")
+        if data and not data.endswith(b"\n"):
+            # last line of the file without a trailing newline
+            lines += 1
+        # first line of the block that falls on a checkpoint
+        skip = -n % _LINE_INDEX_STRIDE
+        if skip < lines:
+            pos = 0
+            for _ in range(skip):
+                pos = data.index(b"\n", pos) + 1
+            checkpoints = self.checkpoints
+            checkpoints.append(base + pos)
+            end = len(data)
+            # each match spans one stride of lines, so its end is the next
+            # checkpoint (anchored: finditer would retry at every position
+            # of the last, partial stride)
+            match = _RE_STRIDE_LINES.match
+            m = match(data, pos)
+            while m is not None and m.end() < end:
+                checkpoints.append(base + m.end())
+                m = match(data, m.end())
+        self.line_count = n + lines
+        self.size = base + len(data)
+
+    def add_time(self, seconds: int, line: int) -> None:
+        """Record that 0-based line was logged at time of day seconds."""
+        times = self.time_seconds
+        now = seconds + self._day
+        if times and now < times[-1] - 43200:
+            # more than 12 hours back: the log went past midnight
+            self._day += 86400
+            now += 86400
+        if not times or now > times[-1]:
+            times.append(now)
+            self.time_lines.append(line)
+
+    def line_for_time(self, seconds: int) -> Optional[int]:
+        """0-based first line logged at or after a time of day, or None."""
+        times = self.time_seconds
+        if not times:
+            return None
+        # the first occurrence of that time of day, on whichever day it is
+        while seconds < times[0]:
+            seconds += 86400
+        i = bisect.bisect_left(times, seconds)
+        # the line is after the previous sample and at most at the next one
+        lo = self.time_lines[i - 1] if i else 0
+        hi = self.time_lines[i] if i < len(times) else self.line_count
+        day = times[i - 1] // 86400 * 86400 if i else 0
+        for offset, line in enumerate(self.read_lines(lo, hi)):
+            of_day = parse_time_of_day(line[1:9]) if line.startswith("[") else None
+            if of_day is None:
+                continue
+            now = of_day + day
+            if i and now < times[i - 1] - 43200:
+                now += 86400
+            if now >= seconds:
+                return lo + offset
+        return hi if i < len(times) else None
+
+    def __len__(self) -> int:
+        return self.line_count
+
+    def read_lines(self, start: int, stop: int) -> List[str]:
+        start = max(0, start)
+        stop = min(stop, self.line_count)
+        if start >= stop or self.path is None:
+            return []
+        first = start // _LINE_INDEX_STRIDE
+        last = (stop - 1) // _LINE_INDEX_STRIDE + 1
+        begin = self.checkpoints[first]
+        end = self.checkpoints[last] if last < len(self.checkpoints) else self.size
+        data = self._read(begin, end - begin)
+        lines = split_log_lines(data.decode("utf-8", errors="replace"))
+        skip = first * _LINE_INDEX_STRIDE
+        return lines[start - skip:stop - skip]
+
+    def _read(self, offset: int, size: int) -> bytes:
+        with self._spill_lock:
+            if self._spill is None:
+                with LogInput(self.path) as source:
+                    if not source.compressed:
+                        f = source.stream
+                        f.seek(offset)
+                        return f.read(size)
+                    spill = tempfile.TemporaryFile(prefix="smapi-log-")
+                    shutil.copyfileobj(source.stream, spill, 1 << 20)
+                    self._spill = spill
+            self._spill.seek(offset)
+            return self._spill.read(size)
+
+    def close(self) -> None:
+        """Delete the spill file, if any (it is made again when needed)."""
+        with self._spill_lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, _step = key.indices(self.line_count)
+            return self.read_lines(start, stop)
+        if key < 0:
+            key += self.line_count
+        lines = self.read_lines(key, key + 1)
+        if not lines:
+            raise IndexError(key)
+        return lines[0]
+
+    def to_bytes(self) -> bytes:
+        header = array("q", (_LINE_INDEX_STRIDE, self.line_count, self.size, len(self.checkpoints), len(self.time_seconds)))
+        return b"".join(a.tobytes() for a in (header, self.checkpoints, self.time_seconds, self.time_lines))
+
+    @classmethod
+    def from_bytes(cls, path: Optional[str], data: bytes) -> "LogLineIndex":
+        """Inverse of to_bytes(); ValueError if data is not a matching index."""
+        values = array("q")
+        values.frombytes(data)
+        stride, line_count, size, n_checkpoints, n_times = values[:5]
+        if stride != _LINE_INDEX_STRIDE or len(values) != 5 + n_checkpoints + 2 * n_times:
+            raise ValueError("not a line index of this version")
+        index = cls(path)
+        index.line_count, index.size = line_count, size
+        index.checkpoints = values[5:5 + n_checkpoints]
+        index.time_seconds = values[5 + n_checkpoints:5 + n_checkpoints + n_times]
+        index.time_lines = values[5 + n_checkpoints + n_times:]
+        return index
+
+
+def parse_time_of_day(text: str) -> Optional[int]:
+    """Seconds since midnight for "HH:MM" or "HH:MM:SS", else None."""
+    parts = text.strip().strip("[]").split(":")
+    if len(parts) not in (2, 3) or not all(p.isdigit() for p in parts):
+        return None
+    h, m, sec = (int(p) for p in (*parts, "0")[:3])
+    if h > 23 or m > 59 or sec > 59:
+        return None
+    return h * 3600 + m * 60 + sec
+
+
+def raw_log_lines(analysis: SmapiAnalysis) -> Sequence[str]:
+    """Raw log as a sequence of lines, read lazily from disk when possible."""
+    if analysis.line_index is not None:
+        return analysis.line_index
+    return split_log_lines(analysis.raw_log)
+
+
+# Normalization applied (in order) to build message fingerprints
+_FINGERPRINT_RULES = (
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<id>"),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<time>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<id>"),
+    (re.compile(r"[({]\s*X\s*[:=]?\s*-?[\d.]+[\s,]+Y\s*[:=]?\s*-?[\d.]+\s*[)}]"), "<xy>"),
+    (re.compile(r"\(\s*-?\d+(?:\.\d+)?\s*,\s*-?\d+(?:\.\d+)?\s*\)"), "<xy>"),
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)*"), "<n>"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+# Every rule treats digits alike, so messages that differ only in digit values
+# share one cache entry once 1-9 are folded to "1" ("0" stays for "0x" ids).
+_DIGIT_SHAPE = str.maketrans("23456789", "11111111")
+
+
+def fingerprint_message(msg: str) -> str:
+    """
+    Normalize a message so repeats of the same problem compare equal:
+    GUIDs, timestamps, hex ids, coordinates and numbers become placeholders.
+    """
+    return _fingerprint_shape(msg.translate(_DIGIT_SHAPE))
+
+
+@functools.lru_cache(maxsize=8192)
+def _fingerprint_shape(msg: str) -> str:
+    for pattern, placeholder in _FINGERPRINT_RULES:
+        msg = pattern.sub(placeholder, msg)
+    return msg.strip()
+
+
+def group_messages(messages: Iterable[Tuple[int, str]]) -> List[MessageGroup]:
+    """Group (line number, message) pairs by fingerprint, in order of first occurrence."""
+    groups: Dict[str, MessageGroup] = {}
+    for line_no, msg in messages:
+        _add_to_group(groups, msg, line_no)
+    return list(groups.values())
+
+
+def _add_to_group(groups: Dict[str, MessageGroup], msg: str, line_no: int) -> Optional[MessageGroup]:
+    # returns the group only when it was newly created
+    fp = fingerprint_message(msg)
+    group = groups.get(fp)
+    created = None
+    if group is None:
+        group = created = groups[fp] = MessageGroup(fp, msg, 0, line_no)
+    group.count += 1
+    group.last_line = line_no
+    return created
+
+
+# "SomeException: message" / "System.IO.FileNotFoundException: message"
+_RE_EXCEPTION = re.compile(r"\b((?:[A-Za-z_]\w*\.)*[A-Z]\w*(?:Exception|Error))\b(?::\s*(.*))?")
+# "at Namespace.Type.Method(...)"; Harmony-patched methods carry
+# "_PatchedBy<mod.id,other.id>" in their name
+_RE_FRAME_METHOD = re.compile(r"at\s+([\w`.<>+]+)")
+_RE_PATCHED_BY = re.compile(r"_PatchedBy<([^>]+)>")
+
+# Log sources and frame namespaces that belong to the game or its runtime
+# rather than to a mod.
+_NON_MOD_SOURCES = frozenset(("SMAPI", "game"))
+_FRAMEWORK_NAMESPACES = frozenset((
+    "System", "Microsoft", "Mono", "MonoMod", "MonoGame", "Microsoft.Xna",
+    "StardewValley", "StardewModdingAPI", "Netcode", "HarmonyLib", "Harmony",
+    "xTile", "Galaxy", "GalaxyCSharp", "Steamworks", "Newtonsoft", "DMD", "lambda_method",
+))
+
+
+def attribute_frame(frame: str) -> Optional[str]:
+    """Mod responsible for a stack frame, or None for game/framework frames."""
+    m = _RE_PATCHED_BY.search(frame)
+    if m:
+        return m.group(1).split(",", 1)[0].strip()
+    m = _RE_FRAME_METHOD.match(frame)
+    if not m:
+        return None
+    root = m.group(1).split(".", 1)[0]
+    if not root or root in _FRAMEWORK_NAMESPACES or root.startswith(("<", "(")):
+        return None
+    return root
+
+
+def _set_exception_type(record: ExceptionRecord, text: str) -> None:
+    if "Exception" not in text and "Error" not in text:
+        return
+    m = _RE_EXCEPTION.search(text)
+    if m:
+        record.exception_type = m.group(1)
+        record.exception_message = (m.group(2) or "").strip()
+
+
+def _timed_source(line: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (source, asset edit target) of a "[HH:MM:SS LEVEL Source]" line. SMAPI's
+    own "Mod (from Mods\\...)" loading lines are credited to that mod, and
+    asset edits to the mod making them plus the content pack they are for.
+    """
+    end = line.find("]", 10)
+    if end < 0:
+        return None, None
+    source = line[10:end].partition(" ")[2].strip()
+    if source not in _NON_MOD_SOURCES:
+        return source, None
+    if "(from Mods" in line:
+        m = _RE_LOADING_MOD.search(line)
+        return (m.group(1) if m else source), None
+    msg = line[end + 1:].strip()
+    for verb in _EDIT_VERBS:
+        i = msg.find(verb)
+        if i > 0:
+            editor = msg[:i]
+            j = msg.find(_EDIT_PACK, i)
+            if j >= 0:
+                k = msg.find("'", j + len(_EDIT_PACK))
+                if k > j:
+                    return editor, msg[j + len(_EDIT_PACK):k]
+            return editor, editor
+    return source, None
+
+
+def _strip_line_prefix(line: str, m: Optional[re.Match] = None) -> str:
+    # Strip "[HH:MM:SS ...]" (m: its match, if already done) and/or a bare
+    # "HH:MM:SS " prefix
+    if m is None:
+        m = _RE_LINE_PREFIX.match(line)
+    msg = line[m.end():] if m else line
+    m = _RE_TIME_PREFIX.match(msg)
+    if m:
+        msg = msg[m.end():]
+    return msg.strip()
+
+
+# detector family -> the parser methods that implement it
+_PROFILE_DETECTORS: Dict[str, Tuple[str, ...]] = {
+    "versions": ("_on_versions",),
+    "counts": ("_on_counts", "_on_mod_entry"),
+    "load tracking": ("_on_loading_mod", "_on_failed", "_on_elapsed"),
+    "sections": ("_on_section",),
+    "errors/warnings": ("_on_level", "_on_trace_line", "_close_trace"),
+    "alerts": ("_on_alert",),
+    "startup timing": ("_on_tick", "_on_asset_edit", "_on_phase"),
+    "rules": ("_scan_rules", "_on_rules"),
+}
+_PROFILE_REST = "line loop & prefilters"
+
+
+class ParserProfile:
+    """
+    Calls and time per detector family of SmapiLogParser. instrument()
+    shadows the parser's detector methods with timing wrappers on that one
+    instance, so parsers without a profile run the plain methods and pay
+    nothing. Calls are prefilter hits: the cheap "in" checks in the line
+    loop decide which lines reach a detector.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.seconds: Counter = Counter()
+        self.lines = 0
+        self.total = 0.0
+
+    def instrument(self, parser: "SmapiLogParser") -> None:
+        for family, names in _PROFILE_DETECTORS.items():
+            for name in names:
+                setattr(parser, name, self._timed(family, getattr(parser, name)))
+        feed_batch = parser._feed_batch
+        clock = time.perf_counter
+
+        def timed_batch(lines: Sequence[str], text: Optional[str] = None) -> None:
+            start = clock()
+            try:
+                feed_batch(lines, text)
+            finally:
+                self.total += clock() - start
+                self.lines += len(lines)
+
+        parser._feed_batch = timed_batch
+
+    def _timed(self, family: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        calls, seconds, clock = self.calls, self.seconds, time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            try:
+                return method(*args)
+            finally:
+                seconds[family] += clock() - start
+                calls[family] += 1
+
+        return timed
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        """Add a to_dict() result (e.g. from a batch worker)."""
+        self.lines += other["lines"]
+        self.total += other["total_seconds"]
+        for row in other["detectors"]:
+            if row["name"] != _PROFILE_REST:
+                self.calls[row["name"]] += row["calls"]
+                self.seconds[row["name"]] += row["seconds"]
+
+    def rows(self) -> List[Tuple[str, int, float]]:
+        """(family, calls, seconds), slowest first; the rest of the loop is its own row."""
+        rows = [(name, self.calls[name], self.seconds[name]) for name in _PROFILE_DETECTORS]
+        rows.append((_PROFILE_REST, self.lines, max(0.0, self.total - sum(self.seconds.values()))))
+        rows.sort(key=lambda row: -row[2])
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lines": self.lines,
+            "total_seconds": round(self.total, 6),
+            "detectors": [{"name": n, "calls": c, "seconds": round(sec, 6)} for n, c, sec in self.rows()],
+        }
+
+    def format_table(self) -> str:
+        total = self.total or 1.0
+        out = [f"{'detector':<24}{'calls':>12}{'ms':>10}{'share':>8}"]
+        for name, calls, seconds in self.rows():
+            out.append(f"{name:<24}{calls:>12}{seconds * 1000:>10.1f}{seconds / total:>8.1%}")
+        out.append(f"{'total':<24}{self.lines:>12}{self.total * 1000:>10.1f}")
+        return "\n".join(out)
+
+    def summary_line(self, top: int = 4) -> str:
+        total = self.total or 1.0
+        return " · ".join(
+            f"{name} {seconds * 1000:.0f}ms ({seconds / total:.0%}, {calls})"
+            for name, calls, seconds in self.rows()[:top]
+        )
 
-    for line in lines:
-        # Versions
-        if "SMAPI" in line and "with Stardew Valley" in line:
-            m = re.search(r"SMAPI\s+([0-9.]+)\s+with Stardew Valley\s+([0-9.]+)", line)
-            if m:
-                analysis.smapi_version = m.group(1)
-                analysis.game_version = m.group(2)
 
-        # Counts
-        if "Loaded" in line and "mods:" in line:
-            m = re.search(r"Loaded\s+(\d+)\s+mods", line)
-            if m:
-                analysis.mod_count = int(m.group(1))
-        if "Loaded" in line and "content packs:" in line:
-            m = re.search(r"Loaded\s+(\d+)\s+content packs", line)
+class SmapiLogParser:
+    """
+    Single-pass SMAPI log parser.
+
+    Every line is classified once: cheap substring checks decide which
+    detectors run, detectors use precompiled patterns, and the Skipped /
+    Save serializer / Patched / Console blocks are tracked by a small state
+    machine instead of being re-checked per flag. Lines can be fed in any
+    number of batches; call finish() to get the SmapiAnalysis.
+    """
+
+    def __init__(
+        self, index_lines: bool = False, rules: Optional[RuleSet] = None, profile: Optional[ParserProfile] = None
+    ) -> None:
+        self.analysis = SmapiAnalysis()
+        self.rules = rules if rules is not None else builtin_rule_set()
+        self._rule_hits: Dict[str, RuleHit] = {}
+        # line offsets and times, filled by feed_bytes()
+        self.line_index: Optional[LogLineIndex] = LogLineIndex() if index_lines else None
+        self.current_loading_mod: Optional[str] = None
+        # one flag per entry in _SECTIONS
+        self.open_sections: List[bool] = [False] * len(_SECTIONS)
+        self.line_count = 0
+        self._error_groups: Dict[str, MessageGroup] = {}
+        self._warning_groups: Dict[str, MessageGroup] = {}
+        # exception whose stack trace is still being read
+        self._trace: Optional[ExceptionRecord] = None
+        # one shared copy of each stack frame / exception text
+        self._strings: Dict[str, str] = {}
+        # mod list being read ("Loaded N mods:" until the first unindented line)
+        self._mod_list: Optional[List[ModInfo]] = None
+        # next line number whose time is sampled into line_index
+        self._next_stamp = 1
+        # startup profile (see _on_tick); closed once the save is loaded
+        self.timing_open = True
+        self._clock_base: Optional[int] = None
+        self._clock_prefix = "[--:--:--"
+        self._clock_wrap = 0
+        self._clock = 0
+        # last timestamped line: it is charged until the next timestamp
+        self._timed_line: Optional[str] = None
+        self._mod_timings: Dict[str, TimingEntry] = {}
+        self._edit_timings: Dict[str, TimingEntry] = {}
+        # bytes fed through feed_bytes() that ended in a complete line
+        self.bytes_consumed = 0
+        self._pending = b""
+        if profile is not None:
+            profile.instrument(self)
+
+    # ---------- Detectors ----------
+
+    def _on_versions(self, line: str) -> None:
+        m = _RE_VERSIONS.search(line)
+        if m:
+            self.analysis.smapi_version = m.group(1)
+            self.analysis.game_version = m.group(2)
+
+    def _on_counts(self, line: str) -> Optional[List[ModInfo]]:
+        """Read a "Loaded N mods/content packs:" header; returns the list its entries go to."""
+        if "mods:" in line:
+            m = _RE_MOD_COUNT.search(line)
             if m:
-                analysis.content_pack_count = int(m.group(1))
-
-        # Startup time
-        if "Instance_LoadContent() finished, elapsed =" in line:
-            m = re.search(r"elapsed\s*=\s*'([^']+)'", line)
+                self.analysis.mod_count = int(m.group(1))
+                return self.analysis.loaded_mods
+        if "content packs:" in line:
+            m = _RE_CONTENT_PACK_COUNT.search(line)
             if m:
-                seconds = _parse_time_to_seconds(m.group(1))
-                if seconds is not None:
-                    analysis.slow_start_seconds = seconds
-
-        # Track which mod is currently being loaded
-        m_load = re.search(r"]\s+(.+?)\s+\(from\s+Mods", line)
-        if m_load:
-            current_loading_mod = m_load.group(1)
-
-        # "Failed:" lines (TRACE section)
-        if "Failed:" in line:
-            reason = line.split("Failed:", 1)[1].strip()
-            if current_loading_mod:
-                analysis.failed_mods.append(SkippedMod(current_loading_mod, reason))
-                # Missing dependency info
-                if "requires mods which aren't installed" in reason:
-                    m_dep = re.search(r"\(([^)]+)\)", reason)
-                    if m_dep:
-                        missing = m_dep.group(1)
-                        analysis.missing_dependencies.append(
-                            MissingDependency(current_loading_mod, missing)
-                        )
-
-        # Skipped mods header
-        if "Skipped mods" in line:
-            in_skipped_section = True
-            continue
+                self.analysis.content_pack_count = int(m.group(1))
+                return self.analysis.loaded_content_packs
+        return None
 
-        if in_skipped_section:
-            if "- " in line:
-                m = re.search(r"]\s+-\s+(.+?)\s+because\s+(.+)$", line)
+    def _on_mod_entry(self, mods: List[ModInfo], line: str) -> Optional[List[ModInfo]]:
+        """
+        "   Name 1.2.3 by Author | for Parent | description": add it to mods
+        and return mods, or return None once the list has ended.
+        """
+        m = _RE_MOD_ENTRY.search(line)
+        if m is None or not line.startswith("["):
+            return None
+        head, *rest = m.group(1).split(" | ")
+        for_mod = rest[0][4:] if rest and rest[0].startswith("for ") else None
+        name_version, sep, author = head.rpartition(" by ")
+        if not sep:
+            name_version, author = head, None
+        name, _, version = name_version.rpartition(" ")
+        if not name:
+            name, version = version, None
+        mods.append(ModInfo(name, version, author, for_mod))
+        return mods
+
+    def _on_elapsed(self, line: str) -> None:
+        m = _RE_ELAPSED.search(line)
+        if m:
+            seconds = _parse_time_to_seconds(m.group(1))
+            if seconds is not None:
+                self.analysis.slow_start_seconds = seconds
+
+    def _on_loading_mod(self, line: str) -> None:
+        m = _RE_LOADING_MOD.search(line)
+        if m:
+            self.current_loading_mod = m.group(1)
+
+    def _on_failed(self, line: str) -> None:
+        reason = line.split("Failed:", 1)[1].strip()
+        mod = self.current_loading_mod
+        if mod:
+            self.analysis.failed_mods.append(SkippedMod(mod, reason))
+            if _MISSING_DEP_MARKER in reason:
+                m = _RE_PARENTHESIZED.search(reason)
                 if m:
-                    name = m.group(1).strip()
-                    reason = m.group(2).strip()
-                    analysis.skipped_mods.append(SkippedMod(name, reason))
-                    if "requires mods which aren't installed" in reason:
-                        m_dep = re.search(r"\(([^)]+)\)", reason)
-                        if m_dep:
-                            analysis.missing_dependencies.append(
-                                MissingDependency(name, m_dep.group(1))
-                            )
-            elif line.strip() == "" or "These mods could not be added" in line:
+                    self.analysis.missing_dependencies.append(MissingDependency(mod, m.group(1)))
+
+    def _on_section(self, line: str) -> bool:
+        """Advance the section state machine; True means the line was a header."""
+        open_sections = self.open_sections
+        for index, (header, intro, attr) in enumerate(_SECTIONS):
+            if header in line:
+                open_sections[index] = True
+                return True
+            if not open_sections[index]:
+                continue
+            if "- " in line:
+                if index == _SECTION_SKIPPED:
+                    m = _RE_SKIPPED_ITEM.search(line)
+                    if m:
+                        name = m.group(1).strip()
+                        reason = m.group(2).strip()
+                        self.analysis.skipped_mods.append(SkippedMod(name, reason))
+                        if _MISSING_DEP_MARKER in reason:
+                            m_dep = _RE_PARENTHESIZED.search(reason)
+                            if m_dep:
+                                self.analysis.missing_dependencies.append(
+                                    MissingDependency(name, m_dep.group(1))
+                                )
+                else:
+                    m = _RE_LIST_ITEM.search(line)
+                    if m:
+                        getattr(self.analysis, attr).append(m.group(1).strip())
+            elif intro in line or line.strip() == "":
                 # stay in section
                 pass
             else:
-                in_skipped_section = False
+                open_sections[index] = False
+        return False
+
+    def _on_level(self, line: str, is_error: bool, is_warning: bool, line_no: int) -> Optional[ExceptionRecord]:
+        """Record an error/warning; returns a new ExceptionRecord for "[... ERROR Source]" lines."""
+        m = _RE_LINE_PREFIX.match(line)
+        msg = _strip_line_prefix(line, m)
+        if not msg:
+            return None
+        a = self.analysis
+        record = None
+        if m:
+            level, _, source = m.group(2).partition(" ")
+            event_source = source.strip() or None
+            time = m.group(1)
+        else:
+            level = event_source = time = None
+        if is_error:
+            msg = a.errors.append(msg)
+            a.error_events.add(line_no, level, event_source, time)
+            group = _add_to_group(self._error_groups, msg, line_no)
+            if group is not None:
+                a.error_groups.append(group)
+            if level == "ERROR":
+                record = ExceptionRecord(line_no, source, msg)
+                _set_exception_type(record, msg)
+                a.exceptions.append(record)
+                if source and source not in _NON_MOD_SOURCES:
+                    self._attribute(record, source)
+        if is_warning:
+            a.warnings.append(msg)
+            a.warning_events.add(line_no, level, event_source, time)
+            group = _add_to_group(self._warning_groups, msg, line_no)
+            if group is not None:
+                a.warning_groups.append(group)
+        return record
+
+    def _on_trace_line(self, record: ExceptionRecord, line: str) -> None:
+        text = line.strip()
+        if text.startswith("at "):
+            # the same traces repeat all through a log: keep one copy of each frame
+            text = self._strings.setdefault(text, text)
+            record.frames.append(text)
+            if record.mod is None:
+                mod = attribute_frame(text)
+                if mod:
+                    self._attribute(record, mod)
+        elif text and record.exception_type is None:
+            _set_exception_type(record, text)
+            if record.exception_type is not None:
+                strings = self._strings
+                record.exception_type = strings.setdefault(record.exception_type, record.exception_type)
+                record.exception_message = strings.setdefault(record.exception_message, record.exception_message)
+
+    def _close_trace(self, record: ExceptionRecord) -> None:
+        # nothing in the trace pointed at a mod: blame the log source
+        if record.mod is None:
+            self._attribute(record, record.source or "SMAPI")
+
+    def _attribute(self, record: ExceptionRecord, mod: str) -> None:
+        record.mod = mod
+        self.analysis.mod_exceptions.setdefault(mod, []).append(record)
+
+    # Startup profile. Timestamps only have 1s resolution, so the work happens
+    # once per second of log: when the timestamp changes, the elapsed time is
+    # charged to whoever logged the last line before it. Per line, the feed
+    # loop only compares the "[HH:MM:SS" prefix.
+
+    def _on_stamp(self, line: str, line_no: int) -> int:
+        """
+        Sample the time of the first timestamped line of a stride into the
+        line index; returns the line number to sample next.
+        """
+        try:
+            seconds = int(line[1:3]) * 3600 + int(line[4:6]) * 60 + int(line[7:9])
+        except ValueError:
+            return line_no + 1
+        if line[3:4] != ":" or line[6:7] != ":":
+            return line_no + 1
+        self.line_index.add_time(seconds, line_no - 1)
+        return line_no - (line_no - 1) % _LINE_INDEX_STRIDE + _LINE_INDEX_STRIDE
+
+    def _on_tick(self, previous: Optional[str], line: str) -> str:
+        """A line with a new timestamp; returns its "[HH:MM:SS" prefix."""
+        try:
+            raw = int(line[1:3]) * 3600 + int(line[4:6]) * 60 + int(line[7:9])
+        except ValueError:
+            return self._clock_prefix
+        if line[3:4] != ":" or line[6:7] != ":":
+            return self._clock_prefix
+        if self._clock_base is None:
+            self._clock_base = raw
+            self.analysis.startup_phases.append(TimingSpan("SMAPI startup", 0, 0))
+            return line[:9]
+        if raw + self._clock_wrap - self._clock_base < self._clock:
+            self._clock_wrap += 86400  # past midnight
+        now = raw + self._clock_wrap - self._clock_base
+        if now > self._clock and previous is not None:
+            self._charge(previous, self._clock, now)
+        self._clock = now
+        self.analysis.startup_seconds = now
+        return line[:9]
+
+    def _charge(self, line: str, start: int, end: int) -> None:
+        source, edit = _timed_source(line)
+        if source is None:
+            return
+        gap = end - start
+        a = self.analysis
+        timing = self._mod_timings.get(source)
+        if timing is None:
+            timing = self._mod_timings[source] = TimingEntry(source)
+            a.mod_timings.append(timing)
+        timing.seconds += gap
+        if edit is not None:
+            self._edit_timing(edit).seconds += gap
+        # flamegraph timeline: contiguous time from the same source is one span
+        timeline = a.startup_timeline
+        if timeline and timeline[-1].name == source and timeline[-1].end == start:
+            timeline[-1].end = end
+        elif len(timeline) < _TIMELINE_MAX_SPANS:
+            timeline.append(TimingSpan(source, start, end))
+
+    def _edit_timing(self, name: str) -> TimingEntry:
+        timing = self._edit_timings.get(name)
+        if timing is None:
+            timing = self._edit_timings[name] = TimingEntry(name)
+            self.analysis.asset_edit_timings.append(timing)
+        return timing
+
+    def _on_asset_edit(self, line: str) -> None:
+        _source, edit = _timed_source(line)
+        if edit is not None:
+            self._edit_timing(edit).count += 1
+
+    def _on_phase(self, line: str) -> bool:
+        """Startup phase marker; False once the profile is complete."""
+        for marker, name in _STARTUP_PHASES:
+            if marker in line:
+                break
+        else:
+            return True
+        phases = self.analysis.startup_phases
+        if phases:
+            phases[-1].end = self._clock
+        if name is None:
+            self._close_timing()
+            return False
+        phases.append(TimingSpan(name, self._clock, self._clock))
+        return True
+
+    def _close_timing(self) -> None:
+        self.timing_open = False
+        self._timed_line = None
+        phases = self.analysis.startup_phases
+        if phases:
+            phases[-1].end = self._clock
+
+    def _scan_rules(self, text: str) -> List[Rule]:
+        return self.rules.scan(text)
+
+    def _on_rules(self, line: str, line_no: int, rules: Sequence[Rule]) -> None:
+        level = None
+        for rule in rules:
+            if not rule.test(line):
+                continue
+            if rule.levels:
+                if level is None:
+                    m = _RE_LINE_PREFIX.match(line)
+                    level = m.group(2).partition(" ")[0] if m else ""
+                if level not in rule.levels:
+                    continue
+            hit = self._rule_hits.get(rule.id)
+            if hit is None:
+                hit = self._rule_hits[rule.id] = RuleHit(rule.id, 0, line_no, line.strip())
+                self.analysis.rule_hits.append(hit)
+            hit.count += 1
+            if rule.conflict:
+                self.analysis.external_conflicts.append(rule.conflict)
+
+    def _on_alert(self, line: str) -> None:
+        m = _RE_UPDATE_ALERT.search(line)
+        if m:
+            self.analysis.update_infos.append(
+                UpdateInfo(
+                    name=m.group(1).strip(),
+                    latest=m.group(2).strip(),
+                    current=m.group(4).strip(),
+                    url=m.group(3).strip(),
+                )
+            )
 
-        # Save serializer section
-        if "Changed save serializer" in line:
-            in_save_serializer_section = True
-            continue
-        if in_save_serializer_section:
-            if "- " in line:
-                m = re.search(r"-\s+(.+)$", line)
-                if m:
-                    analysis.save_serializer_mods.append(m.group(1).strip())
-            elif line.strip() == "" or "These mods change the save serializer" in line:
-                pass
-            else:
-                in_save_serializer_section = False
+    # ---------- Feeding ----------
 
-        # Patched game code section
-        if "Patched game code" in line:
-            in_patched_section = True
-            continue
-        if in_patched_section:
-            if "- " in line:
-                m = re.search(r"-\s+(.+)$", line)
-                if m:
-                    analysis.patched_mods.append(m.group(1).strip())
-            elif line.strip() == "" or "These mods directly change the game code" in line:
-                pass
-            else:
-                in_patched_section = False
+    def feed(self, lines: Iterable[str]) -> None:
+        """Classify lines (without trailing newlines)."""
+        if isinstance(lines, (list, tuple)):
+            self._feed_batch(lines)
+            return
+        # the rule scan works on batches; cut streams of lines into some
+        it = iter(lines)
+        while True:
+            batch = list(itertools.islice(it, _FEED_BATCH_LINES))
+            if not batch:
+                break
+            self._feed_batch(batch)
+
+    def _feed_batch(self, lines: Sequence[str], text: Optional[str] = None) -> None:
+        # rules present anywhere in the batch; usually none, so the per-line
+        # cost below is one truth test
+        batch_rules = self._scan_rules("\n".join(lines) if text is None else text)
+        open_sections = self.open_sections
+        on_versions = self._on_versions
+        on_counts = self._on_counts
+        on_mod_entry = self._on_mod_entry
+        on_elapsed = self._on_elapsed
+        on_loading_mod = self._on_loading_mod
+        on_failed = self._on_failed
+        on_section = self._on_section
+        on_level = self._on_level
+        on_trace_line = self._on_trace_line
+        close_trace = self._close_trace
+        on_tick = self._on_tick
+        on_stamp = self._on_stamp
+        on_asset_edit = self._on_asset_edit
+        on_phase = self._on_phase
+        on_rules = self._on_rules
+        on_alert = self._on_alert
+        trace = self._trace
+        mod_list = self._mod_list
+        # no line index: never sample times
+        next_stamp = self._next_stamp if self.line_index is not None else sys.maxsize
+        timing_open = self.timing_open
+        clock_prefix = self._clock_prefix
+        timed_line = self._timed_line
+        # section headers as locals: four "in" checks beat one alternation regex
+        h_skipped, h_serializer, h_patched, h_console = (header for header, _intro, _attr in _SECTIONS)
+
+        count = self.line_count
+        for line in lines:
+            count += 1
+
+            if count >= next_stamp and line.startswith("["):
+                next_stamp = on_stamp(line, count)
+
+            if timing_open and line.startswith("["):
+                if not line.startswith(clock_prefix):
+                    clock_prefix = on_tick(timed_line, line)
+                timed_line = line
+                if " edited " in line or " loaded asset " in line:
+                    on_asset_edit(line)
+                if (
+                    "mods..." in line
+                    or "Mods loaded and ready" in line
+                    or "Instance_LoadContent() finished" in line
+                    or "Context: loaded save" in line
+                ):
+                    timing_open = on_phase(line)
+
+            # SMAPI only prefixes the first line of a message; anything
+            # unprefixed after an ERROR line is its stack trace
+            if trace is not None:
+                if line.startswith("["):
+                    close_trace(trace)
+                    trace = None
+                else:
+                    on_trace_line(trace, line)
+
+            if "with Stardew Valley" in line and "SMAPI" in line:
+                on_versions(line)
+            if mod_list is not None:
+                mod_list = on_mod_entry(mod_list, line)
+            if mod_list is None and "Loaded" in line:
+                mod_list = on_counts(line)
+            if "Instance_LoadContent() finished, elapsed =" in line:
+                on_elapsed(line)
+            if "(from" in line:
+                on_loading_mod(line)
+            if "Failed:" in line:
+                on_failed(line)
+
+            # Section headers end the line (they are never errors/warnings)
+            if True in open_sections or (
+                h_skipped in line or h_serializer in line or h_patched in line or h_console in line
+            ):
+                if on_section(line):
+                    continue
+
+            if batch_rules:
+                on_rules(line, count, batch_rules)
+
+            is_error = "ERROR" in line
+            is_warning = "WARN" in line
+            if is_error or is_warning:
+                record = on_level(line, is_error, is_warning, count)
+                if record is not None:
+                    trace = record
+
+            if "ALERT SMAPI" in line and "You can update" not in line:
+                on_alert(line)
+
+        self.line_count = count
+        self._trace = trace
+        self._mod_list = mod_list
+        if self.line_index is not None:
+            self._next_stamp = next_stamp
+        self.timing_open = timing_open
+        self._clock_prefix = clock_prefix
+        self._timed_line = timed_line if timing_open else None
+
+    def feed_line(self, line: str) -> None:
+        self.feed((line,))
+
+    def feed_bytes(self, data: bytes, final: bool = False) -> List[str]:
+        """
+        Feed raw UTF-8 log bytes. Only complete lines are parsed; a trailing
+        partial line is held back until more data arrives or final=True.
+        Returns the lines that were parsed.
+        """
+        buf = self._pending + data if self._pending else data
+        if final:
+            complete, self._pending = buf, b""
+        else:
+            cut = buf.rfind(b"\n") + 1
+            complete, self._pending = buf[:cut], buf[cut:]
+        if not complete:
+            return []
+        # chunks end on "\n", so multi-byte characters are never split;
+        # lines are cut on "\n" only, like the line index counts them
+        text = complete.decode("utf-8", errors="replace").replace("\r\n", "\n")
+        lines = split_log_lines(text)
+        self._feed_batch(lines, text)
+        if self.line_index is not None:
+            self.line_index.add_block(complete, self.bytes_consumed)
+        self.bytes_consumed += len(complete)
+        return lines
+
+    def finish(self) -> SmapiAnalysis:
+        if self._trace is not None:
+            self._close_trace(self._trace)
+            self._trace = None
+        if self.timing_open:
+            self._close_timing()
+        return self.analysis
+
+
+def analyze_smapi_log(text: str, rules: Optional[RuleSet] = None) -> SmapiAnalysis:
+    parser = SmapiLogParser(rules=rules)
+    parser._feed_batch(split_log_lines(text), text)
+    analysis = parser.finish()
+    analysis.raw_log = text
+    return analysis
+
+
+def analyze_smapi_log_lines(lines: Iterable[str], rules: Optional[RuleSet] = None) -> SmapiAnalysis:
+    """Analyze an iterable of lines (e.g. a text file handle) without joining them."""
+    parser = SmapiLogParser(rules=rules)
+    parser.feed(line.rstrip("\r\n") for line in lines)
+    return parser.finish()
+
+
+class AnalysisCancelled(Exception):
+    pass
+
+
+def analyze_smapi_log_stream(
+    stream: BinaryIO,
+    chunk_size: int = _CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    index_lines: bool = False,
+    rules: Optional[RuleSet] = None,
+    profile: Optional[ParserProfile] = None,
+) -> SmapiAnalysis:
+    """
+    Analyze a binary stream chunk by chunk; the log is never held in memory
+    whole. progress(bytes_read) is called after every chunk, and setting
+    the cancel event stops the analysis with AnalysisCancelled. With
+    index_lines, analysis.line_index records the offset of every line. A
+    profile collects per-detector timings (see ParserProfile).
+    """
+    parser = SmapiLogParser(index_lines=index_lines, rules=rules, profile=profile)
+    done = 0
+    while True:
+        if cancel is not None and cancel.is_set():
+            raise AnalysisCancelled()
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed_bytes(chunk)
+        done += len(chunk)
+        if progress is not None:
+            progress(done)
+    parser.feed_bytes(b"", final=True)
+    analysis = parser.finish()
+    analysis.log_size = parser.bytes_consumed
+    analysis.line_index = parser.line_index
+    return analysis
 
-        # Direct console access
-        if "Direct console access" in line:
-            in_console_section = True
-            continue
-        if in_console_section:
-            if "- " in line:
-                m = re.search(r"-\s+(.+)$", line)
-                if m:
-                    analysis.direct_console_mods.append(m.group(1).strip())
-            elif line.strip() == "" or "These mods access the SMAPI console window" in line:
-                pass
-            else:
-                in_console_section = False
-
-        # External conflicts (RivaTuner etc.)
-        if "RivaTuner Statistics Server" in line:
-            analysis.external_conflicts.append("RivaTuner Statistics Server")
-
-        # Generic ERROR / WARN lines, including game/mod errors, not just SMAPI
-        if "ERROR" in line and "Skipped mods" not in line:
-            msg = line
-            # Strip [HH:MM:SS ...] prefix
-            msg = re.sub(r"^\[\d{2}:\d{2}:\d{2} [^\]]*\]\s*", "", msg)
-            # Strip HH:MM:SS prefix without brackets
-            msg = re.sub(r"^\d{2}:\d{2}:\d{2}\s+", "", msg)
-            msg = msg.strip()
-            if msg:
-                analysis.errors.append(msg)
-
-        if "WARN" in line and "Changed save serializer" not in line:
-            msg = line
-            msg = re.sub(r"^\[\d{2}:\d{2}:\d{2} [^\]]*\]\s*", "", msg)
-            msg = re.sub(r"^\d{2}:\d{2}:\d{2}\s+", "", msg)
-            msg = msg.strip()
-            if msg:
-                analysis.warnings.append(msg)
-
-        # Update infos (alert details)
-        if "ALERT SMAPI" in line and "You can update" not in line:
-            m = re.search(r"]\s+(.+?)\s+([0-9.]+):\s+(\S+)\s+\(you have\s+([0-9.]+)\)", line)
-            if m:
-                name = m.group(1).strip()
-                latest = m.group(2).strip()
-                url = m.group(3).strip()
-                current = m.group(4).strip()
-                analysis.update_infos.append(
-                    UpdateInfo(name=name, latest=latest, current=current, url=url)
-                )
 
+def analyze_smapi_log_file(
+    path: str,
+    progress: Optional[Callable[[int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    index_lines: bool = True,
+    rules: Optional[RuleSet] = None,
+    profile: Optional[ParserProfile] = None,
+) -> SmapiAnalysis:
+    """
+    Stream-analyze a log file, compressed file or zip member (see LogInput);
+    the raw log stays on disk (see read_raw_log). progress gets positions in
+    the unit of log_input_total(path).
+    """
+    with LogInput(path) as source:
+        report = None
+        if progress is not None:
+            report = lambda _done: progress(source.position())
+        analysis = analyze_smapi_log_stream(
+            source.stream, progress=report, cancel=cancel, index_lines=index_lines, rules=rules, profile=profile
+        )
+    analysis.log_path = source.path
+    if analysis.line_index is not None:
+        analysis.line_index.path = source.path
     return analysis
 
 
+def log_input_total(path: str) -> int:
+    with LogInput(path) as source:
+        return source.total
+
+
+def mod_exception_summary(analysis: SmapiAnalysis) -> List[Tuple[str, int, List[str]]]:
+    """(mod, exception count, distinct exception types) for mods, most exceptions first."""
+    rows = []
+    for mod, records in analysis.mod_exceptions.items():
+        if mod in _NON_MOD_SOURCES:
+            continue
+        types = list(dict.fromkeys(r.exception_type for r in records if r.exception_type))
+        rows.append((mod, len(records), types))
+    rows.sort(key=lambda row: -row[1])
+    return rows
+
+
+def startup_ranking(analysis: SmapiAnalysis, top: Optional[int] = 10) -> List[TimingEntry]:
+    """Sources / mods that took the most startup time, slowest first."""
+    ranked = sorted((e for e in analysis.mod_timings if e.seconds > 0), key=lambda e: -e.seconds)
+    return ranked[:top] if top else ranked
+
+
+def asset_edit_ranking(analysis: SmapiAnalysis, top: Optional[int] = 10) -> List[TimingEntry]:
+    ranked = sorted(analysis.asset_edit_timings, key=lambda e: (-e.seconds, -e.count))
+    return ranked[:top] if top else ranked
+
+
+def read_raw_log(analysis: SmapiAnalysis, start: int = 0, end: Optional[int] = None) -> str:
+    """
+    Return the raw log text, or the [start, end) byte range of it for
+    file-based analyses. Text-based analyses return raw_log as-is.
+    """
+    if analysis.log_path is None:
+        return analysis.raw_log
+    with LogInput(analysis.log_path) as source:
+        f = source.stream
+        f.seek(start)
+        data = f.read() if end is None else f.read(max(0, end - start))
+    return data.decode("utf-8", errors="replace")
+
+
+def iter_raw_log_lines(analysis: SmapiAnalysis) -> Iterator[str]:
+    """Raw log lines in order, streamed from disk for file-based analyses."""
+    if analysis.log_path is None:
+        yield from split_log_lines(analysis.raw_log)
+        return
+    with LogInput(analysis.log_path) as source:
+        for raw in source.stream:
+            yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
 # =========================
 # Suggestions builder
 # =========================
 
-def build_suggestions(analysis: SmapiAnalysis, lang: str) -> List[str]:
-    t = lambda key, **kw: TEXT[lang][key].format(**kw)
+def build_suggestions(analysis: SmapiAnalysis, lang: str, rules: Optional[RuleSet] = None) -> List[str]:
+    t = lambda key, **kw: _tr(lang, key, **kw)
     suggestions: List[str] = []
 
     # Skipped mods
@@ -1135,30 +2784,661 @@ def build_suggestions(analysis: SmapiAnalysis, lang: str) -> List[str]:
     for mname in analysis.save_serializer_mods:
         suggestions.append(t("sg.save_serializer", mod=mname))
 
-    # Many patched mods
-    if len(analysis.patched_mods) >= 15:
-        suggestions.append(t("sg.patched_mods_many", count=len(analysis.patched_mods)))
-
-    # External conflicts
-    if any("RivaTuner" in x for x in analysis.external_conflicts):
-        suggestions.append(t("sg.rivatuner"))
-
     # Updates
     if analysis.update_infos:
         suggestions.append(t("sg.updates", count=len(analysis.update_infos)))
 
-    # Slow startup
-    if analysis.slow_start_seconds and analysis.slow_start_seconds > 20:
-        suggestions.append(t("sg.slow_start", seconds=analysis.slow_start_seconds))
+    rules = rules if rules is not None else builtin_rule_set()
+
+    # Known issues matched by rule-pack signatures
+    for hit in analysis.rule_hits:
+        rule = rules.rule(hit.rule_id)
+        if rule is not None and rule.suggestion:
+            text = _rule_text(rule.suggestion, lang, count=hit.count, line=hit.first_line, sample=hit.sample)
+            if text:
+                suggestions.append(text)
+
+    # Rule-pack thresholds (many patched mods, slow startup, ...)
+    for check in rules.checks:
+        value = getattr(analysis, check.field)
+        if value is None:
+            continue
+        if isinstance(value, (list, dict)):
+            value = len(value)
+        if not (
+            (check.at_least is not None and value >= check.at_least)
+            or (check.above is not None and value > check.above)
+        ):
+            continue
+        text = _rule_text(check.suggestion, lang, count=value, seconds=value, value=value)
+        if text:
+            suggestions.append(text)
+        if check.slowest_mods:
+            slowest = [e for e in startup_ranking(analysis, None) if e.name not in _NON_MOD_SOURCES][:3]
+            if slowest:
+                names = ", ".join(f"{e.name} ({e.seconds:.0f}s)" for e in slowest)
+                text = _rule_text(check.slowest_mods, lang, mods=names)
+                if text:
+                    suggestions.append(text)
 
     return suggestions
 
 
+# =========================
+# Reports (TXT / HTML)
+# =========================
+
+# Reports are generators written straight to the output file, so memory
+# stays flat however many groups or raw lines there are.
+
+# HTML lists show this many rows inline; the rest go into collapsed pages
+_HTML_INLINE_ITEMS = 200
+_HTML_PAGE_ITEMS = 2000
+_HTML_INLINE_LINES = 2000
+_HTML_PAGE_LINES = 20000
+
+# Inflates a collapsed page the first time it is opened
+_HTML_LAZY_SCRIPT = """<script>
+document.addEventListener("toggle", function (e) {
+  var d = e.target;
+  if (!d.open || !d.classList || !d.classList.contains("lazy") || d.dataset.loaded) return;
+  d.dataset.loaded = "1";
+  var out = d.querySelector("ul,pre");
+  var fail = function () { out.textContent = document.body.dataset.lazyFail; };
+  if (!window.DecompressionStream) return fail();
+  var bytes = Uint8Array.from(atob(d.querySelector("script").textContent), function (c) { return c.charCodeAt(0); });
+  new Response(new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate"))).json().then(function (items) {
+    if (out.tagName === "PRE") { out.textContent = items.join("\\n"); return; }
+    var frag = document.createDocumentFragment();
+    items.forEach(function (text) {
+      var li = document.createElement("li");
+      li.className = d.dataset.cls;
+      li.textContent = text;
+      frag.appendChild(li);
+    });
+    out.appendChild(frag);
+  }, fail);
+}, true);
+</script>"""
+
+
+def group_text(group: MessageGroup, t: Callable[..., str]) -> str:
+    if group.count == 1:
+        return group.sample
+    occurrences = t("group_occurrences", count=group.count, first=group.first_line, last=group.last_line)
+    return f"{group.sample}  [{occurrences}]"
+
+
+def iter_plain_report(a: SmapiAnalysis, lang: str, rules: Optional[RuleSet] = None) -> Iterator[str]:
+    """Lines of the plain-text summary, produced one section at a time."""
+    t = functools.partial(_tr, lang)
+
+    yield t("overview_title")
+    yield "=" * 60
+    yield f"{t('overview_game_version')}: {a.game_version or t('overview_unknown')}"
+    yield f"{t('overview_smapi_version')}: {a.smapi_version or t('overview_unknown')}"
+    yield t("overview_mod_count", count=a.mod_count)
+    yield t("overview_content_pack_count", count=a.content_pack_count)
+    if a.slow_start_seconds is not None:
+        yield t("overview_slow_start", seconds=a.slow_start_seconds)
+    yield ""
+
+    # Startup profile
+    ranking = startup_ranking(a)
+    if ranking:
+        yield t("startup_header", seconds=a.startup_seconds)
+        yield "-" * 60
+        for e in ranking:
+            yield "  - " + t("startup_item", name=e.name, seconds=e.seconds)
+        if a.startup_phases:
+            yield t("startup_phases_header")
+            for ph in a.startup_phases:
+                yield (
+                    "  - " + t("startup_phase_item", name=ph.name, start=ph.start, seconds=ph.end - ph.start)
+                )
+        edits = asset_edit_ranking(a)
+        if edits:
+            yield t("startup_edits_header")
+            for e in edits:
+                yield "  - " + t("startup_edit_item", name=e.name, seconds=e.seconds, count=e.count)
+        yield ""
+
+    # Errors
+    yield t("errors_header")
+    yield "-" * 60
+    if not a.errors and not a.skipped_mods and not a.failed_mods:
+        yield t("errors_none")
+    else:
+        for sm in a.skipped_mods:
+            yield f"[Skipped] {sm.name} — {sm.reason}"
+        for fm in a.failed_mods:
+            yield f"[Failed] {fm.name} — {fm.reason}"
+        for g in a.error_groups:
+            yield group_text(g, t)
+    yield ""
+
+    # Warnings
+    yield t("warnings_header")
+    yield "-" * 60
+    if not a.warnings and not a.external_conflicts:
+        yield t("warnings_none")
+    else:
+        for g in a.warning_groups:
+            yield group_text(g, t)
+        for x in dict.fromkeys(a.external_conflicts):
+            if "RivaTuner" in x:
+                yield TEXT[lang]["warn_rivatuner"]
+            else:
+                yield t("warn_conflict", name=x)
+    yield ""
+
+    # Mod health
+    yield t("mod_health_title")
+    yield "-" * 60
+
+    if a.patched_mods:
+        yield t("mod_health_patched_header")
+        for m in a.patched_mods:
+            yield "  - " + m
+    if a.save_serializer_mods:
+        yield t("mod_health_save_header")
+        for m in a.save_serializer_mods:
+            yield "  - " + m
+    if a.direct_console_mods:
+        yield t("mod_health_console_header")
+        for m in a.direct_console_mods:
+            yield "  - " + m
+    if a.missing_dependencies:
+        yield t("mod_health_missing_dep_header")
+        for dep in a.missing_dependencies:
+            yield (
+                "  - "
+                + t(
+                    "mod_health_missing_dep_item",
+                    mod=dep.mod_name,
+                    missing=dep.missing,
+                )
+            )
+    exception_rows = mod_exception_summary(a)
+    if exception_rows:
+        yield t("mod_health_exceptions_header")
+        for mod, count, types in exception_rows:
+            yield (
+                "  - " + t("mod_health_exception_item", mod=mod, count=count, types=", ".join(types))
+            )
+    if a.update_infos:
+        yield t("mod_health_updates_header")
+        for u in a.update_infos:
+            yield (
+                "  - "
+                + t(
+                    "mod_health_update_item",
+                    name=u.name,
+                    current=u.current,
+                    latest=u.latest,
+                )
+            )
+
+    if (
+        not a.patched_mods
+        and not a.save_serializer_mods
+        and not a.direct_console_mods
+        and not a.missing_dependencies
+        and not a.update_infos
+        and not exception_rows
+    ):
+        yield t("mod_health_none")
+    yield ""
+
+    # Suggestions
+    yield t("suggestions_header")
+    yield "-" * 60
+    suggestions = build_suggestions(a, lang, rules)
+    if not suggestions:
+        yield t("suggestions_none")
+    else:
+        for s in suggestions:
+            yield " - " + s
+    yield ""
+
+
+def _html_timeline(spans: Sequence[TimingSpan], total: float) -> str:
+    """Flamegraph-style lane: one absolutely positioned bar per span."""
+    total = total or 1
+    bars = []
+    for span in spans:
+        if span.end <= span.start:
+            continue
+        hue = sum(map(ord, span.name)) * 37 % 360
+        left = 100.0 * span.start / total
+        width = 100.0 * (span.end - span.start) / total
+        label = html.escape(f"{span.name} ({span.end - span.start:.0f}s)", quote=True)
+        bars.append(
+            f"<div class='span' style='left:{left:.3f}%;width:{width:.3f}%;"
+            f"background:hsl({hue},60%,60%)' title='{label}'>{label}</div>"
+        )
+    return "<div class='timeline'>" + "".join(bars) + "</div>"
+
+
+def _html_lazy_page(kind: str, cls: str, summary: str, page: List[str]) -> str:
+    data = zlib.compress(json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+    body = "<pre></pre>" if kind == "pre" else "<ul></ul>"
+    return (
+        f"<details class='lazy' data-cls='{cls}'><summary>{html.escape(summary)}</summary>"
+        f"<script type='application/x-deflate-json'>{base64.b64encode(data).decode('ascii')}</script>"
+        f"{body}</details>"
+    )
+
+
+def _html_lazy_items(items: Iterable[str], cls: str, t: Callable[..., str]) -> Iterator[str]:
+    """
+    Finish an open <ul>: the first _HTML_INLINE_ITEMS items as plain <li>
+    rows, the rest as collapsed pages the browser inflates when opened.
+    """
+    it = iter(items)
+    for text in itertools.islice(it, _HTML_INLINE_ITEMS):
+        yield f"<li class='{cls}'>{html.escape(text, quote=True)}</li>"
+    yield "</ul>"
+    first = _HTML_INLINE_ITEMS + 1
+    while True:
+        page = list(itertools.islice(it, _HTML_PAGE_ITEMS))
+        if not page:
+            break
+        last = first + len(page) - 1
+        yield _html_lazy_page("list", cls, t("report_more_items", first=first, last=last), page)
+        first = last + 1
+
+
+def _html_lazy_lines(lines: Iterable[str], t: Callable[..., str]) -> Iterator[str]:
+    """Same for the raw log: an inline <pre> head, then collapsed pages of lines."""
+    it = iter(lines)
+    head = list(itertools.islice(it, _HTML_INLINE_LINES))
+    yield "<pre>"
+    yield html.escape("\n".join(head), quote=True)
+    yield "</pre>"
+    first = len(head) + 1
+    while True:
+        page = list(itertools.islice(it, _HTML_PAGE_LINES))
+        if not page:
+            break
+        last = first + len(page) - 1
+        yield _html_lazy_page("pre", "", t("report_lines", first=first, last=last), page)
+        first = last + 1
+
+
+def iter_html_report(a: SmapiAnalysis, lang: str, rules: Optional[RuleSet] = None) -> Iterator[str]:
+    """
+    Parts of the HTML report, produced one section at a time. Long lists
+    and the raw log are split into collapsed pages of compressed JSON, so
+    the page stays small and quick to open however big the analysis is.
+    """
+    t = functools.partial(_tr, lang)
+
+    def esc(s: str) -> str:
+        return html.escape(str(s), quote=True)
+
+    yield "<!DOCTYPE html>"
+    yield "<html><head><meta charset='utf-8'>"
+    yield f"<title>{esc(t('app_title'))}</title>"
+    yield (
+        "<style>"
+        "body{font-family:Segoe UI,system-ui,-apple-system,sans-serif;background:#121212;color:#eee;margin:0;padding:16px;}"
+        "h1,h2,h3{color:#ffd369;}"
+        "section{margin-bottom:24px;padding:16px;border-radius:8px;background:#1e1e1e;box-shadow:0 0 8px rgba(0,0,0,0.6);}"
+        "ul{margin:8px 0 0 20px;padding:0;}"
+        ".error{color:#ff6b6b;}"
+        ".warn{color:#ffb347;}"
+        ".info{color:#4da3ff;}"
+        ".muted{color:#999;}"
+        "code{background:#222;border-radius:4px;padding:2px 4px;}"
+        "table{border-collapse:collapse;margin-top:8px;}"
+        "td,th{padding:2px 12px 2px 0;text-align:left;}"
+        ".timeline{position:relative;height:22px;margin:4px 0;background:#2a2a2a;border-radius:4px;overflow:hidden;}"
+        ".span{position:absolute;top:0;height:22px;line-height:22px;font-size:11px;color:#111;"
+        "white-space:nowrap;overflow:hidden;text-overflow:ellipsis;border-right:1px solid #121212;}"
+        "details.lazy{margin:4px 0;}"
+        "details.lazy summary{cursor:pointer;color:#4da3ff;}"
+        "</style>"
+    )
+    yield _HTML_LAZY_SCRIPT
+    yield f"</head><body data-lazy-fail='{esc(t('report_lazy_unsupported'))}'>"
+
+    # Overview
+    yield "<section>"
+    yield f"<h1>{esc(t('overview_title'))}</h1>"
+    yield "<p>"
+    yield f"{esc(t('overview_game_version'))}: <strong>{esc(a.game_version or t('overview_unknown'))}</strong><br>"
+    yield f"{esc(t('overview_smapi_version'))}: <strong>{esc(a.smapi_version or t('overview_unknown'))}</strong><br>"
+    yield f"{esc(t('overview_mod_count', count=a.mod_count))}<br>"
+    yield f"{esc(t('overview_content_pack_count', count=a.content_pack_count))}<br>"
+    if a.slow_start_seconds is not None:
+        yield f"{esc(t('overview_slow_start', seconds=a.slow_start_seconds))}<br>"
+    yield "</p>"
+    yield f"<p class='muted'>{esc(t('overview_hint'))}</p>"
+    yield "</section>"
+
+    # Startup profile
+    ranking = startup_ranking(a)
+    if ranking:
+        yield "<section>"
+        yield f"<h2>{esc(t('startup_header', seconds=a.startup_seconds))}</h2>"
+        yield "<table>"
+        for e in ranking:
+            yield f"<tr><td>{esc(e.name)}</td><td>{e.seconds:.0f}s</td></tr>"
+        yield "</table>"
+        yield f"<h3>{esc(t('startup_timeline_header'))}</h3>"
+        yield _html_timeline(a.startup_phases, a.startup_seconds)
+        yield _html_timeline(a.startup_timeline, a.startup_seconds)
+        edits = asset_edit_ranking(a)
+        if edits:
+            yield f"<h3>{esc(t('startup_edits_header'))}</h3><table>"
+            for e in edits:
+                yield (
+                    f"<tr><td>{esc(e.name)}</td><td>{e.seconds:.0f}s</td>"
+                    f"<td class='muted'>{e.count}</td></tr>"
+                )
+            yield "</table>"
+        yield "</section>"
+
+    # Errors
+    yield "<section>"
+    yield f"<h2>{esc(t('errors_header'))}</h2>"
+    if not a.errors and not a.skipped_mods and not a.failed_mods:
+        yield f"<p class='info'>{esc(t('errors_none'))}</p>"
+    else:
+        yield "<ul>"
+        for sm in a.skipped_mods:
+            yield (
+                f"<li class='error'>[Skipped] {esc(sm.name)} — {esc(sm.reason)}</li>"
+            )
+        for fm in a.failed_mods:
+            yield (
+                f"<li class='error'>[Failed] {esc(fm.name)} — {esc(fm.reason)}</li>"
+            )
+        yield from _html_lazy_items((group_text(g, t) for g in a.error_groups), "error", t)
+    yield "</section>"
+
+    # Warnings
+    yield "<section>"
+    yield f"<h2>{esc(t('warnings_header'))}</h2>"
+    if not a.warnings and not a.external_conflicts:
+        yield f"<p class='info'>{esc(t('warnings_none'))}</p>"
+    else:
+        yield "<ul>"
+        for x in dict.fromkeys(a.external_conflicts):
+            if "RivaTuner" in x:
+                yield f"<li class='warn'>{esc(TEXT[lang]['warn_rivatuner'])}</li>"
+            else:
+                yield f"<li class='warn'>{esc(t('warn_conflict', name=x))}</li>"
+        yield from _html_lazy_items((group_text(g, t) for g in a.warning_groups), "warn", t)
+    yield "</section>"
+
+    # Mod health
+    yield "<section>"
+    yield f"<h2>{esc(t('mod_health_title'))}</h2>"
+    any_mod_health = False
+    if a.patched_mods:
+        any_mod_health = True
+        yield f"<h3>{esc(t('mod_health_patched_header'))}</h3><ul>"
+        for m in a.patched_mods:
+            yield f"<li class='warn'>{esc(m)}</li>"
+        yield "</ul>"
+    if a.save_serializer_mods:
+        any_mod_health = True
+        yield f"<h3>{esc(t('mod_health_save_header'))}</h3><ul>"
+        for m in a.save_serializer_mods:
+            yield f"<li class='error'>{esc(m)}</li>"
+        yield "</ul>"
+    if a.direct_console_mods:
+        any_mod_health = True
+        yield f"<h3>{esc(t('mod_health_console_header'))}</h3><ul>"
+        for m in a.direct_console_mods:
+            yield f"<li class='muted'>{esc(m)}</li>"
+        yield "</ul>"
+    if a.missing_dependencies:
+        any_mod_health = True
+        yield f"<h3>{esc(t('mod_health_missing_dep_header'))}</h3><ul>"
+        for dep in a.missing_dependencies:
+            yield (
+                "<li class='error'>"
+                + esc(
+                    t(
+                        "mod_health_missing_dep_item",
+                        mod=dep.mod_name,
+                        missing=dep.missing,
+                    )
+                )
+                + "</li>"
+            )
+        yield "</ul>"
+    exception_rows = mod_exception_summary(a)
+    if exception_rows:
+        any_mod_health = True
+        yield f"<h3>{esc(t('mod_health_exceptions_header'))}</h3><ul>"
+        for mod, count, types in exception_rows:
+            item = t("mod_health_exception_item", mod=mod, count=count, types=", ".join(types))
+            yield f"<li class='error'>{esc(item)}</li>"
+        yield "</ul>"
+    if a.update_infos:
+        any_mod_health = True
+        yield f"<h3>{esc(t('mod_health_updates_header'))}</h3><ul>"
+        for u in a.update_infos:
+            yield (
+                "<li class='info'>"
+                + esc(
+                    t(
+                        "mod_health_update_item",
+                        name=u.name,
+                        current=u.current,
+                        latest=u.latest,
+                    )
+                )
+                + "</li>"
+            )
+        yield "</ul>"
+    if not any_mod_health:
+        yield f"<p class='muted'>{esc(t('mod_health_none'))}</p>"
+    yield "</section>"
+
+    # Suggestions
+    yield "<section>"
+    yield f"<h2>{esc(t('suggestions_header'))}</h2>"
+    suggestions = build_suggestions(a, lang, rules)
+    if not suggestions:
+        yield f"<p class='info'>{esc(t('suggestions_none'))}</p>"
+    else:
+        yield "<ul>"
+        for s in suggestions:
+            lower = s.lower()
+            cls = ""
+            if ("save" in lower or "存档" in s or "сейв" in lower or "salva" in lower):
+                cls = "error"
+            elif ("update" in lower or "更新" in s or "обнов" in lower or "atualiz" in lower):
+                cls = "info"
+            elif "RivaTuner" in s:
+                cls = "warn"
+            yield f"<li class='{cls}'>{esc(s)}</li>"
+        yield "</ul>"
+    yield "</section>"
+
+    # Raw log
+    yield "<section>"
+    yield f"<h2>{esc(t('raw_header'))}</h2>"
+    yield from _html_lazy_lines(iter_raw_log_lines(a), t)
+    yield "</section>"
+
+    yield "</body></html>"
+
+
+def _write_parts(parts: Iterable[str], out: TextIO) -> None:
+    write = out.write
+    for i, part in enumerate(parts):
+        if i:
+            write("\n")
+        write(part)
+
+
+def write_plain_report(analysis: SmapiAnalysis, out: TextIO, lang: str, rules: Optional[RuleSet] = None) -> None:
+    _write_parts(iter_plain_report(analysis, lang, rules), out)
+
+
+def write_html_report(analysis: SmapiAnalysis, out: TextIO, lang: str, rules: Optional[RuleSet] = None) -> None:
+    _write_parts(iter_html_report(analysis, lang, rules), out)
+
+
+# =========================
+# Log diff
+# =========================
+
+@dataclass
+class VersionChange:
+    name: str
+    before: Optional[str]
+    after: Optional[str]
+
+
+@dataclass
+class TimingChange:
+    name: str
+    before: float
+    after: float
+
+
+@dataclass
+class LogDiff:
+    """What changed from an older analysis to a newer one (see diff_analyses)."""
+    mods_added: List[str] = field(default_factory=list)
+    mods_removed: List[str] = field(default_factory=list)
+    version_changes: List[VersionChange] = field(default_factory=list)
+    # failed or skipped in the newer log only, and the other way round
+    mods_failing: List[SkippedMod] = field(default_factory=list)
+    mods_recovered: List[str] = field(default_factory=list)
+    new_errors: List[MessageGroup] = field(default_factory=list)
+    resolved_errors: List[MessageGroup] = field(default_factory=list)
+    new_warnings: List[MessageGroup] = field(default_factory=list)
+    startup_before: float = 0.0
+    startup_after: float = 0.0
+    timing_changes: List[TimingChange] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.mods_added or self.mods_removed or self.version_changes or self.mods_failing
+            or self.mods_recovered or self.new_errors or self.resolved_errors or self.new_warnings
+            or self.timing_changes or self.startup_before != self.startup_after
+        )
+
+
+# per-mod startup changes smaller than this are noise at 1s log resolution
+_DIFF_MIN_TIMING_CHANGE = 2.0
+
+
+def _mod_versions(analysis: SmapiAnalysis) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Installed mods and content packs by lowercased name -> (name, version)."""
+    mods: Dict[str, Tuple[str, Optional[str]]] = {}
+    # failed/skipped mods are installed too, just not loaded
+    for sm in (*analysis.failed_mods, *analysis.skipped_mods):
+        mods[sm.name.lower()] = (sm.name, None)
+    # the update check reports the running version of outdated mods
+    for u in analysis.update_infos:
+        mods[u.name.lower()] = (u.name, u.current)
+    for mod in (*analysis.loaded_mods, *analysis.loaded_content_packs):
+        mods[mod.name.lower()] = (mod.name, mod.version)
+    return mods
+
+
+def diff_analyses(old: SmapiAnalysis, new: SmapiAnalysis, top: Optional[int] = 10) -> LogDiff:
+    """
+    Compare two analyses. Everything is matched through dicts keyed by mod
+    name or message fingerprint, so the cost is linear in their size and the
+    logs themselves are never re-read.
+    """
+    diff = LogDiff(startup_before=old.startup_seconds, startup_after=new.startup_seconds)
+
+    before, after = _mod_versions(old), _mod_versions(new)
+    diff.mods_added = [after[k][0] for k in after.keys() - before.keys()]
+    diff.mods_removed = [before[k][0] for k in before.keys() - after.keys()]
+    diff.mods_added.sort(key=str.lower)
+    diff.mods_removed.sort(key=str.lower)
+    for key, (name, version) in after.items():
+        old_version = before.get(key, (None, None))[1]
+        if key in before and version and old_version and version != old_version:
+            diff.version_changes.append(VersionChange(name, old_version, version))
+    diff.version_changes.sort(key=lambda c: c.name.lower())
+
+    old_failing = {sm.name.lower() for sm in (*old.failed_mods, *old.skipped_mods)}
+    new_failing: Dict[str, SkippedMod] = {}
+    for sm in (*new.failed_mods, *new.skipped_mods):
+        new_failing.setdefault(sm.name.lower(), sm)
+    diff.mods_failing = [sm for key, sm in new_failing.items() if key not in old_failing]
+    recovered = {sm.name.lower(): sm.name for sm in (*old.failed_mods, *old.skipped_mods)}
+    diff.mods_recovered = [name for key, name in recovered.items() if key not in new_failing]
+
+    old_errors = {g.fingerprint for g in old.error_groups}
+    new_errors = {g.fingerprint for g in new.error_groups}
+    old_warnings = {g.fingerprint for g in old.warning_groups}
+    diff.new_errors = [g for g in new.error_groups if g.fingerprint not in old_errors]
+    diff.resolved_errors = [g for g in old.error_groups if g.fingerprint not in new_errors]
+    diff.new_warnings = [g for g in new.warning_groups if g.fingerprint not in old_warnings]
+
+    old_timings = {e.name: e.seconds for e in old.mod_timings}
+    new_timings = {e.name: e.seconds for e in new.mod_timings}
+    changes = [
+        TimingChange(name, old_timings.get(name, 0.0), new_timings.get(name, 0.0))
+        for name in dict.fromkeys((*old_timings, *new_timings))
+    ]
+    changes = [c for c in changes if abs(c.after - c.before) >= _DIFF_MIN_TIMING_CHANGE]
+    changes.sort(key=lambda c: abs(c.after - c.before), reverse=True)
+    diff.timing_changes = changes[:top] if top is not None else changes
+    return diff
+
+
+def iter_diff_lines(diff: LogDiff, lang: str, old_name: str, new_name: str) -> Iterator[str]:
+    t = functools.partial(_tr, lang)
+    yield t("diff_header", old=old_name, new=new_name)
+    yield "=" * 60
+    if diff.empty:
+        yield t("diff_none")
+        return
+
+    def block(key: str, items: Sequence[Any], text: Callable[[Any], str]) -> Iterator[str]:
+        if items:
+            yield t(key, count=len(items))
+            for item in items:
+                yield "  - " + text(item)
+            yield ""
+
+    yield from block("diff_mods_added", diff.mods_added, str)
+    yield from block("diff_mods_removed", diff.mods_removed, str)
+    yield from block(
+        "diff_versions",
+        diff.version_changes,
+        lambda c: t("diff_version_item", name=c.name, before=c.before, after=c.after),
+    )
+    yield from block("diff_failing", diff.mods_failing, lambda sm: f"{sm.name} — {sm.reason}")
+    yield from block("diff_recovered", diff.mods_recovered, str)
+    yield from block("diff_new_errors", diff.new_errors, lambda g: group_text(g, t))
+    yield from block("diff_resolved_errors", diff.resolved_errors, lambda g: g.sample)
+    yield from block("diff_new_warnings", diff.new_warnings, lambda g: group_text(g, t))
+    if diff.startup_before or diff.startup_after:
+        yield t(
+            "diff_startup",
+            before=diff.startup_before,
+            after=diff.startup_after,
+            delta=diff.startup_after - diff.startup_before,
+        )
+        for c in diff.timing_changes:
+            yield "  - " + t("diff_timing_item", name=c.name, before=c.before, after=c.after, delta=c.after - c.before)
+        yield ""
+
+
 # =========================
 # Config helpers (remember last dir)
 # =========================
 
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), "smapi_log_doctor_config.json")
+# user rule packs (*.json), see BUILTIN_RULE_PACK
+RULES_DIR = os.path.join(os.path.dirname(CONFIG_PATH), "smapi_log_doctor_rules")
 
 
 @dataclass
@@ -1198,6 +3478,724 @@ def guess_smapi_log_dir() -> Optional[str]:
     return None
 
 
+SMAPI_LATEST_LOG = "SMAPI-latest.txt"
+# new lines show up within this long of being written
+_TAIL_POLL_MS = 50
+_WORKER_POLL_MS = 50
+
+
+def find_smapi_latest_log(extra_dirs: Iterable[Optional[str]] = ()) -> Optional[str]:
+    # SMAPI-latest.txt lives in ErrorLogs; also accept its parent folder
+    for d in (*extra_dirs, guess_smapi_log_dir()):
+        if not d:
+            continue
+        for candidate in (
+            os.path.join(d, SMAPI_LATEST_LOG),
+            os.path.join(d, "ErrorLogs", SMAPI_LATEST_LOG),
+        ):
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+# =========================
+# Serialization & analysis cache
+# =========================
+
+def analysis_to_dict(analysis: SmapiAnalysis) -> Dict[str, Any]:
+    """
+    JSON-ready form of an analysis. The raw log and line index are left out;
+    mod_exceptions maps each mod to indexes into "exceptions".
+    """
+    # a shallow walk instead of asdict(): records hold only JSON values, and
+    # this runs for every analyzed log (asdict deep-copies everything)
+    data = {f.name: getattr(analysis, f.name) for f in fields(SmapiAnalysis)}
+    del data["raw_log"]
+    del data["line_index"]
+    for name in _NESTED_FIELDS:
+        data[name] = [dict(vars(item)) for item in data[name]]
+    for name, value in data.items():
+        if isinstance(value, (list, StringColumn)) and name not in _NESTED_FIELDS:
+            data[name] = list(value)
+    position = {id(record): i for i, record in enumerate(analysis.exceptions)}
+    data["mod_exceptions"] = {
+        mod: [position[id(record)] for record in records]
+        for mod, records in analysis.mod_exceptions.items()
+    }
+    return data
+
+
+# column fields, rebuilt from lists by analysis_from_dict
+_COLUMN_FIELDS = {
+    "errors": StringColumn,
+    "warnings": StringColumn,
+    "error_events": EventColumn,
+    "warning_events": EventColumn,
+}
+
+# list fields holding dataclasses, rebuilt by analysis_from_dict
+_NESTED_FIELDS = {
+    "skipped_mods": SkippedMod,
+    "failed_mods": SkippedMod,
+    "missing_dependencies": MissingDependency,
+    "loaded_mods": ModInfo,
+    "loaded_content_packs": ModInfo,
+    "update_infos": UpdateInfo,
+    "error_events": LogEvent,
+    "warning_events": LogEvent,
+    "error_groups": MessageGroup,
+    "warning_groups": MessageGroup,
+    "exceptions": ExceptionRecord,
+    "startup_phases": TimingSpan,
+    "startup_timeline": TimingSpan,
+    "mod_timings": TimingEntry,
+    "asset_edit_timings": TimingEntry,
+    "rule_hits": RuleHit,
+}
+
+
+def analysis_from_dict(data: Dict[str, Any]) -> SmapiAnalysis:
+    """Inverse of analysis_to_dict."""
+    kwargs = dict(data)
+    for name, cls in _NESTED_FIELDS.items():
+        kwargs[name] = [cls(**item) for item in kwargs.get(name, ())]
+    for name, column in _COLUMN_FIELDS.items():
+        kwargs[name] = column(kwargs.get(name, ()))
+    exceptions = kwargs["exceptions"]
+    kwargs["mod_exceptions"] = {
+        mod: [exceptions[i] for i in indexes] for mod, indexes in kwargs.get("mod_exceptions", {}).items()
+    }
+    return SmapiAnalysis(**kwargs)
+
+
+CACHE_DIR = os.path.join(os.path.dirname(CONFIG_PATH), ".smapi_log_doctor_cache")
+_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Bump when the parser's output changes without a field change
+_CACHE_VERSION = 2
+_CACHE_FORMAT = f"{_CACHE_VERSION}:" + ",".join(f.name for f in fields(SmapiAnalysis))
+# bytes hashed from each end of the file for the cache key
+_CACHE_SAMPLE = 64 * 1024
+
+
+def log_cache_key(path: str, rules: Optional[RuleSet] = None) -> str:
+    """
+    Cache key from size, mtime and a hash of the first and last 64 KB. Cheap
+    enough to compute on every open, and any rewrite of the log changes it.
+    The rule set is part of the key, since rules change the analysis.
+    """
+    archive, member = split_archive_member(path)
+    st = os.stat(archive)
+    digest = (rules if rules is not None else builtin_rule_set()).digest
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{_CACHE_FORMAT}|{digest}|{st.st_size}|{st.st_mtime_ns}|{member}".encode())
+    if member is not None:
+        # zip members are identified by their CRC, no need to read them
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                info = zf.getinfo(member)
+        except (KeyError, zipfile.BadZipFile) as e:
+            raise OSError(str(e)) from None
+        h.update(f"{info.CRC}|{info.file_size}".encode())
+        return h.hexdigest()
+    with open(path, "rb") as f:
+        h.update(f.read(_CACHE_SAMPLE))
+        if st.st_size > 2 * _CACHE_SAMPLE:
+            f.seek(st.st_size - _CACHE_SAMPLE)
+            h.update(f.read(_CACHE_SAMPLE))
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    On-disk cache of serialized analyses: <key>.json holds the analysis and
+    <key>.idx its LogLineIndex, so a cached log opens without being read.
+    Entries are touched on every hit; evict() drops the least recently used
+    ones until the cache fits in max_bytes. Cache failures are never fatal,
+    they only turn into misses.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = _CACHE_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, key + ext)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Serialized analysis for key, or None."""
+        path = self._entry(key, ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("format") != _CACHE_FORMAT:
+            return None
+        return entry.get("analysis")
+
+    def store(self, key: str, data: Dict[str, Any], line_index: Optional[LogLineIndex] = None) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if line_index is not None:
+                self._write(key, ".idx", line_index.to_bytes())
+            entry = json.dumps({"format": _CACHE_FORMAT, "analysis": data}, ensure_ascii=False)
+            # .json last: it is what marks the entry complete
+            self._write(key, ".json", entry.encode("utf-8"))
+        except OSError:
+            pass
+
+    def _write(self, key: str, ext: str, payload: bytes) -> None:
+        # write-then-rename, so concurrent batch workers never see half an entry
+        path = self._entry(key, ext)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    def get(
+        self, path: str, key: Optional[str] = None, rules: Optional[RuleSet] = None, need_lines: bool = True
+    ) -> Optional[SmapiAnalysis]:
+        """
+        Cached analysis of path, or None. With need_lines an entry whose
+        .idx is missing or unreadable is a miss: its Raw Log would be empty.
+        """
+        try:
+            key = key or log_cache_key(path, rules)
+        except OSError:
+            return None
+        data = self.load(key)
+        if data is None:
+            return None
+        try:
+            analysis = analysis_from_dict(data)
+        except (TypeError, ValueError, IndexError):
+            return None
+        analysis.log_path = path
+        try:
+            with open(self._entry(key, ".idx"), "rb") as f:
+                analysis.line_index = LogLineIndex.from_bytes(path, f.read())
+        except (OSError, ValueError):
+            if need_lines:
+                return None
+        return analysis
+
+    def put(
+        self, path: str, analysis: SmapiAnalysis, key: Optional[str] = None, rules: Optional[RuleSet] = None
+    ) -> None:
+        """
+        Store an analysis of path. key is the one computed before analyzing;
+        if the log changed meanwhile (e.g. SMAPI still writing it) the
+        result is not cached.
+        """
+        try:
+            if key is not None and log_cache_key(path, rules) != key:
+                return
+            key = key or log_cache_key(path, rules)
+        except OSError:
+            return
+        self.store(key, analysis_to_dict(analysis), analysis.line_index)
+
+    def evict(self) -> int:
+        """Remove least recently used entries beyond max_bytes; returns how many."""
+        entries: Dict[str, List[Any]] = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    key, ext = os.path.splitext(e.name)
+                    if ext not in (".json", ".idx"):
+                        continue
+                    st = e.stat()
+                    entry = entries.setdefault(key, [0.0, 0])
+                    if ext == ".json":
+                        entry[0] = st.st_mtime
+                    entry[1] += st.st_size
+        except OSError:
+            return 0
+        total = sum(size for _mtime, size in entries.values())
+        removed = 0
+        for key, (_mtime, size) in sorted(entries.items(), key=lambda kv: kv[1][0]):
+            if total <= self.max_bytes:
+                break
+            for ext in (".json", ".idx"):
+                try:
+                    os.remove(self._entry(key, ext))
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+
+# =========================
+# Structured export (JSON / NDJSON)
+# =========================
+
+# Exports carry their schema name and version. Within a version keys are
+# only ever added; renaming, removing or changing the meaning of one bumps it.
+ANALYSIS_SCHEMA = "smapi-log-doctor/analysis"
+EVENT_SCHEMA = "smapi-log-doctor/event"
+SCHEMA_VERSION = 1
+# serialized fields that live elsewhere in the export (log info, NDJSON events)
+_DOCUMENT_EXCLUDED = frozenset(("log_path", "log_size", "error_events", "warning_events"))
+_compact_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def analysis_document(data: Dict[str, Any], path: Optional[str] = None) -> Dict[str, Any]:
+    """Versioned export document for a serialized analysis (see analysis_to_dict)."""
+    path = path or data.get("log_path")
+    return {
+        "schema": ANALYSIS_SCHEMA,
+        "schema_version": SCHEMA_VERSION,
+        "log": {"path": path, "name": log_display_name(path) if path else None, "size": data["log_size"]},
+        "analysis": {k: v for k, v in data.items() if k not in _DOCUMENT_EXCLUDED},
+    }
+
+
+def iter_events(data: Dict[str, Any], path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Error and warning events of a serialized analysis, in log order. A line
+    that is both (e.g. "WARN" in an error message) is one "error" event.
+    Errors carry the exception type and the mod blamed for it.
+    """
+    path = path or data.get("log_path")
+    name = log_display_name(path) if path else None
+    exceptions = {record["line"]: record for record in data["exceptions"]}
+    streams = (
+        zip(data["error_events"], data["errors"], itertools.repeat("error")),
+        zip(data["warning_events"], data["warnings"], itertools.repeat("warning")),
+    )
+    last_line = -1
+    # both lists are in line order, so a merge keeps this a single pass
+    for event, message, kind in heapq.merge(*streams, key=lambda item: item[0]["line"]):
+        line = event["line"]
+        if line == last_line:
+            continue
+        last_line = line
+        record = exceptions.get(line) if kind == "error" else None
+        source = event["source"]
+        # the mod blamed for an exception, else the source; SMAPI and the
+        # game are never a mod
+        mod = record["mod"] if record is not None else source
+        if not mod or mod in _NON_MOD_SOURCES:
+            mod = None
+        yield {
+            "schema": EVENT_SCHEMA,
+            "schema_version": SCHEMA_VERSION,
+            "log": name,
+            "line": line,
+            "time": event["time"],
+            "kind": kind,
+            "level": event["level"],
+            "source": source,
+            "mod": mod,
+            "exception_type": record["exception_type"] if record is not None else None,
+            "message": message,
+        }
+
+
+def write_analysis_json(data: Dict[str, Any], out: TextIO, path: Optional[str] = None) -> None:
+    json.dump(analysis_document(data, path), out, ensure_ascii=False)
+
+
+def write_events_ndjson(data: Dict[str, Any], out: TextIO, path: Optional[str] = None) -> int:
+    """One JSON object per line; returns the number of events."""
+    count = 0
+    write = out.write
+    for event in iter_events(data, path):
+        write(_compact_json(event))
+        write("\n")
+        count += 1
+    return count
+
+
+# column classes are exported as plain lists of these items
+_COLUMN_ITEM_TYPES = {StringColumn: str, EventColumn: LogEvent}
+_JSON_PRIMITIVES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+def _json_schema_type(tp: Any) -> Dict[str, Any]:
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+    if origin is typing.Union:
+        inner = [a for a in args if a is not type(None)]
+        return {"anyOf": [_json_schema_type(inner[0]), {"type": "null"}]}
+    if origin in (list, tuple):
+        return {"type": "array", "items": _json_schema_type(args[0])}
+    if origin is dict:
+        return {"type": "object", "additionalProperties": _json_schema_type(args[1])}
+    if isinstance(tp, type) and hasattr(tp, "__dataclass_fields__"):
+        return {"$ref": f"#/$defs/{tp.__name__}"}
+    if tp in _COLUMN_ITEM_TYPES:
+        return {"type": "array", "items": _json_schema_type(_COLUMN_ITEM_TYPES[tp])}
+    if tp in _JSON_PRIMITIVES:
+        return {"type": _JSON_PRIMITIVES[tp]}
+    # a new field type needs a mapping here, or the schema would lie about it
+    raise TypeError(f"no JSON Schema mapping for {tp!r}")
+
+
+def _json_schema_object(cls: type, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    hints = typing.get_type_hints(cls)
+    props = {f.name: _json_schema_type(hints[f.name]) for f in fields(cls) if f.name not in exclude}
+    return {"type": "object", "properties": props, "required": list(props)}
+
+
+def analysis_json_schema() -> Dict[str, Any]:
+    """JSON Schema of the analysis export document, derived from the dataclasses."""
+    analysis = _json_schema_object(SmapiAnalysis, _DOCUMENT_EXCLUDED | {"raw_log", "line_index"})
+    # serialized as indexes into "exceptions"
+    analysis["properties"]["mod_exceptions"] = {
+        "type": "object",
+        "additionalProperties": {"type": "array", "items": {"type": "integer"}},
+    }
+    return {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$id": f"{ANALYSIS_SCHEMA}/v{SCHEMA_VERSION}",
+        "type": "object",
+        "properties": {
+            "schema": {"const": ANALYSIS_SCHEMA},
+            "schema_version": {"const": SCHEMA_VERSION},
+            "log": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": ["string", "null"]},
+                    "name": {"type": ["string", "null"]},
+                    "size": {"type": "integer"},
+                },
+            },
+            "analysis": analysis,
+        },
+        "required": ["schema", "schema_version", "log", "analysis"],
+        "$defs": {
+            cls.__name__: _json_schema_object(cls) for cls in dict.fromkeys(_NESTED_FIELDS.values())
+        },
+    }
+
+
+# =========================
+# Live tail (SMAPI-latest.txt)
+# =========================
+
+class SmapiLogTailer:
+    """
+    Follows a log that is still being written. Each poll() reads only the
+    bytes appended since the last call and feeds them to an incremental
+    SmapiLogParser, so the analysis stays current without re-parsing. A
+    bounded ring keeps the most recent lines for display.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_recent_lines: int = 5000,
+        max_read_bytes: int = 4 * _CHUNK_SIZE,
+        rules: Optional[RuleSet] = None,
+    ) -> None:
+        self.path = path
+        self.max_read_bytes = max_read_bytes
+        self.rules = rules
+        self.recent_lines: Deque[str] = deque(maxlen=max_recent_lines)
+        self.new_lines: List[str] = []
+        self.parser = SmapiLogParser(rules=rules)
+        self.offset = 0
+        self._identity: Optional[Tuple[int, int]] = None
+        self._reset()
+
+    @property
+    def analysis(self) -> SmapiAnalysis:
+        return self.parser.analysis
+
+    def _reset(self) -> None:
+        self.parser = SmapiLogParser(rules=self.rules)
+        self.parser.analysis.log_path = self.path
+        self.offset = 0
+        self.recent_lines.clear()
+
+    def poll(self) -> bool:
+        """
+        Read newly appended data. Returns True if the analysis changed,
+        including when the file was restarted (the game rewrites
+        SMAPI-latest.txt on every launch) and parsing started over.
+        """
+        self.new_lines = []
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+
+        restarted = False
+        identity = (st.st_dev, st.st_ino)
+        if (self._identity is not None and identity != self._identity) or st.st_size < self.offset:
+            self._reset()
+            restarted = True
+        self._identity = identity
+
+        if st.st_size == self.offset:
+            return restarted
+
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(min(st.st_size - self.offset, self.max_read_bytes))
+        except OSError:
+            return restarted
+
+        self.offset += len(data)
+        lines = self.parser.feed_bytes(data)
+        self.parser.analysis.log_size = self.parser.bytes_consumed
+        self.recent_lines.extend(lines)
+        self.new_lines = lines
+        return bool(lines) or restarted
+
+    @property
+    def caught_up(self) -> bool:
+        try:
+            return os.path.getsize(self.path) <= self.offset
+        except OSError:
+            return True
+
+
+def tail_view_state(analysis: SmapiAnalysis, rules: Optional[RuleSet] = None) -> Dict[str, Tuple]:
+    """
+    Cheap fingerprint of what each summary tab shows. The live tail
+    redraws only the tabs whose fingerprint changed since the last poll.
+    Only the last exception can still be growing (its stack trace), so
+    earlier ones are counted, not compared.
+    """
+    a = analysis
+    rules = rules if rules is not None else builtin_rule_set()
+    last = a.exceptions[-1] if a.exceptions else None
+    exceptions = (len(a.exceptions), last.exception_type, last.mod) if last is not None else (0,)
+    check_values = tuple(
+        len(value) if isinstance(value, (list, dict)) else value
+        for value in (getattr(a, check.field) for check in rules.checks)
+    )
+    return {
+        "overview": (
+            a.game_version, a.smapi_version, a.mod_count, a.content_pack_count,
+            len(a.errors), len(a.warnings), len(a.error_groups), len(a.warning_groups),
+            a.slow_start_seconds, a.startup_seconds, len(a.mod_timings),
+            sum(e.count for e in a.asset_edit_timings),
+        ),
+        "mod_health": (
+            len(a.patched_mods), len(a.save_serializer_mods), len(a.direct_console_mods),
+            len(a.missing_dependencies), len(a.update_infos), exceptions,
+        ),
+        "errors": (len(a.errors), len(a.skipped_mods), len(a.failed_mods)),
+        "warnings": (len(a.warnings), len(a.external_conflicts)),
+        "suggestions": (
+            len(a.skipped_mods), len(a.failed_mods), len(a.missing_dependencies),
+            len(a.save_serializer_mods), len(a.update_infos),
+            tuple(hit.count for hit in a.rule_hits), check_values, a.startup_seconds,
+        ),
+    }
+
+
+# =========================
+# Virtualized text view
+# =========================
+
+Row = Tuple[str, Tuple[str, ...]]
+
+
+def _as_row(row: Row) -> Row:
+    return row
+
+
+class RowSource:
+    """
+    Rows (text, tags) for a VirtualTextView, concatenated from segments.
+    A segment is (sequence, to_row); sequences are read lazily by slice
+    and may keep growing (e.g. the live-tail analysis lists).
+    """
+
+    def __init__(self, *segments: Tuple[Sequence, Callable[[object], Row]]) -> None:
+        self.segments = segments
+
+    def __len__(self) -> int:
+        return sum(len(seq) for seq, _to_row in self.segments)
+
+    def rows(self, start: int, count: int) -> List[Row]:
+        out: List[Row] = []
+        for seq, to_row in self.segments:
+            if len(out) >= count:
+                break
+            n = len(seq)
+            if start >= n:
+                start -= n
+                continue
+            out.extend(map(to_row, seq[start:start + count - len(out)]))
+            start = 0
+        return out
+
+    def item(self, row: int) -> object:
+        """The underlying item shown as a row, or None past the end."""
+        for seq, _to_row in self.segments:
+            n = len(seq)
+            if row < n:
+                return seq[row]
+            row -= n
+        return None
+
+
+class VirtualTextView(ttk.Frame):
+    """
+    Read-only text view that only materializes the rows on screen. Scrolling
+    asks the RowSource for the visible window, so drawing cost depends on
+    the window height and not on how many rows (log lines) exist.
+    """
+
+    def __init__(
+        self,
+        master,
+        wrap: str = "word",
+        show_jump: bool = False,
+        resolve_jump: Optional[Callable[[str], Optional[int]]] = None,
+        on_activate: Optional[Callable[[object], None]] = None,
+    ) -> None:
+        super().__init__(master)
+        self.source = RowSource()
+        self.first = 0
+        # row index of log line 1 (rows above it are headers)
+        self.line_base = 0
+        self.highlight_row: Optional[int] = None
+        # jump box text -> 1-based line number (default: the text is one)
+        self.resolve_jump = resolve_jump
+        # called with the item under a double-clicked row
+        self.on_activate = on_activate
+
+        self.jump_label: Optional[ttk.Label] = None
+        self.jump_button: Optional[ttk.Button] = None
+        if show_jump:
+            bar = ttk.Frame(self)
+            bar.pack(side="top", fill="x")
+            self.jump_label = ttk.Label(bar)
+            self.jump_label.pack(side="left", padx=(0, 4))
+            self.jump_var = tk.StringVar()
+            jump_entry = ttk.Entry(bar, textvariable=self.jump_var, width=12)
+            jump_entry.pack(side="left")
+            jump_entry.bind("<Return>", self._on_jump)
+            self.jump_button = ttk.Button(bar, command=self._on_jump)
+            self.jump_button.pack(side="left", padx=(4, 0))
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        if wrap == "none":
+            xscroll = ttk.Scrollbar(self, orient="horizontal")
+            xscroll.pack(side="bottom", fill="x")
+
+        self.text = tk.Text(self, wrap=wrap, font=("Consolas", 10), undo=False)
+        self.text.pack(side="left", fill="both", expand=True)
+        if wrap == "none":
+            self.text.config(xscrollcommand=xscroll.set)
+            xscroll.config(command=self.text.xview)
+        self.text.tag_configure("jump", background="#fff3a0")
+        self.text.config(state="disabled")
+        self._linespace = max(1, tkfont.Font(font=self.text.cget("font")).metrics("linespace"))
+
+        self.text.bind("<Configure>", lambda e: self.redraw())
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.text.bind("<Button-5>", lambda e: self.scroll(3))
+        self.text.bind("<Prior>", lambda e: self.scroll(-self.visible_rows()))
+        self.text.bind("<Next>", lambda e: self.scroll(self.visible_rows()))
+        self.text.bind("<Up>", lambda e: self.scroll(-1))
+        self.text.bind("<Down>", lambda e: self.scroll(1))
+        self.text.bind("<Control-Home>", lambda e: self.scroll_to(0))
+        self.text.bind("<Control-End>", lambda e: self.scroll_to(len(self.source)))
+        if on_activate is not None:
+            self.text.bind("<Double-Button-1>", self._on_double_click)
+
+    def set_labels(self, jump_label: str, jump_button: str) -> None:
+        if self.jump_label is not None:
+            self.jump_label.config(text=jump_label)
+            self.jump_button.config(text=jump_button)
+
+    def visible_rows(self) -> int:
+        return max(1, self.text.winfo_height() // self._linespace)
+
+    def set_source(self, source: RowSource, keep_position: bool = False, line_base: int = 0) -> None:
+        """
+        Show a new set of rows. With keep_position the scroll offset is
+        kept, and a view that was showing the last row stays pinned to the
+        end as rows are added (live tail).
+        """
+        at_end = self.first + self.visible_rows() >= len(self.source)
+        self.source = source
+        self.line_base = line_base
+        if not keep_position:
+            self.first = 0
+            self.highlight_row = None
+        elif at_end:
+            self.first = len(source)
+        self.redraw()
+
+    def redraw(self) -> None:
+        total = len(self.source)
+        visible = self.visible_rows()
+        self.first = max(0, min(self.first, total - visible))
+        rows = self.source.rows(self.first, visible + 1)
+
+        text = self.text
+        text.config(state="normal")
+        text.delete("1.0", tk.END)
+        for row_text, tags in rows:
+            text.insert(tk.END, row_text + "\n", tags)
+        if self.highlight_row is not None and 0 <= self.highlight_row - self.first < len(rows):
+            line = self.highlight_row - self.first + 1
+            text.tag_add("jump", f"{line}.0", f"{line + 1}.0")
+        text.config(state="disabled")
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, delta: int) -> str:
+        self.first += delta
+        self.redraw()
+        return "break"
+
+    def scroll_to(self, row: int, highlight: bool = False) -> str:
+        self.highlight_row = row if highlight else None
+        # leave a few rows of context above the target
+        self.first = row - 3 if highlight else row
+        self.redraw()
+        return "break"
+
+    def jump_to_line(self, line_no: int) -> None:
+        """Scroll to 1-based log line line_no and highlight it."""
+        self.scroll_to(self.line_base + line_no - 1, highlight=True)
+
+    def _on_jump(self, event=None) -> None:
+        text = self.jump_var.get().strip()
+        if self.resolve_jump is not None:
+            line_no = self.resolve_jump(text)
+        else:
+            line_no = int(text) if text.isdigit() else None
+        if line_no is not None:
+            self.jump_to_line(line_no)
+
+    def _on_double_click(self, event) -> str:
+        text_line = int(self.text.index(f"@{event.x},{event.y}").split(".")[0])
+        item = self.source.item(self.first + text_line - 1)
+        if item is not None:
+            self.on_activate(item)
+        return "break"
+
+    def _on_wheel(self, event) -> str:
+        # Windows/macOS report multiples of 120 per notch
+        return self.scroll(-3 * (event.delta // 120 or (1 if event.delta > 0 else -1)))
+
+    def _on_scrollbar(self, *args) -> None:
+        total = len(self.source)
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = self.visible_rows() if args[2] == "pages" else 1
+            self.first += int(args[1]) * step
+        self.redraw()
+
+
 # =========================
 # Tkinter UI app
 # =========================
@@ -1209,7 +4207,29 @@ class SmapiLogDoctorApp:
         self.analysis: Optional[SmapiAnalysis] = None
         self.current_path: Optional[str] = None
 
+        # Background analysis state
+        self._worker: Optional[threading.Thread] = None
+        self._worker_queue: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._analysis_path: Optional[str] = None
+        self._analysis_on_done: Optional[Callable[[str, SmapiAnalysis], None]] = None
+        self._analysis_profile: Optional[ParserProfile] = None
+        self._analysis_total = 0
+        self._analysis_done = 0
+
+        # Live tail state
+        self.tailer: Optional[SmapiLogTailer] = None
+        self._tail_job: Optional[str] = None
+        # tail_view_state() of what the tabs show now
+        self._tail_state: Dict[str, Tuple] = {}
+
         self.config = load_config()
+        self.cache = AnalysisCache()
+        try:
+            self.rules = load_rule_set(include_user_packs=True)
+        except ValueError as e:
+            messagebox.showwarning("Rule packs", f"Ignoring user rule packs:\n{e}")
+            self.rules = builtin_rule_set()
 
         self.root.title(TEXT[self.lang]["app_title"])
         self.root.geometry("1000x720")
@@ -1219,7 +4239,7 @@ class SmapiLogDoctorApp:
     # ---------- Translation helper ----------
 
     def _t(self, key: str, **kwargs) -> str:
-        return TEXT[self.lang][key].format(**kwargs)
+        return _tr(self.lang, key, **kwargs)
 
     # ---------- UI building ----------
 
@@ -1237,6 +4257,20 @@ class SmapiLogDoctorApp:
         self.btn_export_html = ttk.Button(toolbar, text=self._t("btn_export_html"), command=self.export_summary_html)
         self.btn_export_html.pack(side="left", padx=(4, 0))
 
+        self.btn_export_json = ttk.Button(toolbar, text=self._t("btn_export_json"), command=self.export_json)
+        self.btn_export_json.pack(side="left", padx=(4, 0))
+
+        self.btn_compare = ttk.Button(toolbar, text=self._t("btn_compare"), command=self.compare_log)
+        self.btn_compare.pack(side="left", padx=(4, 0))
+
+        self.btn_watch = ttk.Button(toolbar, text=self._t("btn_watch"), command=self.toggle_watch)
+        self.btn_watch.pack(side="left", padx=(4, 0))
+
+        # parse with per-detector timings (shown in the status bar)
+        self.profile_var = tk.BooleanVar(value=False)
+        self.chk_profile = ttk.Checkbutton(toolbar, text=self._t("chk_profile"), variable=self.profile_var)
+        self.chk_profile.pack(side="left", padx=(8, 0))
+
         # Language dropdown
         lang_frame = ttk.Frame(toolbar)
         lang_frame.pack(side="right")
@@ -1260,15 +4294,23 @@ class SmapiLogDoctorApp:
 
         self.overview_text = self._create_text_tab("tab_overview")
         self.mod_health_text = self._create_text_tab("tab_mod_health")
-        self.errors_text = self._create_text_tab("tab_errors")
-        self.warnings_text = self._create_text_tab("tab_warnings")
+        self.errors_view = self._create_virtual_tab("tab_errors", on_activate=self._show_in_raw)
+        self.warnings_view = self._create_virtual_tab("tab_warnings", on_activate=self._show_in_raw)
         self.suggestions_text = self._create_text_tab("tab_suggestions")
-        self.raw_log_text = self._create_text_tab("tab_raw")
+        self.raw_view = self._create_virtual_tab(
+            "tab_raw", wrap="none", show_jump=True, resolve_jump=self._resolve_raw_jump
+        )
 
         # Status bar
         self.status_var = tk.StringVar(value=self._t("status_ready"))
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, anchor="w")
-        status_bar.pack(side="bottom", fill="x")
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side="bottom", fill="x")
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, anchor="w")
+        status_bar.pack(side="left", fill="x", expand=True)
+
+        # Progress widgets are only packed while an analysis is running
+        self.btn_cancel = ttk.Button(status_frame, text=self._t("btn_cancel"), command=self.cancel_analysis)
+        self.progress_bar = ttk.Progressbar(status_frame, mode="determinate", length=220)
 
     def _create_text_tab(self, title_key: str) -> tk.Text:
         frame = ttk.Frame(self.notebook)
@@ -1285,6 +4327,22 @@ class SmapiLogDoctorApp:
         text.config(state="disabled")
         return text
 
+    def _create_virtual_tab(
+        self,
+        title_key: str,
+        wrap: str = "word",
+        show_jump: bool = False,
+        resolve_jump: Optional[Callable[[str], Optional[int]]] = None,
+        on_activate: Optional[Callable[[object], None]] = None,
+    ) -> VirtualTextView:
+        view = VirtualTextView(
+            self.notebook, wrap=wrap, show_jump=show_jump, resolve_jump=resolve_jump, on_activate=on_activate
+        )
+        self.notebook.add(view, text=self._t(title_key))
+        view.set_labels(self._t("jump_label"), self._t("btn_jump"))
+        self._configure_text_tags(view.text)
+        return view
+
     def _configure_text_tags(self, text: tk.Text) -> None:
         text.tag_configure(
             "header",
@@ -1339,6 +4397,11 @@ class SmapiLogDoctorApp:
         self.btn_open.config(text=self._t("btn_open"))
         self.btn_export.config(text=self._t("btn_export"))
         self.btn_export_html.config(text=self._t("btn_export_html"))
+        self.btn_export_json.config(text=self._t("btn_export_json"))
+        self.btn_compare.config(text=self._t("btn_compare"))
+        self.chk_profile.config(text=self._t("chk_profile"))
+        self.btn_watch.config(text=self._t("btn_watch_stop" if self.tailer else "btn_watch"))
+        self.btn_cancel.config(text=self._t("btn_cancel"))
 
         # Re-label tabs
         for tab, key in zip(
@@ -1353,10 +4416,17 @@ class SmapiLogDoctorApp:
             ],
         ):
             self.notebook.tab(tab, text=self._t(key))
+        for view in (self.errors_view, self.warnings_view, self.raw_view):
+            view.set_labels(self._t("jump_label"), self._t("btn_jump"))
 
         # Rerender content
         if self.analysis:
-            self.render_all()
+            self.render_all(keep_position=True)
+        if self._worker is not None:
+            self._set_progress_status()
+        elif self.tailer:
+            self._set_watch_status()
+        elif self.analysis:
             if self.current_path:
                 self.status_var.set(self._t("status_loaded", path=self.current_path))
         else:
@@ -1365,6 +4435,7 @@ class SmapiLogDoctorApp:
     # ---------- File handling ----------
 
     def open_log(self) -> None:
+        self.stop_watch()
         initialdir = (
             self.config.last_log_dir
             or guess_smapi_log_dir()
@@ -1375,31 +4446,187 @@ class SmapiLogDoctorApp:
             title="Select SMAPI log",
             initialdir=initialdir,
             filetypes=[
+                ("Logs", "*.txt *.log *.zip *.gz *.bz2 *.xz"),
                 ("Text files", "*.txt"),
                 ("All files", "*.*"),
             ],
         )
         if not path:
             return
+        self.start_analysis(path)
+
+    def compare_log(self) -> None:
+        """Diff an older log against the one currently shown."""
+        if not self.analysis:
+            messagebox.showinfo("Info", self._t("status_no_analysis"))
+            return
+        path = filedialog.askopenfilename(
+            title="Select an older SMAPI log to compare with",
+            initialdir=self.config.last_log_dir or os.path.expanduser("~"),
+            filetypes=[("Logs", "*.txt *.log *.zip *.gz *.bz2 *.xz"), ("All files", "*.*")],
+        )
+        if path:
+            self.start_analysis(path, on_done=self._show_diff)
+
+    def _show_diff(self, old_path: str, old: SmapiAnalysis) -> None:
+        diff = diff_analyses(old, self.analysis)
+        new_name = log_display_name(self.current_path) if self.current_path else ""
+        lines = iter_diff_lines(diff, self.lang, log_display_name(old_path), new_name)
+
+        window = tk.Toplevel(self.root)
+        window.title(self._t("diff_title"))
+        window.geometry("900x600")
+        text = tk.Text(window, wrap="word")
+        scroll = ttk.Scrollbar(window, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        text.pack(side="left", fill="both", expand=True)
+        text.insert("1.0", "\n".join(lines))
+        text.config(state="disabled")
+
+    # ---------- Background analysis ----------
+
+    def start_analysis(self, path: str, on_done: Optional[Callable[[str, SmapiAnalysis], None]] = None) -> None:
+        """
+        Parse the log on a worker thread; results come back via root.after.
+        The result replaces the current analysis, or goes to on_done instead.
+        """
+        if self._worker is not None:
+            return
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                text = f.read()
-        except Exception as e:
+            total = log_input_total(path)
+        except _INPUT_ERRORS as e:
             messagebox.showerror("Error", f"Failed to read file:\n{e}")
             return
 
+        results = queue.Queue()
+        cancel = threading.Event()
+
+        cache = self.cache
+        rules = self.rules
+        profile = ParserProfile() if self.profile_var.get() and on_done is None else None
+
+        def work() -> None:
+            try:
+                try:
+                    key: Optional[str] = log_cache_key(path, rules)
+                except OSError:
+                    key = None
+                # a profile needs a real parse
+                analysis = cache.get(path, key) if key and profile is None else None
+                if analysis is None:
+                    analysis = analyze_smapi_log_file(
+                        path,
+                        progress=lambda done: results.put(("progress", done)),
+                        cancel=cancel,
+                        rules=rules,
+                        profile=profile,
+                    )
+                    if key:
+                        cache.put(path, analysis, key, rules)
+                        cache.evict()
+            except AnalysisCancelled:
+                results.put(("cancelled", None))
+            except _INPUT_ERRORS as e:
+                results.put(("read_error", e))
+            except Exception as e:
+                results.put(("error", e))
+            else:
+                results.put(("done", analysis))
+
+        self._worker_queue = results
+        self._cancel_event = cancel
+        self._analysis_path = path
+        self._analysis_on_done = on_done
+        self._analysis_profile = profile
+        self._analysis_total = total
+        self._analysis_done = 0
+        self._worker = threading.Thread(target=work, name="smapi-log-analysis", daemon=True)
+
+        self.btn_open.config(state="disabled")
+        self.btn_watch.config(state="disabled")
+        self.progress_bar.config(maximum=max(total, 1), value=0)
+        self.progress_bar.pack(side="right", padx=4)
+        self.btn_cancel.pack(side="right")
+        self._set_progress_status()
+
+        self._worker.start()
+        self.root.after(_WORKER_POLL_MS, self._poll_worker)
+
+    def cancel_analysis(self) -> None:
+        self._cancel_event.set()
+
+    def _set_progress_status(self) -> None:
+        self.status_var.set(
+            self._t(
+                "status_analyzing",
+                path=self._analysis_path,
+                done=self._analysis_done / (1024 * 1024),
+                total=self._analysis_total / (1024 * 1024),
+            )
+        )
+
+    def _poll_worker(self) -> None:
+        result: Optional[Tuple[str, object]] = None
+        done: Optional[int] = None
         try:
-            self.analysis = analyze_smapi_log(text)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to analyze log:\n{e}")
+            while True:
+                kind, payload = self._worker_queue.get_nowait()
+                if kind == "progress":
+                    done = payload
+                else:
+                    result = (kind, payload)
+                    break
+        except queue.Empty:
+            pass
+
+        if done is not None:
+            self._analysis_done = done
+            self.progress_bar.config(value=done)
+            self._set_progress_status()
+        if result is None:
+            self.root.after(_WORKER_POLL_MS, self._poll_worker)
+            return
+        self._finish_analysis(*result)
+
+    def _finish_analysis(self, kind: str, payload) -> None:
+        path = self._analysis_path
+        self._worker = None
+        self.progress_bar.pack_forget()
+        self.btn_cancel.pack_forget()
+        self.btn_open.config(state="normal")
+        self.btn_watch.config(state="normal")
+
+        if kind == "cancelled":
+            self.status_var.set(self._t("status_cancelled"))
+            return
+        if kind == "read_error":
+            self.status_var.set(self._t("status_ready"))
+            messagebox.showerror("Error", f"Failed to read file:\n{payload}")
+            return
+        if kind == "error":
+            self.status_var.set(self._t("status_ready"))
+            messagebox.showerror("Error", f"Failed to analyze log:\n{payload}")
+            return
+        if self._analysis_on_done is not None:
+            self.status_var.set(self._t("status_ready"))
+            self._analysis_on_done(path, payload)
             return
 
+        old_index = self.analysis.line_index if self.analysis is not None else None
+        if old_index is not None and old_index is not payload.line_index:
+            # remove the previous log's spill file now, not whenever it is collected
+            old_index.close()
+        self.analysis = payload
         self.current_path = path
         self.config.last_log_dir = os.path.dirname(path)
         save_config(self.config)
 
         self.render_all()
-        self.status_var.set(self._t("status_loaded", path=path))
+        status = self._t("status_loaded", path=path)
+        if self._analysis_profile is not None:
+            status += "  |  " + self._t("status_profile", summary=self._analysis_profile.summary_line())
+        self.status_var.set(status)
 
     def export_summary_txt(self) -> None:
         if not self.analysis:
@@ -1414,9 +4641,8 @@ class SmapiLogDoctorApp:
             return
 
         try:
-            summary_text = self._build_plain_summary()
             with open(path, "w", encoding="utf-8") as f:
-                f.write(summary_text)
+                write_plain_report(self.analysis, f, self.lang, self.rules)
             self.status_var.set(self._t("status_export_ok", path=path))
         except Exception as e:
             self.status_var.set(self._t("status_export_fail", error=e))
@@ -1434,28 +4660,50 @@ class SmapiLogDoctorApp:
             return
 
         try:
-            html_text = self._build_html_summary()
             with open(path, "w", encoding="utf-8") as f:
-                f.write(html_text)
+                write_html_report(self.analysis, f, self.lang, self.rules)
             self.status_var.set(self._t("status_export_html_ok", path=path))
         except Exception as e:
             self.status_var.set(self._t("status_export_html_fail", error=e))
 
+    def export_json(self) -> None:
+        if not self.analysis:
+            messagebox.showinfo("Info", self._t("status_no_analysis"))
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export JSON",
+            defaultextension=".json",
+            filetypes=[("Analysis JSON", "*.json"), ("Error/warning events (NDJSON)", "*.ndjson")],
+        )
+        if not path:
+            return
+
+        try:
+            data = analysis_to_dict(self.analysis)
+            with open(path, "w", encoding="utf-8") as f:
+                if path.lower().endswith(".ndjson"):
+                    write_events_ndjson(data, f, self.current_path)
+                else:
+                    write_analysis_json(data, f, self.current_path)
+            self.status_var.set(self._t("status_export_ok", path=path))
+        except Exception as e:
+            self.status_var.set(self._t("status_export_fail", error=e))
+
     # ---------- Rendering ----------
 
     def _clear_and_enable(self, text: tk.Text) -> None:
         text.config(state="normal")
         text.delete("1.0", tk.END)
 
-    def render_all(self) -> None:
+    def render_all(self, keep_position: bool = False) -> None:
         if not self.analysis:
             return
         self._render_overview()
         self._render_mod_health()
-        self._render_errors()
-        self._render_warnings()
+        self._render_errors(keep_position)
+        self._render_warnings(keep_position)
         self._render_suggestions()
-        self._render_raw()
+        self._render_raw(keep_position)
 
     def _render_overview(self) -> None:
         a = self.analysis
@@ -1500,6 +4748,16 @@ class SmapiLogDoctorApp:
             "• " + t("overview_warning_count", count=len(a.warnings)) + "\n",
             ("bullet", "warning") if a.warnings else ("bullet",),
         )
+        if a.errors or a.warnings:
+            text.insert(
+                tk.END,
+                "• "
+                + t("overview_error_groups", count=len(a.error_groups))
+                + " / "
+                + t("overview_warning_groups", count=len(a.warning_groups))
+                + "\n",
+                ("bullet", "muted"),
+            )
         if a.slow_start_seconds is not None:
             text.insert(
                 tk.END,
@@ -1507,6 +4765,30 @@ class SmapiLogDoctorApp:
                 ("bullet", "muted"),
             )
 
+        # Who made startup slow
+        ranking = startup_ranking(a)
+        if ranking:
+            text.insert(
+                tk.END,
+                "\n" + t("startup_header", seconds=a.startup_seconds) + "\n",
+                ("subheader",),
+            )
+            for e in ranking:
+                text.insert(
+                    tk.END,
+                    "• " + t("startup_item", name=e.name, seconds=e.seconds) + "\n",
+                    ("bullet",),
+                )
+            edits = [e for e in asset_edit_ranking(a) if e.seconds > 0]
+            if edits:
+                text.insert(tk.END, t("startup_edits_header") + "\n", ("subheader",))
+                for e in edits:
+                    text.insert(
+                        tk.END,
+                        "• " + t("startup_edit_item", name=e.name, seconds=e.seconds, count=e.count) + "\n",
+                        ("bullet", "muted"),
+                    )
+
         text.insert(tk.END, "\n" + t("overview_hint") + "\n", ("muted",))
 
         text.config(state="disabled")
@@ -1583,6 +4865,24 @@ class SmapiLogDoctorApp:
                     ("bullet", "error"),
                 )
 
+        # Exceptions by mod
+        exception_rows = mod_exception_summary(a)
+        if exception_rows:
+            sections_written = True
+            text.insert(
+                tk.END,
+                "\n" + t("mod_health_exceptions_header") + "\n",
+                ("subheader",),
+            )
+            for mod, count, types in exception_rows:
+                text.insert(
+                    tk.END,
+                    "• "
+                    + t("mod_health_exception_item", mod=mod, count=count, types=", ".join(types))
+                    + "\n",
+                    ("bullet", "error"),
+                )
+
         # Updates
         if a.update_infos:
             sections_written = True
@@ -1610,77 +4910,62 @@ class SmapiLogDoctorApp:
 
         text.config(state="disabled")
 
-    def _render_errors(self) -> None:
+    def _render_errors(self, keep_position: bool = False) -> None:
         a = self.analysis
         t = self._t
-        text = self.errors_text
-        self._clear_and_enable(text)
 
-        text.insert(tk.END, t("errors_header") + "\n", ("header",))
+        head: List[Row] = [(t("errors_header"), ("header",))]
 
         if not a.errors and not a.skipped_mods and not a.failed_mods:
-            text.insert(tk.END, t("errors_none") + "\n", ("info",))
-            text.config(state="disabled")
+            head.append((t("errors_none"), ("info",)))
+            self.errors_view.set_source(RowSource((head, _as_row)), keep_position)
             return
 
-        text.insert(tk.END, t("errors_intro") + "\n\n", ("muted",))
+        head.append((t("errors_intro"), ("muted",)))
+        head.append(("", ()))
 
         # Skipped / failed mods as "hard errors"
         for sm in a.skipped_mods:
-            text.insert(
-                tk.END,
-                f"• [Skipped] {sm.name} — {sm.reason}\n",
-                ("bullet", "error"),
-            )
+            head.append((f"• [Skipped] {sm.name} — {sm.reason}", ("bullet", "error")))
         for fm in a.failed_mods:
-            text.insert(
-                tk.END,
-                f"• [Failed] {fm.name} — {fm.reason}\n",
-                ("bullet", "error"),
-            )
-
-        # Raw ERROR lines
-        for e in a.errors:
-            text.insert(
-                tk.END,
-                "• " + e + "\n",
-                ("bullet", "error"),
-            )
+            head.append((f"• [Failed] {fm.name} — {fm.reason}", ("bullet", "error")))
 
-        text.config(state="disabled")
+        # ERROR lines grouped by fingerprint, materialized only when scrolled into view
+        self.errors_view.set_source(
+            RowSource((head, _as_row), (a.error_groups, lambda g: ("• " + self._group_text(g), ("bullet", "error")))),
+            keep_position,
+        )
 
-    def _render_warnings(self) -> None:
+    def _render_warnings(self, keep_position: bool = False) -> None:
         a = self.analysis
         t = self._t
-        text = self.warnings_text
-        self._clear_and_enable(text)
 
-        text.insert(tk.END, t("warnings_header") + "\n", ("header",))
+        head: List[Row] = [(t("warnings_header"), ("header",))]
 
         if not a.warnings and not a.external_conflicts:
-            text.insert(tk.END, t("warnings_none") + "\n", ("info",))
-            text.config(state="disabled")
+            head.append((t("warnings_none"), ("info",)))
+            self.warnings_view.set_source(RowSource((head, _as_row)), keep_position)
             return
 
-        text.insert(tk.END, t("warnings_intro") + "\n\n", ("muted",))
-
-        for w in a.warnings:
-            text.insert(
-                tk.END,
-                "• " + w + "\n",
-                ("bullet", "warning"),
-            )
+        head.append((t("warnings_intro"), ("muted",)))
+        head.append(("", ()))
 
-        # External conflicts like RivaTuner
-        for x in a.external_conflicts:
+        # External conflicts like RivaTuner (one row per program)
+        tail: List[Row] = []
+        for x in dict.fromkeys(a.external_conflicts):
             if "RivaTuner" in x:
-                text.insert(
-                    tk.END,
-                    "• " + TEXT[self.lang]["warn_rivatuner"] + "\n",
-                    ("bullet", "warning"),
-                )
-
-        text.config(state="disabled")
+                tail.append(("• " + t("warn_rivatuner"), ("bullet", "warning")))
+            else:
+                tail.append(("• " + t("warn_conflict", name=x), ("bullet", "warning")))
+
+        self.warnings_view.set_source(
+            RowSource(
+                (head, _as_row),
+                (a.warning_groups, lambda g: ("• " + self._group_text(g), ("bullet", "warning"))),
+                (tail, _as_row),
+            ),
+            keep_position,
+        )
 
     def _render_suggestions(self) -> None:
         a = self.analysis
@@ -1690,7 +4975,7 @@ class SmapiLogDoctorApp:
         t = self._t
         text.insert(tk.END, t("suggestions_header") + "\n", ("header",))
 
-        suggestions = build_suggestions(a, self.lang)
+        suggestions = build_suggestions(a, self.lang, self.rules)
         if not suggestions:
             text.insert(tk.END, t("suggestions_none") + "\n", ("info",))
             text.config(state="disabled")
@@ -1711,293 +4996,542 @@ class SmapiLogDoctorApp:
 
         text.config(state="disabled")
 
-    def _render_raw(self) -> None:
-        a = self.analysis
-        t = self._t
-        text = self.raw_log_text
-        self._clear_and_enable(text)
-
-        text.insert(tk.END, t("raw_header") + "\n\n", ("header",))
-        text.insert(tk.END, a.raw_log)
-        text.config(state="disabled")
+    def _group_text(self, group: MessageGroup) -> str:
+        return group_text(group, self._t)
 
-    # ---------- Export summary (plain text & HTML) ----------
+    def _show_in_raw(self, item: object) -> None:
+        """Double-click on an error/warning group: show its first line in Raw Log."""
+        # the live tail only keeps recent lines, so line numbers don't apply
+        if not isinstance(item, MessageGroup) or self.tailer is not None:
+            return
+        self.notebook.select(self.raw_view)
+        self.raw_view.jump_to_line(item.first_line)
+
+    def _resolve_raw_jump(self, text: str) -> Optional[int]:
+        """Raw Log jump box: a line number, or a time of day "HH:MM[:SS]"."""
+        if text.isdigit():
+            return int(text)
+        seconds = parse_time_of_day(text)
+        index = self.analysis.line_index if self.analysis and self.tailer is None else None
+        if seconds is None or index is None:
+            return None
+        line = index.line_for_time(seconds)
+        return None if line is None else line + 1
 
-    def _build_plain_summary(self) -> str:
-        if not self.analysis:
-            return ""
+    def _render_raw(self, keep_position: bool = False) -> None:
         a = self.analysis
         t = self._t
 
-        parts: List[str] = []
-
-        parts.append(t("overview_title"))
-        parts.append("=" * 60)
-        parts.append(f"{t('overview_game_version')}: {a.game_version or t('overview_unknown')}")
-        parts.append(f"{t('overview_smapi_version')}: {a.smapi_version or t('overview_unknown')}")
-        parts.append(t("overview_mod_count", count=a.mod_count))
-        parts.append(t("overview_content_pack_count", count=a.content_pack_count))
-        if a.slow_start_seconds is not None:
-            parts.append(t("overview_slow_start", seconds=a.slow_start_seconds))
-        parts.append("")
-
-        # Errors
-        parts.append(t("errors_header"))
-        parts.append("-" * 60)
-        if not a.errors and not a.skipped_mods and not a.failed_mods:
-            parts.append(t("errors_none"))
-        else:
-            for sm in a.skipped_mods:
-                parts.append(f"[Skipped] {sm.name} — {sm.reason}")
-            for fm in a.failed_mods:
-                parts.append(f"[Failed] {fm.name} — {fm.reason}")
-            for e in a.errors:
-                parts.append(e)
-        parts.append("")
-
-        # Warnings
-        parts.append(t("warnings_header"))
-        parts.append("-" * 60)
-        if not a.warnings and not a.external_conflicts:
-            parts.append(t("warnings_none"))
+        if self.tailer is not None:
+            lines: Sequence[str] = list(self.tailer.recent_lines)
+            head: List[Row] = [(t("raw_tail_header", count=self.tailer.recent_lines.maxlen), ("header",))]
         else:
-            for w in a.warnings:
-                parts.append(w)
-            for x in a.external_conflicts:
-                if "RivaTuner" in x:
-                    parts.append(TEXT[self.lang]["warn_rivatuner"])
-        parts.append("")
+            lines = raw_log_lines(a)
+            head = [(t("raw_header"), ("header",))]
+        head.append(("", ()))
+
+        self.raw_view.set_source(
+            RowSource((head, _as_row), (lines, lambda line: (line, ()))),
+            keep_position,
+            line_base=len(head),
+        )
 
-        # Mod health
-        parts.append(t("mod_health_title"))
-        parts.append("-" * 60)
+    # ---------- Live tail ----------
 
-        if a.patched_mods:
-            parts.append(t("mod_health_patched_header"))
-            for m in a.patched_mods:
-                parts.append("  - " + m)
-        if a.save_serializer_mods:
-            parts.append(t("mod_health_save_header"))
-            for m in a.save_serializer_mods:
-                parts.append("  - " + m)
-        if a.direct_console_mods:
-            parts.append(t("mod_health_console_header"))
-            for m in a.direct_console_mods:
-                parts.append("  - " + m)
-        if a.missing_dependencies:
-            parts.append(t("mod_health_missing_dep_header"))
-            for dep in a.missing_dependencies:
-                parts.append(
-                    "  - "
-                    + t(
-                        "mod_health_missing_dep_item",
-                        mod=dep.mod_name,
-                        missing=dep.missing,
-                    )
-                )
-        if a.update_infos:
-            parts.append(t("mod_health_updates_header"))
-            for u in a.update_infos:
-                parts.append(
-                    "  - "
-                    + t(
-                        "mod_health_update_item",
-                        name=u.name,
-                        current=u.current,
-                        latest=u.latest,
-                    )
-                )
+    def toggle_watch(self) -> None:
+        if self.tailer is not None:
+            self.stop_watch()
+            self.status_var.set(self._t("status_watch_stopped"))
+            return
 
-        if (
-            not a.patched_mods
-            and not a.save_serializer_mods
-            and not a.direct_console_mods
-            and not a.missing_dependencies
-            and not a.update_infos
-        ):
-            parts.append(t("mod_health_none"))
-        parts.append("")
+        path = find_smapi_latest_log([self.config.last_log_dir])
+        if not path:
+            self.status_var.set(self._t("status_watch_missing"))
+            return
 
-        # Suggestions
-        parts.append(t("suggestions_header"))
-        parts.append("-" * 60)
-        suggestions = build_suggestions(a, self.lang)
-        if not suggestions:
-            parts.append(t("suggestions_none"))
+        self.tailer = SmapiLogTailer(path, rules=self.rules)
+        self.tailer.poll()
+        self.analysis = self.tailer.analysis
+        self.current_path = path
+        self.btn_watch.config(text=self._t("btn_watch_stop"))
+        self.render_all()
+        self._tail_state = tail_view_state(self.analysis, self.rules)
+        self._set_watch_status()
+        self._schedule_tail_poll()
+
+    def stop_watch(self) -> None:
+        if self._tail_job is not None:
+            self.root.after_cancel(self._tail_job)
+            self._tail_job = None
+        if self.tailer is not None:
+            self.tailer = None
+            self.btn_watch.config(text=self._t("btn_watch"))
+
+    def _schedule_tail_poll(self) -> None:
+        # catch up on a large backlog quickly, then settle into a steady poll
+        delay = _TAIL_POLL_MS if self.tailer.caught_up else 1
+        self._tail_job = self.root.after(delay, self._poll_tail)
+
+    def _poll_tail(self) -> None:
+        self._tail_job = None
+        tailer = self.tailer
+        if tailer is None:
+            return
+        if tailer.poll():
+            self._apply_tail_update(tailer)
+        self._schedule_tail_poll()
+
+    def _apply_tail_update(self, tailer: SmapiLogTailer) -> None:
+        restarted = tailer.analysis is not self.analysis
+        self.analysis = tailer.analysis
+        state = tail_view_state(self.analysis, self.rules)
+        if restarted:
+            self.render_all()
         else:
-            for s in suggestions:
-                parts.append(" - " + s)
-        parts.append("")
+            # redraw only the tabs whose data changed; views scrolled to the
+            # bottom follow the new lines
+            old = self._tail_state
+            changed = {tab for tab, value in state.items() if old.get(tab) != value}
+            if "overview" in changed:
+                self._render_overview()
+            if "mod_health" in changed:
+                self._render_mod_health()
+            if "errors" in changed:
+                self._render_errors(keep_position=True)
+            if "warnings" in changed:
+                self._render_warnings(keep_position=True)
+            if "suggestions" in changed:
+                self._render_suggestions()
+            if tailer.new_lines:
+                self._render_raw(keep_position=True)
+        self._tail_state = state
+        self._set_watch_status()
+
+    def _set_watch_status(self) -> None:
+        tailer = self.tailer
+        if tailer is None:
+            return
+        a = tailer.analysis
+        self.status_var.set(
+            self._t(
+                "status_watching",
+                path=tailer.path,
+                lines=tailer.parser.line_count,
+                errors=len(a.errors),
+                warnings=len(a.warnings),
+            )
+        )
 
-        return "\n".join(parts)
 
-    def _build_html_summary(self) -> str:
-        if not self.analysis:
-            return ""
-        a = self.analysis
-        t = self._t
+# =========================
+# Batch / command line
+# =========================
 
-        def esc(s: str) -> str:
-            return html.escape(str(s), quote=True)
-
-        parts: List[str] = []
-        parts.append("<!DOCTYPE html>")
-        parts.append("<html><head><meta charset='utf-8'>")
-        parts.append(f"<title>{esc(t('app_title'))}</title>")
-        parts.append(
-            "<style>"
-            "body{font-family:Segoe UI,system-ui,-apple-system,sans-serif;background:#121212;color:#eee;margin:0;padding:16px;}"
-            "h1,h2,h3{color:#ffd369;}"
-            "section{margin-bottom:24px;padding:16px;border-radius:8px;background:#1e1e1e;box-shadow:0 0 8px rgba(0,0,0,0.6);}"
-            "ul{margin:8px 0 0 20px;padding:0;}"
-            ".error{color:#ff6b6b;}"
-            ".warn{color:#ffb347;}"
-            ".info{color:#4da3ff;}"
-            ".muted{color:#999;}"
-            "code{background:#222;border-radius:4px;padding:2px 4px;}"
-            "</style>"
-        )
-        parts.append("</head><body>")
-
-        # Overview
-        parts.append("<section>")
-        parts.append(f"<h1>{esc(t('overview_title'))}</h1>")
-        parts.append("<p>")
-        parts.append(f"{esc(t('overview_game_version'))}: <strong>{esc(a.game_version or t('overview_unknown'))}</strong><br>")
-        parts.append(f"{esc(t('overview_smapi_version'))}: <strong>{esc(a.smapi_version or t('overview_unknown'))}</strong><br>")
-        parts.append(f"{esc(t('overview_mod_count', count=a.mod_count))}<br>")
-        parts.append(f"{esc(t('overview_content_pack_count', count=a.content_pack_count))}<br>")
-        if a.slow_start_seconds is not None:
-            parts.append(f"{esc(t('overview_slow_start', seconds=a.slow_start_seconds))}<br>")
-        parts.append("</p>")
-        parts.append(f"<p class='muted'>{esc(t('overview_hint'))}</p>")
-        parts.append("</section>")
-
-        # Errors
-        parts.append("<section>")
-        parts.append(f"<h2>{esc(t('errors_header'))}</h2>")
-        if not a.errors and not a.skipped_mods and not a.failed_mods:
-            parts.append(f"<p class='info'>{esc(t('errors_none'))}</p>")
-        else:
-            parts.append("<ul>")
-            for sm in a.skipped_mods:
-                parts.append(
-                    f"<li class='error'>[Skipped] {esc(sm.name)} — {esc(sm.reason)}</li>"
-                )
-            for fm in a.failed_mods:
-                parts.append(
-                    f"<li class='error'>[Failed] {esc(fm.name)} — {esc(fm.reason)}</li>"
-                )
-            for e in a.errors:
-                parts.append(f"<li class='error'>{esc(e)}</li>")
-            parts.append("</ul>")
-        parts.append("</section>")
-
-        # Warnings
-        parts.append("<section>")
-        parts.append(f"<h2>{esc(t('warnings_header'))}</h2>")
-        if not a.warnings and not a.external_conflicts:
-            parts.append(f"<p class='info'>{esc(t('warnings_none'))}</p>")
+# (smapi version, game version, failed mods, skipped mods, missing dependencies, outdated mods)
+CorpusRecord = Tuple[Optional[str], Optional[str], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+def corpus_record(data: Dict[str, Any]) -> CorpusRecord:
+    """
+    The few fields of a serialized analysis that corpus statistics need.
+    Names are de-duplicated so every table counts logs, not lines.
+    """
+    missing: List[str] = []
+    for dep in data["missing_dependencies"]:
+        missing.extend(part.strip() for part in dep["missing"].split(","))
+    return (
+        data["smapi_version"],
+        data["game_version"],
+        tuple(dict.fromkeys(m["name"] for m in data["failed_mods"])),
+        tuple(dict.fromkeys(m["name"] for m in data["skipped_mods"])),
+        tuple(dict.fromkeys(m for m in missing if m)),
+        tuple(dict.fromkeys(u["name"] for u in data["update_infos"])),
+    )
+
+
+class CorpusStats:
+    """
+    Corpus-wide counters merged from per-log CorpusRecords. Adding a log is
+    O(its records) and the state is one Counter per table, so a weekly run
+    over tens of thousands of logs stays linear and small. Partial results
+    (e.g. from separate runs) combine with merge().
+    """
+
+    TABLES = ("failed_mods", "skipped_mods", "missing_dependencies", "outdated_mods", "smapi_versions", "game_versions")
+    TITLES = {
+        "failed_mods": "Most-failing mods",
+        "skipped_mods": "Most-skipped mods",
+        "missing_dependencies": "Most-missing dependencies",
+        "outdated_mods": "Most-outdated mods",
+        "smapi_versions": "SMAPI versions",
+        "game_versions": "Game versions",
+    }
+
+    def __init__(self) -> None:
+        self.logs = 0
+        self.counters: Dict[str, Counter] = {name: Counter() for name in self.TABLES}
+
+    def add(self, record: CorpusRecord) -> None:
+        smapi, game, failed, skipped, missing, outdated = record
+        c = self.counters
+        self.logs += 1
+        c["smapi_versions"][smapi or "unknown"] += 1
+        c["game_versions"][game or "unknown"] += 1
+        c["failed_mods"].update(failed)
+        c["skipped_mods"].update(skipped)
+        c["missing_dependencies"].update(missing)
+        c["outdated_mods"].update(outdated)
+
+    def merge(self, other: "CorpusStats") -> None:
+        self.logs += other.logs
+        for name, counter in other.counters.items():
+            self.counters[name].update(counter)
+
+    def ranked(self, name: str, top: Optional[int] = 20) -> List[Tuple[str, int, float]]:
+        """(name, logs, percent of logs) rows, most frequent first."""
+        logs = self.logs or 1
+        return [(key, n, round(100.0 * n / logs, 1)) for key, n in self.counters[name].most_common(top)]
+
+    def to_dict(self, top: Optional[int] = 20) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"logs": self.logs}
+        for name in self.TABLES:
+            data[name] = [{"name": key, "logs": n, "percent": pct} for key, n, pct in self.ranked(name, top)]
+        return data
+
+    def format_tables(self, top: int = 10) -> str:
+        lines: List[str] = []
+        for name in self.TABLES:
+            rows = self.ranked(name, top)
+            if not rows:
+                continue
+            lines.append(f"{self.TITLES[name]} ({self.logs} logs)")
+            width = max(len(key) for key, _n, _pct in rows)
+            for key, n, pct in rows:
+                lines.append(f"  {key:<{width}}  {n:>7}  {pct:5.1f}%")
+            lines.append("")
+        return "\n".join(lines)
+
+
+def _expand_archive(path: str) -> List[str]:
+    # every log inside a zip becomes its own "zip::member" task, so a
+    # multi-log zip is spread across the pool
+    if not path.lower().endswith(".zip"):
+        return [path]
+    try:
+        with zipfile.ZipFile(path) as zf:
+            members = [f"{path}{_ARCHIVE_SEP}{i.filename}" for i in zip_log_members(zf)]
+    except _INPUT_ERRORS:
+        return [path]  # reported as a failed log by the worker
+    return members
+
+
+def iter_log_paths(targets: Iterable[str]) -> List[str]:
+    """
+    Expand files, directories (recursively: *.txt / *.log, compressed or
+    not, and zips) and glob patterns. Zips expand to their log members.
+    """
+    paths: List[str] = []
+    seen = set()
+    for target in targets:
+        if os.path.isdir(target):
+            found = []
+            for dirpath, _dirnames, filenames in os.walk(target):
+                for name in filenames:
+                    if is_log_file_name(name):
+                        found.append(os.path.join(dirpath, name))
+            found.sort()
+        elif os.path.isfile(target):
+            found = [target]
         else:
-            parts.append("<ul>")
-            for w in a.warnings:
-                parts.append(f"<li class='warn'>{esc(w)}</li>")
-            for x in a.external_conflicts:
-                if "RivaTuner" in x:
-                    parts.append(f"<li class='warn'>{esc(TEXT[self.lang]['warn_rivatuner'])}</li>")
-            parts.append("</ul>")
-        parts.append("</section>")
-
-        # Mod health
-        parts.append("<section>")
-        parts.append(f"<h2>{esc(t('mod_health_title'))}</h2>")
-        any_mod_health = False
-        if a.patched_mods:
-            any_mod_health = True
-            parts.append(f"<h3>{esc(t('mod_health_patched_header'))}</h3><ul>")
-            for m in a.patched_mods:
-                parts.append(f"<li class='warn'>{esc(m)}</li>")
-            parts.append("</ul>")
-        if a.save_serializer_mods:
-            any_mod_health = True
-            parts.append(f"<h3>{esc(t('mod_health_save_header'))}</h3><ul>")
-            for m in a.save_serializer_mods:
-                parts.append(f"<li class='error'>{esc(m)}</li>")
-            parts.append("</ul>")
-        if a.direct_console_mods:
-            any_mod_health = True
-            parts.append(f"<h3>{esc(t('mod_health_console_header'))}</h3><ul>")
-            for m in a.direct_console_mods:
-                parts.append(f"<li class='muted'>{esc(m)}</li>")
-            parts.append("</ul>")
-        if a.missing_dependencies:
-            any_mod_health = True
-            parts.append(f"<h3>{esc(t('mod_health_missing_dep_header'))}</h3><ul>")
-            for dep in a.missing_dependencies:
-                parts.append(
-                    "<li class='error'>"
-                    + esc(
-                        t(
-                            "mod_health_missing_dep_item",
-                            mod=dep.mod_name,
-                            missing=dep.missing,
-                        )
-                    )
-                    + "</li>"
-                )
-            parts.append("</ul>")
-        if a.update_infos:
-            any_mod_health = True
-            parts.append(f"<h3>{esc(t('mod_health_updates_header'))}</h3><ul>")
-            for u in a.update_infos:
-                parts.append(
-                    "<li class='info'>"
-                    + esc(
-                        t(
-                            "mod_health_update_item",
-                            name=u.name,
-                            current=u.current,
-                            latest=u.latest,
-                        )
-                    )
-                    + "</li>"
-                )
-            parts.append("</ul>")
-        if not any_mod_health:
-            parts.append(f"<p class='muted'>{esc(t('mod_health_none'))}</p>")
-        parts.append("</section>")
-
-        # Suggestions
-        parts.append("<section>")
-        parts.append(f"<h2>{esc(t('suggestions_header'))}</h2>")
-        suggestions = build_suggestions(a, self.lang)
-        if not suggestions:
-            parts.append(f"<p class='info'>{esc(t('suggestions_none'))}</p>")
+            found = sorted(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+        for path in found:
+            for entry in _expand_archive(path):
+                key = os.path.abspath(entry)
+                if key not in seen:
+                    seen.add(key)
+                    paths.append(entry)
+    return paths
+
+
+def _batch_output_names(paths: Sequence[str]) -> List[str]:
+    # "<log name>", numbered when two logs share a file name
+    names: List[str] = []
+    used: Dict[str, int] = {}
+    for path in paths:
+        stem = log_display_name(path) or "log"
+        n = used.get(stem.lower(), 0) + 1
+        used[stem.lower()] = n
+        names.append(stem if n == 1 else f"{stem}-{n}")
+    return names
+
+
+# --format choices -> per-log output file suffixes
+_BATCH_FORMATS = {"json": (".json",), "ndjson": (".events.ndjson",), "both": (".json", ".events.ndjson")}
+
+
+def _batch_analyze(task: Tuple[str, Optional[str], Optional[str], Tuple[str, ...], str, bool]) -> Dict[str, Any]:
+    """Worker: analyze one log (or take it from the cache), write its exports, return a small summary row."""
+    path, out_base, cache_dir, rule_paths, fmt, profiled = task
+    outputs = [out_base + suffix for suffix in _BATCH_FORMATS[fmt]] if out_base else []
+    row: Dict[str, Any] = {"path": path, "output": outputs, "size": 0, "cached": False, "error": None}
+    try:
+        # compiled once per worker process (load_rule_set is memoized)
+        rules = load_rule_set(rule_paths, include_user_packs=True)
+        cache = AnalysisCache(cache_dir) if cache_dir else None
+        key = log_cache_key(path, rules) if cache else None
+        # a profile needs a real parse
+        data = cache.load(key) if cache and not profiled else None
+        if data is not None:
+            row["cached"] = True
         else:
-            parts.append("<ul>")
-            for s in suggestions:
-                lower = s.lower()
-                cls = ""
-                if ("save" in lower or "存档" in s or "сейв" in lower or "salva" in lower):
-                    cls = "error"
-                elif ("update" in lower or "更新" in s or "обнов" in lower or "atualiz" in lower):
-                    cls = "info"
-                elif "RivaTuner" in s:
-                    cls = "warn"
-                parts.append(f"<li class='{cls}'>{esc(s)}</li>")
-            parts.append("</ul>")
-        parts.append("</section>")
-
-        # Raw log
-        parts.append("<section>")
-        parts.append(f"<h2>{esc(t('raw_header'))}</h2>")
-        parts.append("<pre>")
-        parts.append(esc(a.raw_log))
-        parts.append("</pre>")
-        parts.append("</section>")
-
-        parts.append("</body></html>")
-        return "\n".join(parts)
+            profile = ParserProfile() if profiled else None
+            # the GUI opens cached logs without reading them, so a cached entry needs its .idx
+            analysis = analyze_smapi_log_file(path, index_lines=cache is not None, rules=rules, profile=profile)
+            if profile is not None:
+                row["profile"] = profile.to_dict()
+            data = analysis_to_dict(analysis)
+            if cache:
+                cache.store(key, data, analysis.line_index)
+        for out_path in outputs:
+            with open(out_path, "w", encoding="utf-8") as f:
+                if out_path.endswith(".ndjson"):
+                    write_events_ndjson(data, f, path)
+                else:
+                    write_analysis_json(data, f, path)
+    except Exception as e:
+        # one unreadable log must not stop a batch of thousands
+        row["error"] = str(e) or type(e).__name__
+        return row
+    row.update(
+        size=data["log_size"],
+        smapi_version=data["smapi_version"],
+        game_version=data["game_version"],
+        mod_count=data["mod_count"],
+        errors=len(data["errors"]),
+        error_groups=len(data["error_groups"]),
+        warnings=len(data["warnings"]),
+        exceptions=len(data["exceptions"]),
+        failed_mods=len(data["failed_mods"]),
+        skipped_mods=len(data["skipped_mods"]),
+        missing_dependencies=len(data["missing_dependencies"]),
+        corpus=corpus_record(data),
+    )
+    return row
+
+
+def run_batch(
+    paths: Sequence[str],
+    out_dir: Optional[str] = None,
+    jobs: Optional[int] = None,
+    progress: Optional[Callable[[int, int, float], None]] = None,
+    cache: Optional[AnalysisCache] = None,
+    stats: Optional[CorpusStats] = None,
+    top: Optional[int] = 20,
+    rule_paths: Sequence[str] = (),
+    fmt: str = "json",
+    profile: Optional[ParserProfile] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze many logs across a process pool. Each worker streams its log
+    and writes <out_dir>/<log name>.json (and/or .events.ndjson, see fmt)
+    itself, so only small summary rows
+    travel back to this process. Logs already in the cache are not re-read.
+    progress(done, total, elapsed) is called as results arrive. Corpus
+    statistics are merged into stats (a new CorpusStats by default) as rows
+    arrive, and with a profile every log is parsed (not taken from the cache)
+    and its detector timings are merged into it. Returns the aggregate summary.
+    """
+    if stats is None:
+        stats = CorpusStats()
+    jobs = jobs or os.cpu_count() or 1
+    cache_dir = cache.directory if cache else None
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        names = [os.path.join(out_dir, n) for n in _batch_output_names(paths)]
+    else:
+        names = [None] * len(paths)
+    rule_paths = tuple(rule_paths)
+    tasks = [(p, n, cache_dir, rule_paths, fmt, profile is not None) for p, n in zip(paths, names)]
+
+    start = time.perf_counter()
+    rows: List[Dict[str, Any]] = []
+    if jobs <= 1 or len(tasks) <= 1:
+        results: Iterable[Dict[str, Any]] = map(_batch_analyze, tasks)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+        # small logs dominate submissions, so hand them out in chunks
+        chunksize = max(1, min(64, len(tasks) // (jobs * 8)))
+        results = executor.map(_batch_analyze, tasks, chunksize=chunksize)
+    try:
+        for row in results:
+            record = row.pop("corpus", None)
+            if record is not None:
+                stats.add(record)
+            timings = row.pop("profile", None)
+            if timings is not None and profile is not None:
+                profile.merge(timings)
+            rows.append(row)
+            if progress is not None:
+                progress(len(rows), len(tasks), time.perf_counter() - start)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    elapsed = time.perf_counter() - start
+    if cache is not None:
+        cache.evict()
+
+    total_bytes = sum(r["size"] for r in rows)
+    ok = [r for r in rows if r["error"] is None]
+    return {
+        "logs": len(rows),
+        "failed": len(rows) - len(ok),
+        "cached": sum(1 for r in rows if r["cached"]),
+        "bytes": total_bytes,
+        "seconds": round(elapsed, 3),
+        "logs_per_second": round(len(rows) / elapsed, 2) if elapsed else None,
+        "mb_per_second": round(total_bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+        "jobs": jobs,
+        "totals": {
+            key: sum(r[key] for r in ok)
+            for key in ("errors", "warnings", "exceptions", "failed_mods", "skipped_mods", "missing_dependencies")
+        },
+        "corpus": stats.to_dict(top),
+        **({"profile": profile.to_dict()} if profile is not None else {}),
+        "results": rows,
+    }
+
+
+def _analyze_cached(path: str, cache: Optional[AnalysisCache], rules: Optional[RuleSet] = None) -> SmapiAnalysis:
+    key = log_cache_key(path, rules) if cache else None
+    # diff needs no raw lines, but what it caches must still open in the GUI
+    analysis = cache.get(path, key, rules, need_lines=False) if cache else None
+    if analysis is None:
+        analysis = analyze_smapi_log_file(path, index_lines=cache is not None, rules=rules)
+        if cache:
+            cache.put(path, analysis, key, rules)
+    return analysis
+
+
+def _run_diff(args: argparse.Namespace) -> int:
+    cache = None if args.no_cache else AnalysisCache(args.cache_dir)
+    try:
+        rules = load_rule_set(include_user_packs=True)
+    except ValueError as e:
+        print(f"Invalid rule pack: {e}", file=sys.stderr)
+        return 2
+    try:
+        old, new = (_analyze_cached(path, cache, rules) for path in (args.old, args.new))
+    except _INPUT_ERRORS as e:
+        print(f"Failed to read log: {e}", file=sys.stderr)
+        return 2
+    diff = diff_analyses(old, new, args.top)
+    if args.json:
+        json.dump({"old": args.old, "new": args.new, **asdict(diff)}, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for line in iter_diff_lines(diff, args.lang, log_display_name(args.old), log_display_name(args.new)):
+            print(line)
+    return 1 if diff.new_errors or diff.mods_failing else 0
+
+
+def run_cli(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(prog="smapi-log-doctor", description="SMAPI log analyzer.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p_analyze = commands.add_parser("analyze", help="Analyze logs without the GUI.")
+    p_analyze.add_argument("targets", nargs="+", help="Log files, directories or glob patterns.")
+    p_analyze.add_argument("-o", "--out", help="Directory for per-log results.")
+    p_analyze.add_argument(
+        "--format",
+        choices=sorted(_BATCH_FORMATS),
+        default="json",
+        help="Per-log output: analysis JSON, NDJSON error/warning events, or both.",
+    )
+    p_analyze.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    p_analyze.add_argument("--summary", help="Write the aggregate summary JSON here (default: stdout).")
+    p_analyze.add_argument("--cache-dir", default=CACHE_DIR, help="Analysis cache directory.")
+    p_analyze.add_argument("--no-cache", action="store_true", help="Analyze every log even if cached.")
+    p_analyze.add_argument("--top", type=int, default=20, help="Rows per corpus table in the summary.")
+    p_analyze.add_argument(
+        "--rules", action="append", default=[], help="Rule pack JSON file or directory (repeatable)."
+    )
+    p_analyze.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each parser detector (bypasses the cache) and print the table to stderr.",
+    )
+    p_analyze.add_argument("-q", "--quiet", action="store_true", help="No progress output.")
+    commands.add_parser("schema", help="Print the JSON Schema of the per-log analysis JSON.")
+    p_diff = commands.add_parser(
+        "diff",
+        help="Compare an older log with a newer one. Exits with 1 if the newer one has new errors or failing mods.",
+    )
+    p_diff.add_argument("old", help="Older log (e.g. from before a modpack update).")
+    p_diff.add_argument("new", help="Newer log.")
+    p_diff.add_argument("--json", action="store_true", help="Print the diff as JSON.")
+    p_diff.add_argument("--lang", default="en", choices=sorted(TEXT), help="Language of the text output.")
+    p_diff.add_argument("--top", type=int, default=10, help="Per-mod startup changes to show.")
+    p_diff.add_argument("--cache-dir", default=CACHE_DIR, help="Analysis cache directory.")
+    p_diff.add_argument("--no-cache", action="store_true", help="Analyze both logs even if cached.")
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        return _run_diff(args)
+
+    if args.command == "schema":
+        json.dump(analysis_json_schema(), sys.stdout, indent=2)
+        print()
+        return 0
+
+    paths = iter_log_paths(args.targets)
+    if not paths:
+        print("No logs found.", file=sys.stderr)
+        return 2
+
+    def report(done: int, total: int, elapsed: float) -> None:
+        if done == total or done % 50 == 0:
+            rate = done / elapsed if elapsed else 0.0
+            print(f"\r[{done}/{total}] {rate:.1f} logs/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        load_rule_set(tuple(args.rules), include_user_packs=True)
+    except ValueError as e:
+        print(f"Invalid rule pack: {e}", file=sys.stderr)
+        return 2
+
+    cache = None if args.no_cache else AnalysisCache(args.cache_dir)
+    stats = CorpusStats()
+    profile = ParserProfile() if args.profile else None
+    summary = run_batch(
+        paths,
+        args.out,
+        args.jobs,
+        None if args.quiet else report,
+        cache,
+        stats,
+        args.top,
+        rule_paths=args.rules,
+        fmt=args.format,
+        profile=profile,
+    )
+    if not args.quiet:
+        print(
+            f"\n{summary['logs']} logs ({summary['failed']} failed, {summary['cached']} cached), "
+            f"{summary['bytes'] / (1024 * 1024):.1f} MB in {summary['seconds']:.2f}s: "
+            f"{summary['logs_per_second']} logs/s, {summary['mb_per_second']} MB/s",
+            file=sys.stderr,
+        )
+        print("\n" + stats.format_tables(), file=sys.stderr)
+    if profile is not None:
+        print("\nParser profile\n" + profile.format_table(), file=sys.stderr)
+
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
 
 
 # =========================
@@ -2005,6 +5539,9 @@ class SmapiLogDoctorApp:
 # =========================
 
 def main() -> None:
+    # "smapi-log-doctor analyze ..." runs headless; no arguments opens the GUI
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     root = tk.Tk()
     app = SmapiLogDoctorApp(root)
     root.mainloop()
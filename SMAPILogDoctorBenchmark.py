@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+SMAPI Log Doctor – parser benchmark.
+
+Generates a large synthetic SMAPI log (heavy modpack, verbose TRACE output)
+and times the single-pass parser in SMAPILogDoctor.py against the original
+line-by-line implementation kept below as a reference. Both results are
+compared field by field so a speedup never hides a behaviour change.
+
+    python SMAPILogDoctorBenchmark.py --size-mb 40 --mods 500
+
+With --suite it instead times every stage a log goes through (parsing from
+text and from disk, suggestions, serialization, TXT/HTML reports, JSON and
+NDJSON exports) and records peak memory for each. Results can be saved and
+later runs checked against them:
+
+    python SMAPILogDoctorBenchmark.py --suite --save baseline.json
+    python SMAPILogDoctorBenchmark.py --suite --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from SMAPILogDoctor import (
+    MissingDependency,
+    SkippedMod,
+    SmapiAnalysis,
+    UpdateInfo,
+    _parse_time_to_seconds,
+    analysis_to_dict,
+    analyze_smapi_log,
+    analyze_smapi_log_file,
+    build_suggestions,
+    write_analysis_json,
+    write_events_ndjson,
+    write_html_report,
+    write_plain_report,
+)
+
+
+# =========================
+# Reference implementation (pre single-pass engine)
+# =========================
+
+# SmapiAnalysis fields produced by the reference; newer fields are not compared
+REFERENCE_FIELDS = (
+    "game_version", "smapi_version", "mod_count", "content_pack_count",
+    "skipped_mods", "failed_mods", "save_serializer_mods", "patched_mods",
+    "direct_console_mods", "missing_dependencies", "external_conflicts",
+    "update_infos", "errors", "warnings", "slow_start_seconds", "raw_log",
+)
+
+
+def reference_analyze_smapi_log(text: str) -> SmapiAnalysis:
+    analysis = SmapiAnalysis(raw_log=text)
+    lines = text.splitlines()
+
+    current_loading_mod: Optional[str] = None
+    in_skipped_section = False
+    in_save_serializer_section = False
+    in_patched_section = False
+    in_console_section = False
+
+    for line in lines:
+        if "SMAPI" in line and "with Stardew Valley" in line:
+            m = re.search(r"SMAPI\s+([0-9.]+)\s+with Stardew Valley\s+([0-9.]+)", line)
+            if m:
+                analysis.smapi_version = m.group(1)
+                analysis.game_version = m.group(2)
+
+        if "Loaded" in line and "mods:" in line:
+            m = re.search(r"Loaded\s+(\d+)\s+mods", line)
+            if m:
+                analysis.mod_count = int(m.group(1))
+        if "Loaded" in line and "content packs:" in line:
+            m = re.search(r"Loaded\s+(\d+)\s+content packs", line)
+            if m:
+                analysis.content_pack_count = int(m.group(1))
+
+        if "Instance_LoadContent() finished, elapsed =" in line:
+            m = re.search(r"elapsed\s*=\s*'([^']+)'", line)
+            if m:
+                seconds = _parse_time_to_seconds(m.group(1))
+                if seconds is not None:
+                    analysis.slow_start_seconds = seconds
+
+        m_load = re.search(r"]\s+(.+?)\s+\(from\s+Mods", line)
+        if m_load:
+            current_loading_mod = m_load.group(1)
+
+        if "Failed:" in line:
+            reason = line.split("Failed:", 1)[1].strip()
+            if current_loading_mod:
+                analysis.failed_mods.append(SkippedMod(current_loading_mod, reason))
+                if "requires mods which aren't installed" in reason:
+                    m_dep = re.search(r"\(([^)]+)\)", reason)
+                    if m_dep:
+                        analysis.missing_dependencies.append(
+                            MissingDependency(current_loading_mod, m_dep.group(1))
+                        )
+
+        if "Skipped mods" in line:
+            in_skipped_section = True
+            continue
+
+        if in_skipped_section:
+            if "- " in line:
+                m = re.search(r"]\s+-\s+(.+?)\s+because\s+(.+)$", line)
+                if m:
+                    name = m.group(1).strip()
+                    reason = m.group(2).strip()
+                    analysis.skipped_mods.append(SkippedMod(name, reason))
+                    if "requires mods which aren't installed" in reason:
+                        m_dep = re.search(r"\(([^)]+)\)", reason)
+                        if m_dep:
+                            analysis.missing_dependencies.append(
+                                MissingDependency(name, m_dep.group(1))
+                            )
+            elif line.strip() == "" or "These mods could not be added" in line:
+                pass
+            else:
+                in_skipped_section = False
+
+        if "Changed save serializer" in line:
+            in_save_serializer_section = True
+            continue
+        if in_save_serializer_section:
+            if "- " in line:
+                m = re.search(r"-\s+(.+)$", line)
+                if m:
+                    analysis.save_serializer_mods.append(m.group(1).strip())
+            elif line.strip() == "" or "These mods change the save serializer" in line:
+                pass
+            else:
+                in_save_serializer_section = False
+
+        if "Patched game code" in line:
+            in_patched_section = True
+            continue
+        if in_patched_section:
+            if "- " in line:
+                m = re.search(r"-\s+(.+)$", line)
+                if m:
+                    analysis.patched_mods.append(m.group(1).strip())
+            elif line.strip() == "" or "These mods directly change the game code" in line:
+                pass
+            else:
+                in_patched_section = False
+
+        if "Direct console access" in line:
+            in_console_section = True
+            continue
+        if in_console_section:
+            if "- " in line:
+                m = re.search(r"-\s+(.+)$", line)
+                if m:
+                    analysis.direct_console_mods.append(m.group(1).strip())
+            elif line.strip() == "" or "These mods access the SMAPI console window" in line:
+                pass
+            else:
+                in_console_section = False
+
+        if "RivaTuner Statistics Server" in line:
+            analysis.external_conflicts.append("RivaTuner Statistics Server")
+
+        if "ERROR" in line and "Skipped mods" not in line:
+            msg = line
+            msg = re.sub(r"^\[\d{2}:\d{2}:\d{2} [^\]]*\]\s*", "", msg)
+            msg = re.sub(r"^\d{2}:\d{2}:\d{2}\s+", "", msg)
+            msg = msg.strip()
+            if msg:
+                analysis.errors.append(msg)
+
+        if "WARN" in line and "Changed save serializer" not in line:
+            msg = line
+            msg = re.sub(r"^\[\d{2}:\d{2}:\d{2} [^\]]*\]\s*", "", msg)
+            msg = re.sub(r"^\d{2}:\d{2}:\d{2}\s+", "", msg)
+            msg = msg.strip()
+            if msg:
+                analysis.warnings.append(msg)
+
+        if "ALERT SMAPI" in line and "You can update" not in line:
+            m = re.search(r"]\s+(.+?)\s+([0-9.]+):\s+(\S+)\s+\(you have\s+([0-9.]+)\)", line)
+            if m:
+                analysis.update_infos.append(
+                    UpdateInfo(
+                        name=m.group(1).strip(),
+                        latest=m.group(2).strip(),
+                        current=m.group(4).strip(),
+                        url=m.group(3).strip(),
+                    )
+                )
+
+    return analysis
+
+
+# =========================
+# Synthetic log generator
+# =========================
+
+ASSETS = [
+    "Data/Objects", "Data/Crops", "Data/NPCGiftTastes", "Maps/Town", "Maps/Farm",
+    "Characters/Abigail", "Portraits/Abigail", "Data/Events/Town", "Strings/StringsFromCSFiles",
+    "TileSheets/Craftables", "LooseSprites/Cursors", "Data/Locations",
+]
+
+
+def _ts(seconds: int) -> str:
+    seconds %= 86400
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+# Framework frames appended below a mod's own frame in synthetic stack traces
+FRAMES = [
+    "   at StardewModdingAPI.Framework.Events.ManagedEvent`1.Raise(TEventArgs args)",
+    "   at StardewModdingAPI.Framework.SCore.OnPlayerInstanceUpdating(SGame instance, GameTime gameTime, Action runUpdate)",
+    "   at StardewValley.Game1._update(GameTime gameTime)",
+    "   at StardewValley.Game1.Update(GameTime gameTime)",
+    "   at Microsoft.Xna.Framework.Game.DoUpdate(GameTime gameTime)",
+    "   at Microsoft.Xna.Framework.Game.Tick()",
+]
+
+
+def generate_synthetic_log(
+    size_mb: float,
+    mods: int = 500,
+    seed: int = 1,
+    error_rate: float = 0.02,
+    warning_rate: float = 0.03,
+    skipped: int = 3,
+    failed_rate: float = 0.01,
+    updates: int = 5,
+    trace_depth: int = 2,
+) -> str:
+    """
+    Build a SMAPI-shaped log of roughly size_mb megabytes. After startup,
+    error_rate / warning_rate of the log entries are ERROR (with a stack
+    trace of trace_depth frames) / WARN lines; failed_rate of the mods fail
+    to load, skipped mods are listed as skipped, and the first updates mods
+    get an ALERT update line. The same arguments always give the same log.
+    """
+    rng = random.Random(seed)
+    updates = min(updates, mods)
+    mod_names = [f"Mod Number {i}" for i in range(mods)]
+    pack_names = [f"[CP] Content Pack {i}" for i in range(mods // 2)]
+    clock = 12 * 3600
+    out: List[str] = []
+
+    def log(level: str, source: str, msg: str) -> None:
+        out.append(f"[{_ts(clock)} {level:<5} {source}] {msg}")
+
+    log("INFO", "SMAPI", "SMAPI 4.0.8 with Stardew Valley 1.6.9 build 24277 on Microsoft Windows 11 Home")
+    log("INFO", "SMAPI", "Mods go here: C:\\Games\\Stardew Valley\\Mods")
+    log("TRACE", "SMAPI", "Loading mods...")
+    for name in mod_names:
+        folder = name.replace(" ", "")
+        clock += rng.random() < 0.05
+        log("TRACE", "SMAPI", f"   {name} (from Mods\\{folder}\\{folder}.dll)...")
+        if rng.random() < failed_rate:
+            log("TRACE", "SMAPI", "      Failed: it requires mods which aren't installed (Pathoschild.ContentPatcher).")
+    for name in pack_names:
+        log("TRACE", "SMAPI", f"   {name} (from Mods\\{name}\\content.json) [content pack]...")
+
+    log("ERROR", "SMAPI", "   Skipped mods")
+    log("ERROR", "SMAPI", "   --------------------------------------------------")
+    log("ERROR", "SMAPI", "      These mods could not be added to your game.")
+    for i in range(skipped):
+        log("ERROR", "SMAPI", f"      - Broken Mod {i} 1.0.0 because it requires mods which aren't installed (Some.Dependency{i}).")
+    out.append("")
+
+    log("INFO", "SMAPI", f"Loaded {len(mod_names)} mods:")
+    for name in mod_names:
+        log("INFO", "SMAPI", f"   {name} 1.{rng.randint(0, 9)}.0 by Someone | A mod that does things")
+    log("INFO", "SMAPI", f"Loaded {len(pack_names)} content packs:")
+    for name in pack_names:
+        log("INFO", "SMAPI", f"   {name} 1.0.0 by Someone | for Content Patcher | Adds stuff")
+
+    for header, intro, members in (
+        ("Changed save serializer", "These mods change the save serializer.", mod_names[:3]),
+        ("Patched game code", "These mods directly change the game code.", mod_names[:40]),
+        ("Direct console access", "These mods access the SMAPI console window.", mod_names[40:45]),
+    ):
+        log("WARN", "SMAPI", header)
+        log("WARN", "SMAPI", "--------------------------------------------------")
+        log("WARN", "SMAPI", f"   {intro}")
+        for name in members:
+            log("WARN", "SMAPI", f"   - {name}")
+        out.append("")
+
+    log("WARN", "SMAPI", "RivaTuner Statistics Server detected.")
+    log("ALERT", "SMAPI", f"You can update {updates} mods:")
+    for name in mod_names[:updates]:
+        log("ALERT", "SMAPI", f"   {name} 2.0.0: https://www.nexusmods.com/stardewvalley/mods/1 (you have 1.0.0)")
+    log("TRACE", "SMAPI", "Launching mods...")
+    for name in mod_names:
+        clock += rng.random() < 0.05
+        log("TRACE", name, "Entry point initialized.")
+    log("INFO", "SMAPI", "Mods loaded and ready!")
+    for _ in range(2000):
+        clock += rng.random() < 0.02
+        pack = rng.choice(pack_names)
+        log("TRACE", "SMAPI", f"Content Patcher edited {rng.choice(ASSETS)} (for the '{pack}' content pack).")
+    log("TRACE", "game", "Instance_LoadContent() finished, elapsed = '00:00:34.1234567'")
+    clock += 5
+    log("INFO", "SMAPI", "Context: loaded save 'Farm_123456789', starting spring 1 Y1, locale set to en.")
+
+    target = int(size_mb * 1024 * 1024)
+    size = sum(len(x) + 1 for x in out)
+    while size < target:
+        clock += rng.randint(0, 1)
+        roll = rng.random()
+        if roll < error_rate:
+            mod = rng.choice(mod_names)
+            lines = [
+                f"[{_ts(clock)} ERROR {mod}] Failed in event handler at tile ({rng.randint(0, 99)}, {rng.randint(0, 99)}).",
+                "System.NullReferenceException: Object reference not set to an instance of an object.",
+            ]
+            if trace_depth:
+                lines.append(f"   at {mod.replace(' ', '')}.ModEntry.OnUpdateTicked(Object sender, UpdateTickedEventArgs e)")
+                lines.extend(FRAMES[i % len(FRAMES)] for i in range(trace_depth - 1))
+        elif roll < error_rate + warning_rate:
+            mod = rng.choice(mod_names)
+            lines = [f"[{_ts(clock)} WARN  {mod}] Couldn't find item with ID {rng.randint(1, 99999)}, skipping."]
+        elif roll < error_rate + warning_rate + 0.45:
+            pack = rng.choice(pack_names)
+            lines = [f"[{_ts(clock)} TRACE SMAPI] Content Patcher edited {rng.choice(ASSETS)} (for the '{pack}' content pack)."]
+        else:
+            mod = rng.choice(mod_names)
+            lines = [f"[{_ts(clock)} TRACE {mod}] Tick {rng.randint(0, 1 << 20)}: updated {rng.randint(0, 500)} objects in {rng.choice(ASSETS)}."]
+        out.extend(lines)
+        size += sum(len(x) + 1 for x in lines)
+
+    return "\n".join(out) + "\n"
+
+
+# =========================
+# Regression suite
+# =========================
+
+# A stage regressed when it got this much slower / hungrier than the baseline
+DEFAULT_TOLERANCE = 0.25
+# ... and by more than this in absolute terms (short stages are noisy)
+_MIN_SECONDS = 0.01
+_MIN_PEAK_MB = 1.0
+
+
+def suite_cases(text: str, path: str) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    (stage, zero-argument callable) for everything a log goes through. path
+    holds text on disk; the stages after parsing share one analysis of it.
+    """
+    analysis = analyze_smapi_log_file(path)
+    data = analysis_to_dict(analysis)
+
+    def report(writer: Callable[..., Any]) -> Callable[[], None]:
+        def run() -> None:
+            with open(os.devnull, "w", encoding="utf-8") as out:
+                writer(analysis, out, "en")
+        return run
+
+    def export(writer: Callable[..., Any]) -> Callable[[], None]:
+        def run() -> None:
+            with open(os.devnull, "w", encoding="utf-8") as out:
+                writer(data, out, path)
+        return run
+
+    return [
+        ("analyze_smapi_log", lambda: analyze_smapi_log(text)),
+        ("analyze_smapi_log_file", lambda: analyze_smapi_log_file(path)),
+        ("build_suggestions", lambda: build_suggestions(analysis, "en")),
+        ("analysis_to_dict", lambda: analysis_to_dict(analysis)),
+        ("write_plain_report", report(write_plain_report)),
+        ("write_html_report", report(write_html_report)),
+        ("write_analysis_json", export(write_analysis_json)),
+        ("write_events_ndjson", export(write_events_ndjson)),
+    ]
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best wall time of repeat runs, then the peak traced memory of one more."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # tracing slows everything down, so memory gets a run of its own
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_mb": peak / (1024 * 1024)}
+
+
+def run_suite(text: str, log_info: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    fd, path = tempfile.mkstemp(suffix=".txt", prefix="smapi-bench-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        results = {name: measure(fn, repeat) for name, fn in suite_cases(text, path)}
+    finally:
+        os.remove(path)
+    return {"log": log_info, "python": sys.version.split()[0], "cases": results}
+
+
+def format_suite(results: Dict[str, Any]) -> str:
+    size_mb = results["log"]["size_mb"]
+    lines = [f"{'stage':<24} {'time':>9} {'MB/s':>8} {'peak MB':>9}"]
+    for name, m in results["cases"].items():
+        rate = size_mb / m["seconds"] if m["seconds"] else float("inf")
+        lines.append(f"{name:<24} {m['seconds']:8.3f}s {rate:8.1f} {m['peak_mb']:9.1f}")
+    return "\n".join(lines)
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """One line per stage/metric that got worse than baseline by more than tolerance."""
+    regressions = []
+    for name, base in baseline["cases"].items():
+        current = results["cases"].get(name)
+        if current is None:
+            continue
+        for metric, floor in (("seconds", _MIN_SECONDS), ("peak_mb", _MIN_PEAK_MB)):
+            old, new = base[metric], current[metric]
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f} (+{(new - old) / old:.0%})")
+    return regressions
+
+
+# =========================
+# Runner
+# =========================
+
+def _best_of(fn, text: str, repeat: int):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the SMAPI log parser on synthetic logs.")
+    parser.add_argument("--size-mb", type=float, default=40.0, help="approximate log size in MB")
+    parser.add_argument("--mods", type=int, default=500, help="number of mods in the synthetic modpack")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per implementation (best is reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    gen = parser.add_argument_group("synthetic log")
+    gen.add_argument("--error-rate", type=float, default=0.02, help="share of log entries that are ERRORs")
+    gen.add_argument("--warning-rate", type=float, default=0.03, help="share of log entries that are WARNs")
+    gen.add_argument("--skipped", type=int, default=3, help="mods in the 'Skipped mods' section")
+    gen.add_argument("--failed-rate", type=float, default=0.01, help="share of mods that fail to load")
+    gen.add_argument("--updates", type=int, default=5, help="mods with an ALERT update line")
+    gen.add_argument("--trace-depth", type=int, default=2, help="stack frames per ERROR")
+    suite = parser.add_argument_group("regression suite")
+    suite.add_argument("--suite", action="store_true", help="time and measure every stage instead of comparing to the reference")
+    suite.add_argument("--save", help="write the suite results to this JSON file")
+    suite.add_argument("--baseline", help="fail if a stage regressed against these saved results")
+    suite.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown / memory growth (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    generator_args = {
+        "size_mb": args.size_mb,
+        "mods": args.mods,
+        "seed": args.seed,
+        "error_rate": args.error_rate,
+        "warning_rate": args.warning_rate,
+        "skipped": args.skipped,
+        "failed_rate": args.failed_rate,
+        "updates": args.updates,
+        "trace_depth": args.trace_depth,
+    }
+    text = generate_synthetic_log(**generator_args)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    line_count = text.count("\n")
+    print(f"Synthetic log: {size_mb:.1f} MB, {line_count} lines, {args.mods} mods")
+
+    if args.suite:
+        results = run_suite(text, {"size_mb": size_mb, "lines": line_count, "generator": generator_args}, args.repeat)
+        print(format_suite(results))
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            if baseline["log"]["generator"] != generator_args:
+                print("warning: baseline was measured on a different synthetic log", file=sys.stderr)
+            regressions = find_regressions(results, baseline, args.tolerance)
+            if regressions:
+                raise SystemExit("REGRESSION against " + args.baseline + ":\n  " + "\n  ".join(regressions))
+            print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+        return
+
+    ref_time, ref_result = _best_of(reference_analyze_smapi_log, text, args.repeat)
+    new_time, new_result = _best_of(analyze_smapi_log, text, args.repeat)
+
+    print(f"reference : {ref_time:7.3f}s  ({size_mb / ref_time:6.1f} MB/s)")
+    print(f"single-pass: {new_time:7.3f}s  ({size_mb / new_time:6.1f} MB/s)")
+    print(f"speedup   : {ref_time / new_time:5.2f}x")
+
+    mismatched = [name for name in REFERENCE_FIELDS if getattr(new_result, name) != getattr(ref_result, name)]
+    if mismatched:
+        raise SystemExit(f"MISMATCH in {', '.join(mismatched)}: single-pass engine differs from the reference")
+    print("Output identical to reference implementation.")
+
+
+if __name__ == "__main__":
+    main()
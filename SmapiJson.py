@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+SMAPI JSON – lenient JSON reader (SMAPI 风格宽松 JSON 解析器)
+Reads JSON the way SMAPI's Json.NET does, in one pass over the original text:
+// and /* */ comments, trailing commas, 'single-quoted' strings and unquoted
+property names are accepted. Errors are json.JSONDecodeError with the line
+and column in the original file.
+按 SMAPI（Json.NET）的规则一次性解析 JSON：允许注释、末尾逗号、单引号字符串、
+不带引号的属性名；错误信息中的行列号对应原始文件。
+
+    import SmapiJson
+    data = SmapiJson.load("content.json")
+
+Most mod files only use comments and trailing commas: one regex scan
+removes those and json's C parser reads the rest. Anything else (the other
+extensions, or a real error) goes to a Python parser that walks the
+original text, so diagnostics point at the file as written
+（常见情况：正则扫描去掉注释与末尾逗号后交给 C 解析器；其余情况由 Python 解析器按原文解析，报错位置准确）.
+"""
+
+import json
+import json.decoder
+import json.scanner
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+__all__ = ["LenientScan", "load", "loads", "scan_lenient"]
+
+# ---------- Comments & trailing commas (注释与末尾逗号) ----------
+
+# One regex pass finds everything the lenient reader cares about. Each match
+# is "text to skip, then one token"; the skipped part (plain JSON, strings,
+# ordinary commas) never reaches Python, and its loops are unrolled so a
+# failed match cannot backtrack exponentially
+# (一次正则扫描：跳过普通内容与字符串，只返回注释、末尾逗号；展开循环避免回溯爆炸).
+_TRAILING = r"(?:[ \t\r\n]|//[^\r\n]*|/\*.*?\*/)*[}\]]"
+_LENIENT_TOKEN = re.compile(r"""
+    [^"/,]*(?:(?:"[^"\\]*(?:\\.[^"\\]*)*"|,(?!%s)|/(?![/*]))[^"/,]*)*
+    (?:
+        (//[^\r\n]*)              # 1: line comment (行注释)
+      | (/\*.*?\*/)               # 2: block comment (块注释)
+      | (,)                       # 3: trailing comma (末尾逗号)
+      | (")                       # 4: unterminated string: the rest is inside it (未闭合字符串)
+      | (/\*)                     # 5: unterminated block comment (未闭合块注释)
+    )
+""" % _TRAILING, re.S | re.X)
+# Quick check: no "/" and nothing like a trailing comma → nothing to find (快速判断)
+_TRAILING_COMMA_HINT = re.compile(r",[ \t\r\n]*[}\]]")
+
+@dataclass
+class LenientScan:
+    """
+    Comments and trailing commas found in a JSON text, as offsets
+    (JSON 文本中注释与末尾逗号的位置).
+    """
+    text: str
+    # (start, end) of each comment (每个注释的起止偏移)
+    comments: List[Tuple[int, int]] = field(default_factory=list)
+    # offset of each trailing comma (每个末尾逗号的偏移)
+    trailing_commas: List[int] = field(default_factory=list)
+    # offset of a "/*" that is never closed: an error, never stripped (未闭合块注释的偏移：属于错误，不会被移除)
+    unterminated_comment: Optional[int] = None
+
+    def strip(self, comments: bool, trailing_commas: bool) -> str:
+        """
+        Text without the chosen constructs. A comment becomes its newlines,
+        so line numbers stay correct; a block comment without any becomes a
+        space, so it still separates the tokens around it: 1/**/2 must not
+        read as 12 (移除所选内容；注释替换为其中的换行，单行块注释替换为空格，避免前后 token 粘连).
+        """
+        cuts: List[Tuple[int, int, bool]] = []
+        if comments:
+            cuts.extend((start, end, True) for start, end in self.comments)
+        if trailing_commas:
+            cuts.extend((i, i + 1, False) for i in self.trailing_commas)
+        if not cuts:
+            return self.text
+        cuts.sort()
+        text = self.text
+        parts = []
+        pos = 0
+        for start, end, is_comment in cuts:
+            parts.append(text[pos:start])
+            if is_comment:
+                newlines = text.count("\n", start, end)
+                if newlines:
+                    parts.append("\n" * newlines)
+                elif text.startswith("/*", start):
+                    parts.append(" ")
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """1-based (line, column) of an offset (偏移量对应的行列号，从 1 开始)."""
+        line = self.text.count("\n", 0, offset) + 1
+        return line, offset - self.text.rfind("\n", 0, offset)
+
+def scan_lenient(text: str) -> LenientScan:
+    """Find // and /* */ comments and trailing commas outside strings (查找字符串外的注释与末尾逗号)."""
+    scan = LenientScan(text)
+    if "/" not in text and not _TRAILING_COMMA_HINT.search(text):
+        return scan
+    match = _LENIENT_TOKEN.match
+    pos = 0
+    while True:
+        m = match(text, pos)
+        if m is None:
+            break
+        kind = m.lastindex
+        if kind == 3:
+            scan.trailing_commas.append(m.end() - 1)
+        elif kind == 4:
+            break
+        elif kind == 5:
+            scan.unterminated_comment = m.start(kind)
+            break
+        else:
+            scan.comments.append(m.span(kind))
+        pos = m.end()
+    return scan
+
+# ---------- Parser (解析器) ----------
+
+PairsHook = Callable[[List[Tuple[str, Any]]], Any]
+
+# Whitespace and comments between tokens (token 之间的空白与注释)
+_SKIP = re.compile(r"[ \t\n\r]*(?:(?://[^\n]*|/\*.*?\*/)[ \t\n\r]*)*", re.S)
+# Json.NET reads an unquoted property name as letters, digits, "_" and "$"
+_UNQUOTED_NAME = re.compile(r"[\w$]+")
+_SINGLE_QUOTED = re.compile(r"'((?:[^'\\]|\\.)*)'", re.S)
+# escapes inside a single-quoted string, rewritten for json's scanstring
+_SINGLE_ESCAPES = re.compile(r"""\\.|\"""", re.S)
+_scanstring = json.decoder.scanstring
+
+class _Pairs(list):
+    """Object read by the C scanner, before the caller's hook sees it (暂存的键值对)."""
+
+def _single_escape(m: "re.Match") -> str:
+    token = m.group()
+    if token == '"':
+        return '\\"'
+    if token == "\\'":
+        return "'"
+    return token
+
+class _Parser:
+    def __init__(self, text: str, object_pairs_hook: Optional[PairsHook]):
+        self.text = text
+        self.hook = object_pairs_hook
+        # With a hook, the C scanner only collects pairs and the hook runs
+        # once the container is known to parse, so it never sees an object
+        # twice (有 hook 时先暂存，解析成功后再调用，避免重复调用).
+        decoder = json.JSONDecoder(object_pairs_hook=_Pairs if object_pairs_hook else None)
+        self.scan_once = json.scanner.make_scanner(decoder)
+
+    def error(self, msg: str, pos: int):
+        raise json.JSONDecodeError(msg, self.text, pos)
+
+    def skip(self, pos: int) -> int:
+        pos = _SKIP.match(self.text, pos).end()
+        if self.text.startswith("/*", pos):
+            self.error("Unterminated comment", pos)
+        return pos
+
+    def document(self) -> Any:
+        pos = 1 if self.text.startswith("\ufeff") else 0
+        value, pos = self.value(self.skip(pos))
+        pos = self.skip(pos)
+        if pos != len(self.text):
+            self.error("Extra data", pos)
+        return value
+
+    def value(self, pos: int) -> Tuple[Any, int]:
+        """Value starting at pos (no leading whitespace); returns (value, end)."""
+        text = self.text
+        ch = text[pos:pos + 1]
+        if ch == '"':
+            return _scanstring(text, pos + 1)
+        if ch == "'":
+            return self.single_quoted(pos)
+        if ch == "{" or ch == "[":
+            # plain JSON all the way through: one C call (纯标准 JSON：直接交给 C 扫描器)
+            try:
+                value, end = self.scan_once(text, pos)
+            except (StopIteration, json.JSONDecodeError):
+                return self.object(pos + 1) if ch == "{" else self.array(pos + 1)
+            return (self.resolve(value) if self.hook else value), end
+        try:
+            return self.scan_once(text, pos)
+        except StopIteration:
+            self.error("Expecting value", pos)
+
+    def single_quoted(self, pos: int) -> Tuple[str, int]:
+        m = _SINGLE_QUOTED.match(self.text, pos)
+        if m is None:
+            self.error("Unterminated string starting at", pos)
+        try:
+            value, _end = _scanstring(_SINGLE_ESCAPES.sub(_single_escape, m.group(1)) + '"', 0)
+        except json.JSONDecodeError as e:
+            self.error(e.msg, pos)
+        return value, m.end()
+
+    def object(self, pos: int) -> Tuple[Any, int]:
+        text = self.text
+        pairs: List[Tuple[str, Any]] = []
+        pos = self.skip(pos)
+        while True:
+            ch = text[pos:pos + 1]
+            if ch == "}":
+                # also closes after a trailing comma (也处理末尾逗号)
+                break
+            if ch == '"':
+                key, pos = _scanstring(text, pos + 1)
+            elif ch == "'":
+                key, pos = self.single_quoted(pos)
+            else:
+                m = _UNQUOTED_NAME.match(text, pos)
+                if m is None:
+                    self.error("Expecting property name", pos)
+                key, pos = m.group(), m.end()
+            pos = self.skip(pos)
+            if text[pos:pos + 1] != ":":
+                self.error("Expecting ':' delimiter", pos)
+            value, pos = self.value(self.skip(pos + 1))
+            pairs.append((key, value))
+            pos = self.skip(pos)
+            ch = text[pos:pos + 1]
+            if ch == ",":
+                pos = self.skip(pos + 1)
+            elif ch != "}":
+                self.error("Expecting ',' delimiter", pos)
+        return (self.hook(pairs) if self.hook else dict(pairs)), pos + 1
+
+    def array(self, pos: int) -> Tuple[List[Any], int]:
+        text = self.text
+        values: List[Any] = []
+        pos = self.skip(pos)
+        while text[pos:pos + 1] != "]":
+            value, pos = self.value(pos)
+            values.append(value)
+            pos = self.skip(pos)
+            ch = text[pos:pos + 1]
+            if ch == ",":
+                pos = self.skip(pos + 1)
+            elif ch != "]":
+                self.error("Expecting ',' delimiter", pos)
+        return values, pos + 1
+
+    def resolve(self, value: Any) -> Any:
+        """Run the caller's hook over objects the C scanner collected, innermost first."""
+        if type(value) not in (list, _Pairs):
+            return value
+        if type(value) is _Pairs:
+            return self.hook([
+                (k, self.resolve(v) if type(v) in (list, _Pairs) else v) for k, v in value
+            ])
+        for i, v in enumerate(value):
+            if type(v) in (list, _Pairs):
+                value[i] = self.resolve(v)
+        return value
+
+def _commas_follow_values(scan: LenientScan) -> bool:
+    """
+    False if a trailing comma has no value before it, as in "[,]" or
+    "{ /* x */ ,}", which SMAPI rejects (末尾逗号前必须有值).
+    """
+    text = scan.text
+    comment_starts = {end: start for start, end in scan.comments}
+    for pos in scan.trailing_commas:
+        while pos > 0:
+            if text[pos - 1] in " \t\r\n":
+                pos -= 1
+            elif pos in comment_starts:
+                pos = comment_starts[pos]
+            else:
+                break
+        if pos == 0 or text[pos - 1] in "[{,":
+            return False
+    return True
+
+def loads(text: str, object_pairs_hook: Optional[PairsHook] = None) -> Any:
+    """
+    Parse SMAPI-flavored JSON text (解析 SMAPI 风格的 JSON 文本).
+    Raises json.JSONDecodeError (a ValueError) with lineno/colno in text.
+    """
+    body = text[1:] if text.startswith("\ufeff") else text
+    scan = scan_lenient(body)
+    # an unclosed /* is an error; _Parser reports it where it starts (未闭合注释交给解析器报错)
+    if scan.unterminated_comment is None and _commas_follow_values(scan):
+        try:
+            # see _Parser: objects are collected first, the hook runs once it all parsed
+            value = json.loads(
+                scan.strip(comments=True, trailing_commas=True),
+                object_pairs_hook=_Pairs if object_pairs_hook else None
+            )
+        except json.JSONDecodeError:
+            pass
+        else:
+            return _Parser(text, object_pairs_hook).resolve(value) if object_pairs_hook else value
+    return _Parser(text, object_pairs_hook).document()
+
+def load(path: str, object_pairs_hook: Optional[PairsHook] = None) -> Any:
+    """Read and parse a JSON file; a UTF-8 BOM is allowed (读取并解析 JSON 文件，允许 BOM)."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return loads(f.read(), object_pairs_hook)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+SMAPI JSON – parser benchmark.
+
+Generates synthetic mod JSON (content packs with comments and trailing
+commas, plus plain JSON) and times the three ways the tools read it:
+
+- reference: the original per-character comment / trailing-comma passes,
+  kept below, followed by json.loads
+- scan+loads: SmapiJson.scan_lenient + strip, followed by json.loads
+- SmapiJson: SmapiJson.loads (the same fast path, plus the checks and
+  fallback parser that give SMAPI's rules and exact error positions)
+
+All results are compared so a speedup never hides a behaviour change.
+
+    python SmapiJsonBenchmark.py --files 2000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, List
+
+import SmapiJson
+from SmapiJson import scan_lenient
+
+
+# =========================
+# Reference implementation (pre single-pass scanner)
+# =========================
+
+def reference_strip_line_comments(text: str) -> str:
+    out_chars = []
+    i = 0
+    in_string = False
+    escape = False
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if in_string:
+            out_chars.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            i += 1
+            continue
+        if ch == '"':
+            in_string = True
+            out_chars.append(ch)
+            i += 1
+            continue
+        if ch == '/' and i + 1 < length and text[i + 1] == '/':
+            i += 2
+            while i < length and text[i] not in '\r\n':
+                i += 1
+            if i < length:
+                out_chars.append(text[i])
+                i += 1
+            continue
+        out_chars.append(ch)
+        i += 1
+    return ''.join(out_chars)
+
+
+def reference_remove_trailing_commas(text: str) -> str:
+    out_chars = []
+    i = 0
+    in_string = False
+    escape = False
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if in_string:
+            out_chars.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            i += 1
+            continue
+        if ch == '"':
+            in_string = True
+            out_chars.append(ch)
+            i += 1
+            continue
+        if ch == ',':
+            j = i + 1
+            while j < length and text[j] in ' \t\r\n':
+                j += 1
+            if j < length and text[j] in '}]':
+                i += 1
+                continue
+        out_chars.append(ch)
+        i += 1
+    return ''.join(out_chars)
+
+
+def reference_loads(text: str):
+    return json.loads(reference_remove_trailing_commas(reference_strip_line_comments(text)))
+
+
+def scan_loads(text: str):
+    return json.loads(scan_lenient(text).strip(comments=True, trailing_commas=True))
+
+
+# =========================
+# Synthetic mod JSON
+# =========================
+
+TARGETS = ["Data/Objects", "Data/Crops", "Data/NPCGiftTastes", "Characters/Dialogue/Abigail", "Strings/UI"]
+
+
+def _content_pack(rng: random.Random, changes: int) -> str:
+    """content.json of a Content Patcher pack, written the way modders do."""
+    lines = ["{", '  // Content Patcher pack, see https://stardewvalleywiki.com/Modding:Content_Patcher', '  "Format": "2.0.0",', '  "Changes": [']
+    for i in range(changes):
+        target = rng.choice(TARGETS)
+        lines.append("    {")
+        if rng.random() < 0.3:
+            lines.append(f"      // change {i}: tweak {target}")
+        lines.append('      "Action": "EditData",')
+        lines.append(f'      "Target": "{target}",')
+        lines.append('      "Entries": {')
+        for j in range(rng.randint(1, 8)):
+            value = f"Item {i}-{j}/{rng.randint(1, 999)}/-300/Basic -16/It's \\\"fine\\\", really//"
+            lines.append(f'        "{i}_{j}": "{value}",')
+        lines.append("      },")
+        if rng.random() < 0.5:
+            lines.append('      "When": { "Season": "spring, summer", "HasMod": ["Some.Mod"], },')
+        lines.append("    },")
+    lines.append("  ],")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _plain_json(rng: random.Random, entries: int) -> str:
+    data = {f"key.{i}": {"text": f"Line {i} with {{{{token}}}} and {rng.random()}", "n": rng.randint(0, 1 << 30)} for i in range(entries)}
+    return json.dumps(data, indent=2)
+
+
+def generate_files(count: int, seed: int = 1) -> List[str]:
+    """count JSON texts: mostly commented content packs, some plain JSON."""
+    rng = random.Random(seed)
+    files = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            files.append(_content_pack(rng, rng.randint(1, 60)))
+        else:
+            files.append(_plain_json(rng, rng.randint(5, 200)))
+    return files
+
+
+# =========================
+# Runner
+# =========================
+
+def _best_of(fn: Callable[[str], object], texts: List[str], repeat: int):
+    best = None
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(t) for t in texts]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark lenient JSON parsing of mod files.")
+    parser.add_argument("--files", type=int, default=2000, help="number of synthetic JSON files")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per implementation (best is reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    texts = generate_files(args.files, seed=args.seed)
+    size_mb = sum(len(t.encode("utf-8")) for t in texts) / (1024 * 1024)
+    lenient = [t for t in texts if "//" in t]
+    print(f"Synthetic JSON: {len(texts)} files, {size_mb:.1f} MB ({len(lenient)} with comments / trailing commas)")
+
+    timings = {}
+    results = {}
+    for name, fn in (("reference", reference_loads), ("scan+loads", scan_loads), ("SmapiJson", SmapiJson.loads)):
+        timings[name], results[name] = _best_of(fn, texts, args.repeat)
+        print(f"{name:<11}: {timings[name]:7.3f}s  ({size_mb / timings[name]:6.1f} MB/s)")
+    print(f"speedup    : {timings['reference'] / timings['SmapiJson']:5.2f}x over reference, "
+          f"{timings['scan+loads'] / timings['SmapiJson']:5.2f}x over scan+loads")
+
+    strict = [t for t in texts if "//" not in t]
+    strict_mb = sum(len(t.encode("utf-8")) for t in strict) / (1024 * 1024)
+    json_time, _ = _best_of(json.loads, strict, args.repeat)
+    smapi_time, _ = _best_of(SmapiJson.loads, strict, args.repeat)
+    print(f"plain JSON only ({strict_mb:.1f} MB): json.loads {json_time:.3f}s, SmapiJson {smapi_time:.3f}s")
+
+    for name in ("scan+loads", "SmapiJson"):
+        if results[name] != results["reference"]:
+            raise SystemExit(f"MISMATCH: {name} differs from the reference")
+    print("Output identical to reference implementation.")
+
+
+if __name__ == "__main__":
+    main()
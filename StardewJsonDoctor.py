@@ -3,14 +3,30 @@
 Stardew JSON Doctor – GUI Edition (星露谷 JSON 诊所 GUI 版)
 One-click JSON checker & trailing-comma fixer for Stardew Valley mods.
 一键检查模组 JSON，并自动修复末尾多余逗号的小工具。
+
+Without arguments it opens the GUI; with arguments it runs headless, e.g. to
+gate a modpack build (带参数时以命令行方式运行，可用于构建检查):
+
+    python StardewJsonDoctor.py Mods --smapi-mode --format sarif -o json.sarif
 """
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator, Sequence
+import argparse
+import concurrent.futures
 import os
 import json
+import pathlib
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+import SmapiJson
+from SmapiJson import LenientScan, scan_lenient
 
 # ---------- Data structures (数据结构) ----------
 
@@ -29,6 +45,8 @@ class FileResult:
     ok: bool
     issues: List[FileIssue] = field(default_factory=list)
     fixed: bool = False
+    # taken from the scan cache: unchanged since the last scan (来自缓存：自上次扫描后未变化)
+    cached: bool = False
 
 # ---------- Core JSON logic (核心 JSON 逻辑) ----------
 
@@ -39,106 +57,6 @@ def iter_json_files(root: str):
             if name.lower().endswith(".json"):
                 yield os.path.join(dirpath, name)
 
-def strip_line_comments(text: str) -> str:
-    """
-    Remove //-style comments that are outside of strings (移除字符串外部的 // 行注释).
-    Keeps newlines so line numbers stay roughly correct (保留换行符以尽量保持行号一致).
-    """
-    out_chars = []
-    i = 0
-    in_string = False
-    escape = False
-    length = len(text)
-
-    while i < length:
-        ch = text[i]
-
-        if in_string:
-            out_chars.append(ch)
-            if escape:
-                escape = False
-            elif ch == '\\':
-                escape = True
-            elif ch == '"':
-                in_string = False
-            i += 1
-            continue
-
-        # entering string (进入字符串)
-        if ch == '"':
-            in_string = True
-            out_chars.append(ch)
-            i += 1
-            continue
-
-        # line comment start? (是否为行注释开始？)
-        if ch == '/' and i + 1 < length and text[i + 1] == '/':
-            # skip until newline or EOF (跳过直到换行或文件结尾)
-            i += 2
-            while i < length and text[i] not in '\r\n':
-                i += 1
-            # keep the newline itself (保留换行符本身)
-            if i < length:
-                out_chars.append(text[i])
-                i += 1
-            continue
-
-        out_chars.append(ch)
-        i += 1
-
-    return ''.join(out_chars)
-
-def remove_trailing_commas(text: str) -> str:
-    """
-    Remove trailing commas before '}' or ']' while ignoring commas inside strings.
-    在不影响字符串中的逗号的前提下，移除 '}' 或 ']' 之前的多余逗号。
-    """
-    out_chars = []
-    i = 0
-    in_string = False
-    escape = False
-    length = len(text)
-
-    while i < length:
-        ch = text[i]
-
-        if in_string:
-            out_chars.append(ch)
-            if escape:
-                escape = False
-            elif ch == '\\':
-                escape = True
-            elif ch == '"':
-                in_string = False
-            i += 1
-            continue
-
-        if ch == '"':
-            in_string = True
-            out_chars.append(ch)
-            i += 1
-            continue
-
-        if ch == ',':
-            # look ahead: only whitespace then } or ] → treat as trailing comma
-            # 向前查看：若之后只有空白再跟 '}' 或 ']' → 视为多余逗号
-            j = i + 1
-            while j < length and text[j] in ' \t\r\n':
-                j += 1
-            if j < length and text[j] in '}]':
-                # skip this comma (跳过这个逗号)
-                i += 1
-                continue
-            else:
-                out_chars.append(ch)
-                i += 1
-                continue
-
-        out_chars.append(ch)
-        i += 1
-
-    return ''.join(out_chars)
-
 def detect_duplicates_object_pairs_hook(issues: List[FileIssue], path: str):
     """
     object_pairs_hook that records duplicate keys while still returning a dict.
@@ -177,14 +95,21 @@ def validate_file(
     Validate one JSON file (校验单个 JSON 文件).
 
     Pipeline (处理流程):
-    1. (optional) strip // comments → work_text（可选：移除 // 注释）
+    0. one scan_lenient pass finds comments and trailing commas（一次扫描找出注释与末尾逗号）
+    1. (optional) strip // and /* */ comments → work_text（可选：移除注释）
     2. (optional) if allow_trailing_commas=True, strip trailing commas for parsing only
        （可选：若允许末尾逗号，则仅在解析时移除多余逗号，不记录为错误）
     3. parse → if OK, record duplicate keys（若解析成功，记录重复键）
     4. if NOT OK, record invalid_json_original（记录原始解析错误）
-    5. if auto_fix=True AND allow_trailing_commas=False, try remove_trailing_commas and parse again:
-       - if OK → record trailing_commas_fixed + any duplicate_keys，并可写回文件
+    5. if auto_fix=True AND allow_trailing_commas=False, drop the trailing commas and parse again:
+       - if OK → record trailing_commas_fixed (with their positions) + any duplicate_keys，并可写回文件
        - if still NOT OK → record invalid_json_after_fix
+    The text is tokenized once and parsed at most twice (文本只扫描一次，最多解析两次).
+
+    With both ignore_comments and allow_trailing_commas (SMAPI mode) steps 0-2
+    are skipped: SmapiJson reads the original text the way SMAPI does, which
+    also accepts single-quoted strings and unquoted property names
+    （SMAPI 模式：直接用 SmapiJson 按 SMAPI 的规则解析原文）.
     """
     issues: List[FileIssue] = []
     fixed = False
@@ -202,21 +127,28 @@ def validate_file(
         return FileResult(path=path, ok=False, issues=issues)
 
     # Step 1: prepare working text (准备要解析的文本)
-    work_text = original_text
-    if ignore_comments:
-        work_text = strip_line_comments(work_text)
+    # strict and SMAPI mode only need the scan if a fix is attempted (严格/SMAPI 模式仅在尝试修复时才扫描)
+    smapi_mode = ignore_comments and allow_trailing_commas
+    scanned = (ignore_comments or allow_trailing_commas) and not smapi_mode
+    scan = scan_lenient(original_text) if scanned else LenientScan(original_text)
+    work_text = scan.strip(comments=ignore_comments, trailing_commas=False)
 
     # Step 2: prepare parse_text (根据设置准备解析用文本)
-    parse_text = work_text
-    if allow_trailing_commas:
-        # For SMAPI mode: ignore trailing commas for validation only
-        # SMAPI 模式：仅在解析时忽略末尾逗号，不视为错误、不写回文件
-        parse_text = remove_trailing_commas(parse_text)
+    # For SMAPI mode: ignore trailing commas for validation only
+    # SMAPI 模式：仅在解析时忽略末尾逗号，不视为错误、不写回文件
+    parse_text = scan.strip(comments=ignore_comments, trailing_commas=allow_trailing_commas)
 
     # Step 3: first parse attempt (第一次解析尝试)
     ok = False
     try:
-        json.loads(parse_text, object_pairs_hook=detect_duplicates_object_pairs_hook(issues, path))
+        hook = detect_duplicates_object_pairs_hook(issues, path)
+        if smapi_mode:
+            SmapiJson.loads(original_text, object_pairs_hook=hook)
+        else:
+            if ignore_comments and scan.unterminated_comment is not None:
+                # an unclosed /* is an error, not a comment to strip (未闭合的 /* 是错误，不能当作注释移除)
+                raise json.JSONDecodeError("Unterminated comment", original_text, scan.unterminated_comment)
+            json.loads(parse_text, object_pairs_hook=hook)
         ok = True
     except json.JSONDecodeError as e:
         issues.append(FileIssue(
@@ -231,8 +163,11 @@ def validate_file(
     # Step 4: only if auto_fix is ON and trailing commas are NOT allowed, try trailing comma fix
     # 第四步：仅在 auto_fix=True 且 未开启“允许末尾逗号”时，才尝试修复末尾逗号
     if not ok and auto_fix and not allow_trailing_commas:
-        fixed_text = remove_trailing_commas(work_text)
-        if fixed_text != work_text:
+        if not scanned:
+            scan = scan_lenient(original_text)
+        if scan.trailing_commas:
+            fixed_text = scan.strip(comments=ignore_comments, trailing_commas=True)
+            positions = [list(scan.position(i)) for i in scan.trailing_commas]
             try:
                 # fresh issues list for this parse ONLY for duplicates
                 temp_issues: List[FileIssue] = []
@@ -244,7 +179,10 @@ def validate_file(
                 issues.append(FileIssue(
                     path=path,
                     issue_type="trailing_commas_fixed",
-                    message="Removed trailing commas (已移除末尾多余逗号) before '}' or ']'."
+                    message=f"Removed {len(positions)} trailing comma(s) (已移除末尾多余逗号) before '}}' or ']'.",
+                    line=positions[0][0],
+                    column=positions[0][1],
+                    details={"positions": positions}
                 ))
                 issues.extend(temp_issues)
                 if ignore_comments:
@@ -252,7 +190,7 @@ def validate_file(
                         path=path,
                         issue_type="comments_removed_on_fix",
                         message="File fixed with comments ignored (在忽略注释的前提下修复文件); "
-                                "// comments may be removed in the saved file (保存后的文件可能不再包含 // 注释)."
+                                "comments may be removed in the saved file (保存后的文件可能不再包含注释)."
                     ))
             except json.JSONDecodeError as e:
                 issues.append(FileIssue(
@@ -263,7 +201,7 @@ def validate_file(
                     column=e.colno
                 ))
                 ok = False
-        # if fixed_text == work_text, we already have invalid_json_original; nothing else to do
+        # no trailing commas: we already have invalid_json_original; nothing else to do
 
     # Step 5: write back if we actually fixed something and auto_fix is ON
     # 第五步：仅在 auto_fix=True 且确实修复了文件时才写回
@@ -286,8 +224,388 @@ def validate_file(
 
     return FileResult(path=path, ok=ok, issues=issues, fixed=fixed)
 
+# ---------- Scan engine (扫描引擎) ----------
+
+@dataclass
+class ScanOptions:
+    auto_fix: bool = False
+    backup: bool = True
+    ignore_comments: bool = False
+    allow_trailing_commas: bool = False
+
+def _validate_task(task: Tuple[str, ScanOptions]) -> FileResult:
+    path, options = task
+    return validate_file(path, **asdict(options))
+
+def _validate_many(paths: List[str], options: ScanOptions, jobs: Optional[int]) -> Iterator[FileResult]:
+    tasks = [(path, options) for path in paths]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        yield from map(_validate_task, tasks)
+        return
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+    try:
+        # most JSON files are tiny, so hand them out in chunks (小文件分批提交)
+        chunksize = max(1, min(64, len(tasks) // (jobs * 8)))
+        yield from executor.map(_validate_task, tasks, chunksize=chunksize)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def iter_scan(
+    paths: Iterable[str],
+    options: ScanOptions,
+    jobs: Optional[int] = None,
+    cache: Optional["ScanCache"] = None
+) -> Iterator[FileResult]:
+    """
+    Validate files across a process pool and yield their FileResults in the
+    order of paths (多进程并行校验，按输入顺序返回结果).
+    jobs=1 (or a single file) validates in this process. With a cache, files
+    unchanged since the last scan are not read again (缓存命中的文件不再读取).
+    """
+    paths = list(paths)
+    hits: List[Optional[FileResult]] = [None] * len(paths)
+    if cache is not None:
+        hits = [cache.get(path, options) for path in paths]
+    fresh = _validate_many([p for p, hit in zip(paths, hits) if hit is None], options, jobs)
+    for hit in hits:
+        if hit is not None:
+            yield hit
+            continue
+        res = next(fresh)
+        if cache is not None:
+            cache.put(res, options)
+        yield res
+
+def scan_files(
+    paths: Iterable[str],
+    options: ScanOptions,
+    jobs: Optional[int] = None,
+    cache: Optional["ScanCache"] = None
+) -> List[FileResult]:
+    """List form of iter_scan (返回全部结果列表)."""
+    return list(iter_scan(paths, options, jobs, cache))
+
+# ---------- Scan cache (扫描缓存) ----------
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".stardew_json_doctor_cache.json")
+# Bump when validate_file's results change for the same input (校验结果变化时递增)
+_CACHE_VERSION = 6
+
+class ScanCache:
+    """
+    FileResults of earlier scans, keyed by path and reused while the file's
+    size and mtime and the parse options are unchanged
+    (按路径缓存校验结果；文件大小、修改时间和解析选项不变时直接复用).
+    Paths are keyed absolute and case-normalized, so the GUI and a CLI run
+    from any folder share entries (路径统一为绝对路径，GUI 与命令行共用缓存).
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        # _key(path) -> [size, mtime_ns, options key, FileResult as dict]
+        self.entries: Dict[str, list] = {}
+        # entries changed since load (自加载后是否有变化)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str = CACHE_PATH) -> "ScanCache":
+        cache = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == _CACHE_VERSION:
+                cache.entries = data["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            # missing or unreadable cache: start empty (缓存缺失或损坏：重新开始)
+            pass
+        return cache
+
+    def save(self):
+        if not self.dirty:
+            return
+        # a temp file of our own: a GUI and a CLI run may save at the same time
+        # 每个进程使用独立的临时文件，避免同时保存时冲突
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": _CACHE_VERSION, "entries": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.dirty = False
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def _options_key(options: ScanOptions) -> str:
+        # only the options that change parse results (只包含影响解析结果的选项)
+        return f"c{int(options.ignore_comments)}t{int(options.allow_trailing_commas)}"
+
+    def get(self, path: str, options: ScanOptions) -> Optional[FileResult]:
+        entry = self.entries.get(self._key(path))
+        if entry is None:
+            return None
+        size, mtime_ns, key, data = entry
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != size or st.st_mtime_ns != mtime_ns or key != self._options_key(options):
+            return None
+        if options.auto_fix and not data["ok"]:
+            # an invalid file may be fixable now (无效文件需重新尝试修复)
+            return None
+        # reported under the path as the caller spelled it (使用调用方给出的路径)
+        issues = [FileIssue(**{**issue, "path": path}) for issue in data["issues"]]
+        return FileResult(path=path, ok=data["ok"], issues=issues, fixed=False, cached=True)
+
+    def put(self, res: FileResult, options: ScanOptions):
+        # a fixed file was rewritten, and read errors may go away: validate those again next time
+        # 已修复（文件被改写）或读取失败的结果不缓存
+        if res.fixed or any(issue.issue_type.startswith("io_error") for issue in res.issues):
+            if self.entries.pop(self._key(res.path), None) is not None:
+                self.dirty = True
+            return
+        try:
+            st = os.stat(res.path)
+        except OSError:
+            return
+        data = {"ok": res.ok, "issues": [asdict(issue) for issue in res.issues]}
+        self.entries[self._key(res.path)] = [st.st_size, st.st_mtime_ns, self._options_key(options), data]
+        self.dirty = True
+
+    def prune(self, root: str, seen: Iterable[str]):
+        """Forget files under root that a scan of root no longer found (移除已不存在的文件)."""
+        seen = {self._key(p) for p in seen}
+        prefix = os.path.join(self._key(root), "")
+        for key in [k for k in self.entries if k not in seen and k.startswith(prefix)]:
+            del self.entries[key]
+            self.dirty = True
+
+def format_result(res: FileResult, root: Optional[str]) -> str:
+    """
+    Log text for one file: status line plus its issues, the path relative to
+    root, or absolute without one (单个文件的日志文本).
+    """
+    if res.ok and not res.fixed:
+        status = "OK (正常)"
+    elif res.fixed:
+        status = "FIXED (已修复)"
+    else:
+        status = "ERROR (有错误)"
+    shown = os.path.relpath(res.path, root) if root is not None else os.path.abspath(res.path)
+    parts = [f"Checking (正在检查) {shown} ... {status}\n"]
+    for issue in res.issues:
+        loc = ""
+        if issue.line is not None and issue.column is not None:
+            loc = f" (line 行 {issue.line}, col 列 {issue.column})"
+        parts.append(f"    [{issue.issue_type}]{loc} {issue.message}\n")
+    return "".join(parts)
+
+# ---------- Command line (命令行) ----------
+
+# SARIF level of each issue type; anything else is an error (各问题类型的 SARIF 级别，其余均为 error)
+_SARIF_LEVELS = {
+    "duplicate_keys": "warning",
+    "trailing_commas_fixed": "note",
+    "comments_removed_on_fix": "note",
+}
+
+def _collect_paths(targets: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """JSON files named by targets (folders or files), and the folders among them (展开目标为文件列表)."""
+    paths: List[str] = []
+    roots: List[str] = []
+    seen = set()
+    for target in targets:
+        if os.path.isdir(target):
+            roots.append(target)
+            found: Iterable[str] = iter_json_files(target)
+        else:
+            found = [target]
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths, roots
+
+def result_to_dict(res: FileResult) -> Dict[str, Any]:
+    """FileResult as plain JSON data (转为 JSON 数据)."""
+    return {
+        "path": res.path,
+        "ok": res.ok,
+        "fixed": res.fixed,
+        "cached": res.cached,
+        "issues": [asdict(issue) for issue in res.issues],
+    }
+
+def to_sarif(results: Iterable[FileResult], base: Optional[str]) -> Dict[str, Any]:
+    """
+    SARIF 2.1.0 log of every FileIssue; file URIs are relative to base, or
+    absolute file URIs without one (生成 SARIF 2.1.0 报告，文件路径相对于 base).
+    The parse error of a file that --fix repaired is only a note, since the
+    file is valid now (已修复文件的原始解析错误仅作为 note).
+    """
+    rule_ids: List[str] = []
+    sarif_results = []
+    for res in results:
+        if base is not None:
+            artifact = {"uri": os.path.relpath(os.path.abspath(res.path), base).replace(os.sep, "/"), "uriBaseId": "SRCROOT"}
+        else:
+            artifact = {"uri": pathlib.Path(os.path.abspath(res.path)).as_uri()}
+        for issue in res.issues:
+            if issue.issue_type not in rule_ids:
+                rule_ids.append(issue.issue_type)
+            if res.fixed and issue.issue_type == "invalid_json_original":
+                level = "note"
+            else:
+                level = _SARIF_LEVELS.get(issue.issue_type, "error")
+            location: Dict[str, Any] = {"artifactLocation": artifact}
+            if issue.line is not None:
+                location["region"] = {"startLine": issue.line}
+                if issue.column is not None:
+                    location["region"]["startColumn"] = issue.column
+            entry: Dict[str, Any] = {
+                "ruleId": issue.issue_type,
+                "level": level,
+                "message": {"text": issue.message},
+                "locations": [{"physicalLocation": location}],
+            }
+            if issue.details:
+                entry["properties"] = issue.details
+            sarif_results.append(entry)
+    run: Dict[str, Any] = {
+        "tool": {"driver": {
+            "name": "StardewJsonDoctor",
+            "rules": [{"id": rule_id} for rule_id in rule_ids],
+        }},
+    }
+    if base is not None:
+        run["originalUriBaseIds"] = {"SRCROOT": {"uri": pathlib.Path(base).resolve().as_uri() + "/"}}
+    run["results"] = sarif_results
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [run],
+    }
+
+def run_cli(argv: Sequence[str]) -> int:
+    """
+    Headless scan. Exit code: 0 all valid, 1 some file still invalid,
+    2 bad arguments or nothing to scan (退出码：0 全部有效，1 仍有无效文件，2 参数错误或无文件).
+    """
+    parser = argparse.ArgumentParser(prog="stardew-json-doctor", description="Check (and fix) Stardew mod JSON files.")
+    parser.add_argument("targets", nargs="+", help="Mods folders or JSON files.")
+    parser.add_argument("--fix", action="store_true", help="Remove trailing commas from files that only fail because of them.")
+    parser.add_argument("--no-backup", action="store_true", help="Do not write .bak files before fixing.")
+    parser.add_argument("--ignore-comments", action="store_true", help="Accept // and /* */ comments.")
+    parser.add_argument("--allow-trailing-commas", action="store_true", help="Accept trailing commas.")
+    parser.add_argument(
+        "--smapi-mode",
+        action="store_true",
+        help="Read files the way SMAPI does (implies --ignore-comments and --allow-trailing-commas).",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--format", choices=("text", "json", "sarif"), default="text", help="Report format.")
+    parser.add_argument("-o", "--output", help="Write the report here (default: stdout).")
+    parser.add_argument("--all", action="store_true", help="Text report: list valid files too.")
+    parser.add_argument("--cache-file", default=CACHE_PATH, help="Scan cache file.")
+    parser.add_argument("--no-cache", action="store_true", help="Validate every file even if unchanged.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No progress or statistics on stderr.")
+    args = parser.parse_args(argv)
+
+    paths, roots = _collect_paths(args.targets)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        print(f"Not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    if not paths:
+        print("No JSON files found.", file=sys.stderr)
+        return 2
+
+    options = ScanOptions(
+        auto_fix=args.fix,
+        backup=not args.no_backup,
+        ignore_comments=args.ignore_comments or args.smapi_mode,
+        allow_trailing_commas=args.allow_trailing_commas or args.smapi_mode,
+    )
+    cache = None if args.no_cache else ScanCache.load(args.cache_file)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    # report paths relative to the folder(s) being scanned (报告中的路径相对于扫描目录)
+    try:
+        base: Optional[str] = os.path.commonpath(
+            [os.path.abspath(t if os.path.isdir(t) else os.path.dirname(t) or ".") for t in args.targets]
+        )
+    except ValueError:
+        # targets on different Windows drives share no folder: use absolute paths (不同盘符：使用绝对路径)
+        base = None
+    # only files with something to report are kept, so memory stays flat on huge trees
+    # 只保留有问题的文件结果，文件再多内存也不会增长
+    reported: List[FileResult] = []
+    counts = {"ok": 0, "fixed": 0, "invalid": 0, "cached": 0}
+    start = time.perf_counter()
+    try:
+        for done, res in enumerate(iter_scan(paths, options, args.jobs, cache), 1):
+            counts["cached"] += res.cached
+            if res.fixed:
+                counts["fixed"] += 1
+            elif res.ok:
+                counts["ok"] += 1
+            else:
+                counts["invalid"] += 1
+            if res.issues:
+                if args.format == "text":
+                    out.write(format_result(res, base))
+                else:
+                    reported.append(res)
+            elif args.format == "text" and args.all:
+                out.write(format_result(res, base))
+            if not args.quiet and (done == len(paths) or done % 1000 == 0):
+                rate = done / (time.perf_counter() - start)
+                print(f"\r[{done}/{len(paths)}] {rate:.0f} files/s", end="", file=sys.stderr, flush=True)
+        elapsed = time.perf_counter() - start
+        if cache is not None:
+            for root in roots:
+                cache.prune(root, paths)
+            cache.save()
+
+        summary = {
+            "files": len(paths),
+            **counts,
+            "seconds": round(elapsed, 3),
+            "files_per_second": round(len(paths) / elapsed, 1) if elapsed else None,
+            "jobs": args.jobs or os.cpu_count() or 1,
+        }
+        if args.format == "json":
+            json.dump({"summary": summary, "results": [result_to_dict(r) for r in reported]}, out, ensure_ascii=False, indent=2)
+            out.write("\n")
+        elif args.format == "sarif":
+            json.dump(to_sarif(reported, base), out, ensure_ascii=False, indent=2)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if not args.quiet:
+        print(
+            f"\n{summary['files']} files ({summary['invalid']} invalid, {summary['fixed']} fixed, "
+            f"{summary['cached']} unchanged) in {summary['seconds']:.2f}s: {summary['files_per_second']} files/s",
+            file=sys.stderr,
+        )
+    return 1 if counts["invalid"] else 0
+
 # ---------- GUI App (图形界面应用) ----------
 
+# How often the UI drains the scan queue, in ms (界面读取扫描队列的间隔)
+_POLL_MS = 50
+
 class JsonDoctorApp:
     def __init__(self, root):
         self.root = root
@@ -303,6 +621,16 @@ class JsonDoctorApp:
         self.backup_var = tk.BooleanVar(value=True)
         self.ignore_comments_var = tk.BooleanVar(value=True)
         self.allow_trailing_var = tk.BooleanVar(value=False)  # new: SMAPI mode toggle
+        self.changed_only_var = tk.BooleanVar(value=False)
+
+        # Background scan: the worker thread posts ("total" | "result" | "error" | "done", payload)
+        # 后台扫描：工作线程通过队列把进度发给界面
+        self.scan_queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self.scan_results: List[FileResult] = []
+        self.scan_root = ""
+        self.scan_total = 0
+        self.scan_changed_only = False
+        self.status_var = tk.StringVar()
 
         # --- Mods path row (模组路径行) ---
         path_frame = tk.Frame(root)
@@ -333,7 +661,7 @@ class JsonDoctorApp:
 
         self.ignore_comments_check = tk.Checkbutton(
             options_frame,
-            text="Ignore // comments when validating (校验时忽略 // 注释)",
+            text="Ignore // and /* */ comments when validating (校验时忽略注释)",
             variable=self.ignore_comments_var
         )
         self.ignore_comments_check.pack(anchor="w")
@@ -345,6 +673,13 @@ class JsonDoctorApp:
         )
         self.allow_trailing_check.pack(anchor="w")
 
+        self.changed_only_check = tk.Checkbutton(
+            options_frame,
+            text="Only list files changed since last scan (仅列出自上次扫描以来有变化的文件)",
+            variable=self.changed_only_var
+        )
+        self.changed_only_check.pack(anchor="w")
+
         # --- Buttons row (按钮行) ---
         buttons_frame = tk.Frame(root)
         buttons_frame.pack(fill="x", padx=10, pady=5)
@@ -352,6 +687,8 @@ class JsonDoctorApp:
         self.run_button = tk.Button(buttons_frame, text="Scan JSON Files (扫描 JSON 文件)", command=self.run_scan)
         self.run_button.pack(side="left")
 
+        tk.Label(buttons_frame, textvariable=self.status_var).pack(side="left", padx=10)
+
         tk.Button(buttons_frame, text="Clear Log (清空日志)", command=self.clear_log).pack(side="right")
 
         # --- Log area (日志区域) ---
@@ -390,6 +727,7 @@ class JsonDoctorApp:
         self.backup_check.config(state=state)
         self.ignore_comments_check.config(state=state)
         self.allow_trailing_check.config(state=state)
+        self.changed_only_check.config(state=state)
         self.run_button.config(state=state)
 
     # ---- Main scan action (主扫描逻辑) ----
@@ -437,46 +775,81 @@ class JsonDoctorApp:
         self.append_log(
             f"Auto-fix (自动修复): {'ON (开启)' if auto_fix else 'OFF (关闭)'} | "
             f"Backups (备份): {'ON (开启)' if backup else 'OFF (关闭)'} | "
-            f"Ignore // comments (忽略 // 注释): {'ON (开启)' if ignore_comments else 'OFF (关闭)'} | "
+            f"Ignore comments (忽略注释): {'ON (开启)' if ignore_comments else 'OFF (关闭)'} | "
             f"Allow trailing commas (允许末尾逗号): {'ON (开启)' if allow_trailing else 'OFF (关闭)'}\n\n"
         )
 
-        results: List[FileResult] = []
-        total_files = 0
-
-        for path in iter_json_files(mods_path):
-            total_files += 1
-            rel = os.path.relpath(path, mods_path)
-            self.append_log(f"Checking (正在检查) {rel} ... ")
-            res = validate_file(
-                path,
-                auto_fix=auto_fix,
-                backup=backup,
-                ignore_comments=ignore_comments,
-                allow_trailing_commas=allow_trailing
-            )
-            results.append(res)
-
-            if res.ok and not res.fixed:
-                self.append_log("OK (正常)\n")
-            elif res.fixed:
-                self.append_log("FIXED (已修复)\n")
+        options = ScanOptions(
+            auto_fix=auto_fix,
+            backup=backup,
+            ignore_comments=ignore_comments,
+            allow_trailing_commas=allow_trailing
+        )
+        self.scan_results = []
+        self.scan_root = mods_path
+        self.scan_total = 0
+        self.scan_changed_only = self.changed_only_var.get()
+        self.status_var.set("Listing files… (正在列出文件…)")
+        threading.Thread(target=self._scan_worker, args=(mods_path, options), daemon=True).start()
+        self.root.after(_POLL_MS, self._drain_scan_queue)
+
+    def _scan_worker(self, mods_path: str, options: ScanOptions):
+        """Runs on a background thread; never touches Tk (后台线程，不直接操作界面)."""
+        post = self.scan_queue.put
+        try:
+            cache = ScanCache.load()
+            paths = list(iter_json_files(mods_path))
+            post(("total", len(paths)))
+            for res in iter_scan(paths, options, cache=cache):
+                post(("result", res))
+            cache.prune(mods_path, paths)
+            cache.save()
+        except Exception as ex:
+            post(("error", ex))
+        post(("done", None))
+
+    def _drain_scan_queue(self):
+        # one Text insert per poll instead of one per file (每次轮询只插入一次日志)
+        parts: List[str] = []
+        done = False
+        while True:
+            try:
+                kind, payload = self.scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "total":
+                self.scan_total = payload
+            elif kind == "result":
+                self.scan_results.append(payload)
+                if not (self.scan_changed_only and payload.cached):
+                    parts.append(format_result(payload, self.scan_root))
+            elif kind == "error":
+                parts.append(f"\nScan failed (扫描失败): {payload}\n")
             else:
-                self.append_log("ERROR (有错误)\n")
-
-            for issue in res.issues:
-                loc = ""
-                if issue.line is not None and issue.column is not None:
-                    loc = f" (line 行 {issue.line}, col 列 {issue.column})"
-                self.append_log(f"    [{issue.issue_type}]{loc} {issue.message}\n")
+                done = True
+                break
+        if parts:
+            self.append_log("".join(parts))
+        if self.scan_total:
+            self.status_var.set(f"Checked (已检查) {len(self.scan_results)} / {self.scan_total}")
+        if done:
+            self._finish_scan()
+        else:
+            self.root.after(_POLL_MS, self._drain_scan_queue)
+
+    def _finish_scan(self):
+        results = self.scan_results
+        total_files = len(results)
 
         # Summary (总结)
         ok_count = sum(1 for r in results if r.ok and not r.fixed)
         fixed_count = sum(1 for r in results if r.fixed)
         bad_count = sum(1 for r in results if not r.ok)
+        unchanged_count = sum(1 for r in results if r.cached)
 
         self.append_log("\n===== Summary (总结) =====\n")
         self.append_log(f"Total JSON files scanned (总共扫描的 JSON 文件数): {total_files}\n")
+        self.append_log(f"Unchanged since last scan (自上次扫描后未变化): {unchanged_count}\n")
         self.append_log(f"Valid (no changes) (正常，无需修改): {ok_count}\n")
         self.append_log(f"Fixed automatically (已自动修复): {fixed_count}\n")
         self.append_log(f"Still invalid / errors (仍有错误/无法修复): {bad_count}\n")
@@ -495,6 +868,9 @@ class JsonDoctorApp:
 # ---------- Entrypoint (程序入口) ----------
 
 def main():
+    # arguments → headless scan; no arguments opens the GUI (有参数时命令行运行，否则打开界面)
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     root = tk.Tk()
     app = JsonDoctorApp(root)
     root.mainloop()
@@ -1,11 +1,12 @@
 import os
-import json
 import shutil
 import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Optional, Dict, List, Tuple
 
+import SmapiJson
+
 # ----------------------------
 # Definitions
 # ----------------------------
@@ -59,13 +60,11 @@ def find_manifest_json(folder: str) -> Optional[str]:
     return m if os.path.isfile(m) else None
 
 def read_manifest(manifest_path: str) -> Optional[dict]:
-    for enc in ("utf-8-sig", "utf-8"):
-        try:
-            with open(manifest_path, "r", encoding=enc) as f:
-                return json.load(f)
-        except Exception:
-            continue
-    return None
+    # SMAPI accepts comments, trailing commas etc. in manifests, so read them the same way
+    try:
+        return SmapiJson.load(manifest_path)
+    except Exception:
+        return None
 
 def iter_manifest_folders(mods_root: str) -> List[Tuple[str, str]]:
     """Return list of (folder, manifest_path) for every manifest.json found under Mods root (excluding Trash)."""
@@ -4,6 +4,8 @@ import re
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
+import SmapiJson
+
 
 def log_message(log_widget, message):
     """在日志区域追加消息 (Append message to log area)."""
@@ -23,99 +25,15 @@ def select_json_file(initial_dir=".", title="Select JSON File (选择 JSON 文
     return path or None
 
 
-def strip_json_comments(text):
-    """
-    删除字符串外的 // 行尾注释 (Strip // end-of-line comments outside of strings).
-
-    只处理 // 风格注释，不动 /* */，避免误伤内容。
-    This only strips // comments, not /* */, to avoid breaking content.
-    """
-    result_lines = []
-    for line in text.splitlines():
-        new_line_chars = []
-        in_string = False
-        escape = False
-        i = 0
-        while i < len(line):
-            ch = line[i]
-
-            if ch == '"' and not escape:
-                # 进入或离开字符串 (enter or leave string)
-                in_string = not in_string
-                new_line_chars.append(ch)
-            elif not in_string and ch == "/" and i + 1 < len(line) and line[i + 1] == "/":
-                # 字符串外且遇到 //，后面整行丢弃 (outside string and see // → drop rest of line)
-                break
-            else:
-                new_line_chars.append(ch)
-
-            # 处理转义符 (handle escape character)
-            if ch == "\\" and not escape:
-                escape = True
-            else:
-                escape = False
-
-            i += 1
-
-        result_lines.append("".join(new_line_chars))
-    return "\n".join(result_lines)
-
-
-def strip_trailing_commas(text):
+def load_json_file(path):
     """
-    删除字符串外、紧挨 } 或 ] 之前的多余逗号 (Strip trailing commas before } or ] outside strings).
+    加载 JSON 文件并返回其内容 (Load JSON file and return its content).
 
-    示例:
-      {"a":1,}   -> {"a":1}
-      [1,2,]     -> [1,2]
+    按 SMAPI 的规则解析：允许注释、末尾逗号等 (parsed the way SMAPI does:
+    comments, trailing commas etc. are allowed); 出错时给出原文件的行列号
+    (errors carry the line/column in the original file).
     """
-    result_chars = []
-    in_string = False
-    escape = False
-    i = 0
-    length = len(text)
-
-    while i < length:
-        ch = text[i]
-
-        if ch == '"' and not escape:
-            in_string = not in_string
-            result_chars.append(ch)
-        elif not in_string and ch == ",":
-            # Look ahead for whitespace + } or ]
-            j = i + 1
-            while j < length and text[j] in " \t\r\n":
-                j += 1
-            if j < length and text[j] in "}]":
-                # skip this extra comma (忽略多余逗号)
-                i += 1
-                continue
-            else:
-                result_chars.append(ch)
-        else:
-            result_chars.append(ch)
-
-        # 转义处理 (escape handling)
-        if ch == "\\" and not escape:
-            escape = True
-        else:
-            escape = False
-
-        i += 1
-
-    return "".join(result_chars)
-
-
-def load_json_file(path):
-    """加载 JSON 文件并返回其内容 (Load JSON file and return its content)."""
-    with open(path, "r", encoding="utf-8-sig") as f:
-        raw = f.read()
-
-    # 去掉 // 注释 + 末尾逗号 (strip comments + trailing commas)
-    cleaned = strip_json_comments(raw)
-    cleaned = strip_trailing_commas(cleaned)
-
-    return json.loads(cleaned)
+    return SmapiJson.load(path)
 
 
 def flatten_dict(d, parent_key="", sep="."):
@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import SmapiJson
+
+
+def parse_error(text):
+    try:
+        SmapiJson.loads(text)
+    except json.JSONDecodeError as e:
+        return e.msg, e.lineno, e.colno
+    return None
+
+
+def recording_hook():
+    calls = []
+
+    def hook(pairs):
+        calls.append([key for key, _value in pairs])
+        return dict(pairs)
+
+    return calls, hook
+
+
+class CommentTests(unittest.TestCase):
+    def test_comments_between_tokens(self):
+        self.assertEqual(SmapiJson.loads('{/* a */"n"// b\n:/**/1/* c */}'), {"n": 1})
+        self.assertEqual(SmapiJson.loads("[1,/*\n*/2]"), [1, 2])
+
+    def test_comment_does_not_join_tokens(self):
+        for text in ("[1/*c*/2]", "[tr/**/ue]", '{"n": 1/* c */2}'):
+            with self.subTest(text=text):
+                self.assertIsNotNone(parse_error(text))
+
+    def test_unterminated_comment_is_an_error(self):
+        self.assertEqual(parse_error('{"a":1}/*'), ("Unterminated comment", 1, 8))
+        self.assertEqual(parse_error('{"n": 1}\n/* unterminated'), ("Unterminated comment", 2, 1))
+        self.assertEqual(parse_error("[1,/*]"), ("Unterminated comment", 1, 4))
+
+    def test_comment_markers_inside_strings_are_text(self):
+        self.assertEqual(SmapiJson.loads('{"url": "http://x/*y*/"}'), {"url": "http://x/*y*/"})
+
+
+class SyntaxTests(unittest.TestCase):
+    def test_trailing_commas(self):
+        self.assertEqual(SmapiJson.loads('{"a": [1, 2,], }'), {"a": [1, 2]})
+
+    def test_misplaced_commas_and_brackets_are_rejected(self):
+        self.assertEqual(parse_error("[,]"), ("Expecting value", 1, 2))
+        self.assertEqual(parse_error("{,}"), ("Expecting property name", 1, 2))
+        self.assertEqual(parse_error('{"a":1}}'), ("Extra data", 1, 8))
+        self.assertEqual(parse_error("{ /* x */ ,}")[0], "Expecting property name")
+
+    def test_single_quotes_and_unquoted_names(self):
+        self.assertEqual(
+            SmapiJson.loads("{'a': 'it\\'s \"q\"', b_1$: 2}"),
+            {"a": "it's \"q\"", "b_1$": 2},
+        )
+
+    def test_error_position_is_in_the_original_text(self):
+        self.assertEqual(parse_error('// header\n{\n  "a": 1,\n  "b" 2\n}'), ("Expecting ':' delimiter", 4, 7))
+
+    def test_bom_is_skipped(self):
+        self.assertEqual(SmapiJson.loads('\ufeff{"a": 1}'), {"a": 1})
+
+
+class HookTests(unittest.TestCase):
+    def test_hook_runs_once_per_object_innermost_first(self):
+        expected = [["b"], ["d"], ["a", "c", "e"]]
+        for text in (
+            '{"a": {"b": 1}, "c": [{"d": 2}], /* x */ "e": 3,}',
+            "{'a': {\"b\": 1}, c: [{\"d\": 2}], \"e\": 3,}",
+        ):
+            with self.subTest(text=text):
+                calls, hook = recording_hook()
+                self.assertEqual(SmapiJson.loads(text, hook), {"a": {"b": 1}, "c": [{"d": 2}], "e": 3})
+                self.assertEqual(calls, expected)
+
+
+class FastPathTests(unittest.TestCase):
+    # loads takes the strip + json.loads path for most of these; _Parser
+    # always walks the original text
+    CASES = [
+        '{"a": 1}',
+        '{"a": [1, 2,], // c\n "b": {"c": null,},}',
+        "[1, /* x */ 2, /* y\n */ 3,]",
+        '{"s": "a,]//b", "t": [true, false,]}',
+        "{'a': 1, b: 'two'}",
+        "[1/*c*/2]",
+        "[tr/**/ue]",
+        '{"a":1}/*',
+        "[,]",
+        "{,}",
+        '{"a":1}}',
+        '{"a": 1,, }',
+    ]
+
+    def test_fast_path_agrees_with_parser(self):
+        for text in self.CASES:
+            with self.subTest(text=text):
+                try:
+                    expected = SmapiJson._Parser(text, None).document()
+                except json.JSONDecodeError as e:
+                    self.assertEqual(parse_error(text), (e.msg, e.lineno, e.colno))
+                else:
+                    self.assertEqual(SmapiJson.loads(text), expected)
+
+    def test_fast_path_agrees_with_parser_with_hook(self):
+        for text in self.CASES:
+            with self.subTest(text=text):
+                parser_calls, parser_hook = recording_hook()
+                try:
+                    expected = SmapiJson._Parser(text, parser_hook).document()
+                except json.JSONDecodeError:
+                    continue
+                calls, hook = recording_hook()
+                self.assertEqual(SmapiJson.loads(text, hook), expected)
+                self.assertEqual(calls, parser_calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import SMAPILogDoctor as doctor
+from SMAPILogDoctorBenchmark import generate_synthetic_log
+
+
+def write_log(directory: str, lines, newline: str = "\r\n") -> str:
+    path = os.path.join(directory, "SMAPI-latest.txt")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(newline.join(lines) + newline)
+    return path
+
+
+class LineNumberTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_form_feed_in_message_keeps_line_numbers(self):
+        lines = [
+            "[12:00:00 INFO  SMAPI] SMAPI 4.0.0 with Stardew Valley 1.6.0 on Windows",
+            "[12:00:01 INFO  SomeMod] page one\x0cpage two page three",
+        ]
+        lines += [f"[12:00:01 TRACE SMAPI] filler {i}" for i in range(700)]
+        lines += ["[12:00:02 ERROR SomeMod] Boom", "[12:00:03 INFO  SMAPI] done"]
+        error_line = lines.index("[12:00:02 ERROR SomeMod] Boom") + 1
+
+        analysis = doctor.analyze_smapi_log_file(write_log(self.tmp.name, lines))
+
+        self.assertEqual(analysis.error_events[0].line, error_line)
+        self.assertEqual(len(analysis.line_index), len(lines))
+        self.assertEqual(analysis.line_index[error_line - 1], lines[error_line - 1])
+        self.assertEqual(analysis.line_index[1], lines[1])
+        self.assertEqual(analysis.line_index.line_for_time(doctor.parse_time_of_day("12:00:02")), error_line - 1)
+
+    def test_text_and_file_analyses_agree(self):
+        lines = ["[12:00:00 INFO  SomeMod] a\x0cb", "[12:00:01 ERROR SomeMod] Boom"]
+        from_file = doctor.analyze_smapi_log_file(write_log(self.tmp.name, lines))
+        from_text = doctor.analyze_smapi_log("\r\n".join(lines) + "\r\n")
+        self.assertEqual(from_file.error_events, from_text.error_events)
+        self.assertEqual(doctor.split_log_lines(from_text.raw_log), lines)
+
+    def test_compressed_log_reads_back_like_plain(self):
+        lines = [f"[12:{i // 60 % 60:02d}:{i % 60:02d} INFO  SomeMod] line {i}" for i in range(1000)]
+        plain = write_log(self.tmp.name, lines)
+        packed = plain + ".gz"
+        with open(plain, "rb") as src, gzip.open(packed, "wb") as dst:
+            dst.write(src.read())
+
+        index = doctor.analyze_smapi_log_file(packed).line_index
+        self.addCleanup(index.close)
+        # any order of reads: the spill file serves them all after the first
+        for start in (900, 10, 990, 500):
+            self.assertEqual(index.read_lines(start, start + 20), lines[start:start + 20])
+        index.close()
+        self.assertEqual(index[999], lines[999])
+
+
+class CacheTests(unittest.TestCase):
+    def test_batch_entry_opens_with_raw_lines(self):
+        lines = ["[12:00:00 INFO  SMAPI] SMAPI 4.0.0 with Stardew Valley 1.6.0 on Windows", "[12:00:01 ERROR SomeMod] Boom"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_log(tmp, lines)
+            cache = doctor.AnalysisCache(os.path.join(tmp, "cache"))
+            doctor.run_batch([path], jobs=1, cache=cache)
+
+            analysis = cache.get(path, rules=doctor.load_rule_set(include_user_packs=True))
+            self.assertIsNotNone(analysis)
+            self.assertEqual(analysis.line_index.read_lines(0, len(lines)), lines)
+            self.assertEqual(analysis.error_events[0].line, 2)
+
+    def test_diff_entry_opens_with_raw_lines(self):
+        lines = ["[12:00:01 ERROR SomeMod] Boom", "[12:00:02 INFO  SomeMod] after"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_log(tmp, lines)
+            cache = doctor.AnalysisCache(os.path.join(tmp, "cache"))
+            doctor._analyze_cached(path, cache)
+
+            analysis = cache.get(path)
+            self.assertIsNotNone(analysis)
+            self.assertEqual(analysis.line_index.read_lines(0, len(lines)), lines)
+
+    def test_entry_without_index_is_a_miss_when_lines_are_needed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_log(tmp, ["[12:00:01 ERROR SomeMod] Boom"])
+            cache = doctor.AnalysisCache(os.path.join(tmp, "cache"))
+            key = doctor.log_cache_key(path)
+            cache.store(key, doctor.analysis_to_dict(doctor.analyze_smapi_log_file(path, index_lines=False)))
+
+            self.assertIsNone(cache.get(path, key))
+            self.assertIsNotNone(cache.get(path, key, need_lines=False))
+
+
+class RulePackTests(unittest.TestCase):
+    def test_invalid_packs_raise_value_error_with_their_path(self):
+        packs = {
+            "check-without-id": {"checks": [{"field": "mod_count", "at_least": 1}]},
+            "rule-not-object": {"rules": ["NullReference"]},
+            "checks-not-list": {"checks": {"id": "x"}},
+            "rule-match-not-string": {"rules": [{"id": "x", "match": 3}]},
+            "check-limit-not-number": {"checks": [{"id": "x", "field": "mod_count", "at_least": "5"}]},
+            "bad-regex": {"rules": [{"id": "x", "regex": "("}]},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, pack in packs.items():
+                path = os.path.join(tmp, name + ".json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(pack, f)
+                with self.subTest(name), self.assertRaises(ValueError) as caught:
+                    doctor.load_rule_set((path,))
+                self.assertIn(path, str(caught.exception))
+
+    def test_valid_pack_is_loaded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pack.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"rules": [{"id": "boom", "match": "Boom", "levels": ["ERROR"]}]}, f)
+            rules = doctor.load_rule_set((path,))
+        self.assertEqual(rules.rule("boom").levels, ("ERROR",))
+        self.assertEqual([r.id for r in rules.scan("[12:00:00 ERROR SomeMod] Boom")], ["boom"])
+
+
+class EventTests(unittest.TestCase):
+    def test_non_mod_sources_export_no_mod(self):
+        log = "\r\n".join([
+            "[12:00:00 ERROR SMAPI] An error occurred in the base update loop: System.NullReferenceException: x",
+            "   at StardewValley.Game1.Update()",
+            "[12:00:01 ERROR SomeMod] SomeMod failed: System.InvalidOperationException: y",
+            "[12:00:02 WARN  game] Something odd",
+        ]) + "\r\n"
+        data = doctor.analysis_to_dict(doctor.analyze_smapi_log(log))
+        mods = {event["source"]: event["mod"] for event in doctor.iter_events(data)}
+        self.assertEqual(mods, {"SMAPI": None, "SomeMod": "SomeMod", "game": None})
+
+
+class TailTests(unittest.TestCase):
+    def test_only_tabs_with_new_data_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_log(tmp, ["[12:00:00 INFO  SMAPI] SMAPI 4.0.0 with Stardew Valley 1.6.0 on Windows"])
+            tailer = doctor.SmapiLogTailer(path)
+            tailer.poll()
+
+            def append(line):
+                with open(path, "a", encoding="utf-8", newline="") as f:
+                    f.write(line + "\r\n")
+                before = doctor.tail_view_state(tailer.analysis)
+                self.assertTrue(tailer.poll())
+                after = doctor.tail_view_state(tailer.analysis)
+                return {tab for tab in after if after[tab] != before[tab]}
+
+            self.assertEqual(append("[12:00:00 TRACE SomeMod] nothing to see"), set())
+            self.assertEqual(append("[12:00:00 ERROR SomeMod] Boom"), {"overview", "errors", "mod_health"})
+            self.assertEqual(append("[12:00:00 WARN  SomeMod] Careful"), {"overview", "warnings"})
+
+
+# the JSON Schema keywords analysis_json_schema() emits, checked without a
+# jsonschema dependency
+_ANNOTATIONS = {"$schema", "$id", "$defs"}
+
+
+def schema_errors(value, schema, root, where="$"):
+    unknown = set(schema) - _ANNOTATIONS - {
+        "type", "const", "properties", "required", "items", "additionalProperties", "anyOf", "$ref"
+    }
+    if unknown:
+        return [f"{where}: unsupported keywords {sorted(unknown)}"]
+    if "$ref" in schema:
+        return schema_errors(value, root["$defs"][schema["$ref"].rsplit("/", 1)[1]], root, where)
+    if "anyOf" in schema:
+        if any(not schema_errors(value, option, root, where) for option in schema["anyOf"]):
+            return []
+        return [f"{where}: {value!r} matches no anyOf option"]
+    if "const" in schema and value != schema["const"]:
+        return [f"{where}: expected {schema['const']!r}"]
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        checks = {
+            "string": lambda v: isinstance(v, str),
+            "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+            "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+            "boolean": lambda v: isinstance(v, bool),
+            "null": lambda v: v is None,
+            "array": lambda v: isinstance(v, list),
+            "object": lambda v: isinstance(v, dict),
+        }
+        if not any(checks[tp](value) for tp in types):
+            return [f"{where}: {type(value).__name__} is not {types}"]
+    errors = []
+    if isinstance(value, dict):
+        for key in schema.get("required", ()):
+            if key not in value:
+                errors.append(f"{where}: missing {key!r}")
+        for key, item in value.items():
+            sub = schema.get("properties", {}).get(key, schema.get("additionalProperties"))
+            if isinstance(sub, dict):
+                errors.extend(schema_errors(item, sub, root, f"{where}.{key}"))
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(schema_errors(item, schema["items"], root, f"{where}[{i}]"))
+    return errors
+
+
+class SchemaTests(unittest.TestCase):
+    def test_export_matches_schema(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "SMAPI-latest.txt")
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(generate_synthetic_log(0.3, mods=60, error_rate=0.05, warning_rate=0.05))
+            analysis = doctor.analyze_smapi_log_file(path)
+            out = io.StringIO()
+            doctor.write_analysis_json(doctor.analysis_to_dict(analysis), out, path)
+        document = json.loads(out.getvalue())
+        self.assertTrue(document["analysis"]["errors"])
+        self.assertTrue(document["analysis"]["warnings"])
+        self.assertTrue(document["analysis"]["exceptions"])
+
+        schema = doctor.analysis_json_schema()
+        self.assertEqual(schema_errors(document, schema, schema)[:5], [])
+
+    def test_unmapped_field_type_is_rejected(self):
+        with self.assertRaises(TypeError):
+            doctor._json_schema_type(complex)
+
+
+if __name__ == "__main__":
+    unittest.main()
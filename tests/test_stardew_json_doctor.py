@@ -0,0 +1,158 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import StardewJsonDoctor as jd
+
+
+def write_json(directory: str, name: str, text: str) -> str:
+    path = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    return path
+
+
+class ScanTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_process_pool_keeps_order_and_results(self):
+        texts = ['{"a": 1}', '{"a": [1,],}', '{"a": 1, "a": 2}', "{", "// c\n{}"]
+        paths = [write_json(self.tmp.name, f"Mod{i}/f{i}.json", texts[i % len(texts)]) for i in range(40)]
+        options = jd.ScanOptions(ignore_comments=True)
+
+        serial = list(jd.iter_scan(paths, options, jobs=1))
+        pooled = list(jd.iter_scan(paths, options, jobs=2))
+
+        self.assertEqual([r.path for r in pooled], paths)
+        self.assertEqual(pooled, serial)
+        self.assertEqual([r.ok for r in serial[:5]], [True, False, True, False, True])
+        self.assertEqual(serial[2].issues[0].issue_type, "duplicate_keys")
+
+    def test_fix_removes_trailing_commas(self):
+        path = write_json(self.tmp.name, "content.json", '{"a": [1, 2,],\n}')
+        [res] = jd.iter_scan([path], jd.ScanOptions(auto_fix=True), jobs=1)
+
+        self.assertTrue(res.ok and res.fixed)
+        self.assertEqual(res.issues[1].details["positions"], [[1, 12], [1, 14]])
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), '{"a": [1, 2]\n}')
+        self.assertTrue(os.path.exists(path + ".bak"))
+
+
+class CacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.mods = os.path.join(self.tmp.name, "Mods")
+        self.cache_path = os.path.join(self.tmp.name, "cache.json")
+
+    def scan(self, paths, options):
+        cache = jd.ScanCache.load(self.cache_path)
+        results = list(jd.iter_scan(paths, options, jobs=1, cache=cache))
+        cache.save()
+        return results
+
+    def test_unchanged_file_is_a_hit(self):
+        path = write_json(self.mods, "a.json", '{"a": 1, "a": 2}')
+        options = jd.ScanOptions()
+        [first] = self.scan([path], options)
+        [second] = self.scan([path], options)
+
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual((second.ok, second.issues), (first.ok, first.issues))
+
+    def test_mtime_change_is_a_miss(self):
+        path = write_json(self.mods, "a.json", '{"a": 1}')
+        options = jd.ScanOptions()
+        self.scan([path], options)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        [res] = self.scan([path], options)
+        self.assertFalse(res.cached)
+
+    def test_parse_options_change_is_a_miss(self):
+        path = write_json(self.mods, "a.json", '// c\n{"a": 1}')
+        [strict] = self.scan([path], jd.ScanOptions())
+        [lenient] = self.scan([path], jd.ScanOptions(ignore_comments=True))
+        [again] = self.scan([path], jd.ScanOptions(ignore_comments=True))
+
+        self.assertFalse(strict.ok)
+        self.assertFalse(lenient.cached)
+        self.assertTrue(lenient.ok)
+        self.assertTrue(again.cached)
+
+    def test_prune_forgets_only_missing_files_under_root(self):
+        kept = write_json(self.mods, "kept.json", "{}")
+        gone = write_json(self.mods, "gone.json", "{}")
+        outside = write_json(self.tmp.name, "Other/x.json", "{}")
+        cache = jd.ScanCache(self.cache_path)
+        for res in jd.iter_scan([kept, gone, outside], jd.ScanOptions(), jobs=1):
+            cache.put(res, jd.ScanOptions())
+        cache.dirty = False
+
+        cache.prune(self.mods, [kept])
+
+        self.assertTrue(cache.dirty)
+        self.assertIsNotNone(cache.get(kept, jd.ScanOptions()))
+        self.assertIsNone(cache.get(gone, jd.ScanOptions()))
+        self.assertIsNotNone(cache.get(outside, jd.ScanOptions()))
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.mods = os.path.join(self.tmp.name, "Mods")
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            code = jd.run_cli([*argv, "--no-cache", "-j", "1"])
+        return code, out.getvalue()
+
+    def test_exit_codes(self):
+        write_json(self.mods, "a.json", '{"a": 1}')
+        self.assertEqual(self.run_cli(self.mods)[0], 0)
+
+        write_json(self.mods, "b.json", '{"a": [1,]}')
+        self.assertEqual(self.run_cli(self.mods)[0], 1)
+        self.assertEqual(self.run_cli(self.mods, "--smapi-mode")[0], 0)
+        self.assertEqual(self.run_cli(self.mods, "--fix", "--no-backup")[0], 0)
+
+        self.assertEqual(self.run_cli(os.path.join(self.tmp.name, "missing.json"))[0], 2)
+        os.makedirs(os.path.join(self.tmp.name, "Empty"))
+        self.assertEqual(self.run_cli(os.path.join(self.tmp.name, "Empty"))[0], 2)
+
+    def test_sarif_reports_a_fixed_parse_error_as_a_note(self):
+        write_json(self.mods, "Mod/content.json", '{"a": [1,]}')
+        code, out = self.run_cli(self.mods, "--fix", "--no-backup", "--format", "sarif")
+        self.assertEqual(code, 0)
+
+        [run] = json.loads(out)["runs"]
+        levels = {r["ruleId"]: r["level"] for r in run["results"]}
+        self.assertEqual(levels, {"invalid_json_original": "note", "trailing_commas_fixed": "note"})
+        location = run["results"][0]["locations"][0]["physicalLocation"]["artifactLocation"]
+        self.assertEqual(location, {"uri": "Mod/content.json", "uriBaseId": "SRCROOT"})
+
+    def test_sarif_keeps_unfixed_errors_as_errors(self):
+        path = write_json(self.mods, "a.json", "{")
+        [res] = jd.iter_scan([path], jd.ScanOptions(auto_fix=True), jobs=1)
+        [result] = jd.to_sarif([res], None)["runs"][0]["results"]
+
+        self.assertEqual(result["level"], "error")
+        self.assertTrue(result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"].startswith("file:"))
+
+
+if __name__ == "__main__":
+    unittest.main()